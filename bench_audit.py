@@ -0,0 +1,83 @@
+"""
+감사 로그 벤치마크
+- 설비 N대의 완료 사이클 M건(기본 100만 건, 1년치)을 AuditLog.record로 기록 → 초당 기록 수
+- 대표 컴플라이언스 조회 시간 (인덱스 사용 여부는 EXPLAIN QUERY PLAN으로 함께 표시)
+
+실행:
+    python bench_audit.py [기록 수] [설비 수]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from lg_qa_audit import AuditLog
+from lg_qa_state import Action, Analysis, RiskLevel, SensorReadings
+
+
+YEAR_START = datetime(2025, 1, 1).timestamp()
+YEAR = 365 * 86400
+LAST_QUARTER = ("2025-07-01", "2025-10-01")
+
+
+def cycles(count: int, facilities: int, rng: random.Random):
+    """위험도 LOW 90% / HIGH 8% / CRITICAL 2%, 승인 대상의 10%는 전문가가 조치 수정"""
+    readings = SensorReadings(temperature=72.5, pressure=101.3, vibration=0.5, flow_rate=150.0, power_consumption=850.0)
+    analyses = {level: Analysis(level) for level in RiskLevel}
+    for i in range(count):
+        roll = rng.random()
+        risk = RiskLevel.LOW if roll < 0.9 else RiskLevel.HIGH if roll < 0.98 else RiskLevel.CRITICAL
+        overridden = risk != RiskLevel.LOW and rng.random() < 0.1
+        action = Action.REDUCE_LOAD if overridden else (
+            Action.CONTINUE_MONITORING if risk == RiskLevel.LOW else Action.CONTROLLED_SHUTDOWN
+        )
+        state = {
+            "facility_id": f"PLANT-{rng.randrange(facilities):05d}",
+            "timestamp": YEAR_START + YEAR * i / count,
+            "sensor_data": readings,
+            "risk_level": risk,
+            "ai_analysis": analyses[risk],
+            "recommended_action": action,
+            "human_approval": True,
+            "expert_comment": "벤치마크",
+        }
+        yield state, action, f"thread-{i}", overridden
+
+
+QUERIES = {
+    "PLANT-00042 지난 분기 조치 수정 건": dict(facility_id="PLANT-00042", overridden=True,
+                                          since=LAST_QUARTER[0], until=LAST_QUARTER[1]),
+    "PLANT-00042 전체 이력": dict(facility_id="PLANT-00042"),
+    "지난 분기 CRITICAL 건수": dict(risk_level="CRITICAL", since=LAST_QUARTER[0], until=LAST_QUARTER[1]),
+    "하루치 REDUCE_LOAD 실행": dict(final_action="REDUCE_LOAD", since="2025-08-01", until="2025-08-02"),
+}
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    facilities = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    rng = random.Random(7)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "audit.db")
+        with AuditLog(path) as audit:
+            start = time.perf_counter()
+            for state, action, thread_id, overridden in cycles(count, facilities, rng):
+                audit.record(state, action, thread_id=thread_id, overridden=overridden)
+            audit.flush()
+            elapsed = time.perf_counter() - start
+            size = os.path.getsize(path) + os.path.getsize(path + "-wal")
+            print(f"\n기록 {count:,}건 / 설비 {facilities:,}대: {elapsed:.1f}s "
+                  f"({count / elapsed:,.0f} records/sec, 파일 {size / 2**20:.0f} MiB)\n")
+
+            for label, filters in QUERIES.items():
+                start = time.perf_counter()
+                rows = audit.query(**filters)
+                elapsed = time.perf_counter() - start
+                where, params = audit._where(**{**dict.fromkeys(
+                    ("facility_id", "risk_level", "final_action", "overridden", "since", "until")), **filters})
+                plan = audit.conn.execute(f"EXPLAIN QUERY PLAN SELECT * FROM audit{where}", params).fetchall()
+                print(f"{label:<32}{len(rows):8,}건 {elapsed * 1000:8.2f} ms   {plan[0][-1]}")
@@ -0,0 +1,83 @@
+"""
+장기 실행 체크포인트 메모리 벤치마크
+- 설비마다 thread_id 하나를 재사용하는 연속 감시 (사이클마다 같은 스레드에 새 입력)
+- 일부 사이클은 승인 대기(interrupt) 후 재개
+- 체크포인터별로 사이클 진행에 따른 메모리(tracemalloc) / SQLite 행 수 변화를 보고
+  · MemorySaver: 사이클마다 체크포인트가 쌓여 계속 증가
+  · CompactMemorySaver / SqliteCheckpointSaver(compact=True): 스레드당 최신 상태만 남아 일정
+
+실행:
+    python bench_checkpoint_memory.py [설비 수] [사이클 수]
+"""
+
+import os
+import sys
+import tempfile
+import tracemalloc
+
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.types import Command
+
+import lg_app_qa
+import lg_qa_coalesce
+import lg_qa_trend
+from lg_qa_checkpoint import CompactMemorySaver, SqliteCheckpointSaver
+from lg_qa_events import ERROR, configure_events
+from lg_qa_state import CompactSerializer
+
+
+DECISION = {"approved": True, "comment": "벤치마크 승인"}
+
+
+def run(saver, facilities: int, cycles: int, samples: int = 4) -> list:
+    """cycles를 samples 구간으로 나눠 구간 끝마다 (메모리 KiB, 체크포인트 행 수) 기록"""
+    lg_qa_trend.set_trend_tracker(None)
+    lg_qa_coalesce.set_coalescer(None)
+    graph = lg_app_qa.create_facility_monitor_graph(saver)
+    report_every = max(cycles // samples, 1)
+    points = []
+    tracemalloc.start()
+    for cycle in range(cycles):
+        for facility in range(facilities):
+            config = {"configurable": {"thread_id": f"facility-{facility}"}}
+            scenario = "overheating" if (cycle + facility) % 7 == 0 else "normal"
+            result = graph.invoke({
+                "sensor_data": lg_app_qa.get_sensor_data(scenario),
+                "facility_id": f"PLANT-{facility:04d}",
+                "timestamp": 1.7e9 + cycle * 60 + facility,
+                "coalesced_into": None,
+            }, config)
+            if "__interrupt__" in result:
+                graph.invoke(Command(resume=DECISION), config)
+        if (cycle + 1) % report_every == 0:
+            if isinstance(saver, SqliteCheckpointSaver):
+                saver.flush()
+                rows = saver.conn.execute("SELECT COUNT(*) FROM checkpoints").fetchone()[0]
+            else:
+                rows = sum(len(checkpoints) for namespaces in saver.storage.values()
+                           for checkpoints in namespaces.values())
+            points.append((cycle + 1, tracemalloc.get_traced_memory()[0] // 1024, rows))
+    tracemalloc.stop()
+    return points
+
+
+if __name__ == "__main__":
+    facilities = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    cycles = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    configure_events(level=ERROR)
+
+    print(f"\n설비 {facilities}대 x 사이클 {cycles}회 (설비별 thread_id 재사용)\n")
+    with tempfile.TemporaryDirectory() as directory:
+        savers = {
+            "MemorySaver": MemorySaver(serde=CompactSerializer()),
+            "CompactMemorySaver": CompactMemorySaver(serde=CompactSerializer()),
+            "SQLite compact=True": SqliteCheckpointSaver(
+                os.path.join(directory, "bench.db"), serde=CompactSerializer(), compact=True,
+            ),
+        }
+        for name, saver in savers.items():
+            points = run(saver, facilities, cycles)
+            trace = "  ".join(f"{cycle}회: {kib:,} KiB / {rows:,}행" for cycle, kib, rows in points)
+            print(f"{name:<22}{trace}")
+            if isinstance(saver, SqliteCheckpointSaver):
+                saver.close()
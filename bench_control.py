@@ -0,0 +1,97 @@
+"""
+제어 명령 디스패처 벤치마크
+- 기존 방식: 명령 1건마다 연결 + 왕복을 기다리는 동기 전송 (send_control_command)
+- 디스패처: 제어기별 배치 + 연결 풀 + 재시도 (lg_qa_control.py)
+- 그래프 경로: 대량 가동 중지 승인 시 노드가 제어기 왕복을 기다리지 않는지 확인
+
+실행:
+    python bench_control.py [명령 수] [왕복 ms]
+"""
+
+import contextlib
+import io
+import sys
+import time
+
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.types import Command
+
+import lg_app_qa
+from lg_qa_coalesce import set_coalescer
+from lg_qa_control import (
+    ControlCommand, ControlDispatcher, FakeController,
+    configure_dispatcher, get_dispatcher, idempotency_key, set_dispatcher,
+)
+from lg_qa_state import CompactSerializer
+
+
+def bench_blocking(count: int, latency: float) -> float:
+    """명령마다 연결 + 동기 왕복"""
+    controller = FakeController(latency=latency)
+    start = time.perf_counter()
+    for i in range(count):
+        connection = controller.connect()
+        command_key = idempotency_key(f"t-{i}", f"PLANT-{i:06d}", "IMMEDIATE_SHUTDOWN", 0.0)
+        connection.send_batch([ControlCommand(f"PLANT-{i:06d}", "IMMEDIATE_SHUTDOWN", command_key, "default")])
+        connection.close()
+    return time.perf_counter() - start
+
+
+def bench_dispatcher(count: int, latency: float, **options) -> tuple:
+    controller = FakeController(latency=latency, seed=0, **options)
+    dispatcher = ControlDispatcher({"default": controller}, pool_size=8, batch_size=128)
+    start = time.perf_counter()
+    for i in range(count):
+        dispatcher.submit(f"PLANT-{i:06d}", "IMMEDIATE_SHUTDOWN",
+                          idempotency_key(f"t-{i}", f"PLANT-{i:06d}", "IMMEDIATE_SHUTDOWN", 0.0))
+    submitted = time.perf_counter() - start
+    dispatcher.close()
+    return submitted, time.perf_counter() - start, dispatcher.stats, controller
+
+
+def bench_graph(count: int, latency: float) -> None:
+    """CRITICAL 사이클 count개 승인 → 디스패처로 가동 중지 명령 전송"""
+    set_coalescer(None)
+    controller = FakeController(latency=latency)
+    configure_dispatcher({"default": controller}, pool_size=8)
+    graph = lg_app_qa.create_facility_monitor_graph(MemorySaver(serde=CompactSerializer()))
+    with contextlib.redirect_stdout(io.StringIO()):
+        configs = []
+        for i in range(count):
+            config = {"configurable": {"thread_id": f"control-{i}"}}
+            graph.invoke({
+                "sensor_data": lg_app_qa.get_sensor_data("overheating"),
+                "facility_id": f"PLANT-{i:06d}",
+                "timestamp": time.time(),
+            }, config=config)
+            configs.append(config)
+        start = time.perf_counter()
+        for config in configs:
+            graph.invoke(Command(resume={"approved": True, "comment": "일괄 승인"}), config=config)
+        resumed = time.perf_counter() - start
+        get_dispatcher().flush()
+        delivered = time.perf_counter() - start
+    get_dispatcher().close()
+    set_dispatcher(None)
+    print(f"[그래프] 승인 재개 {count}건 {resumed:.2f}s / 명령 전달 완료 {delivered:.2f}s"
+          f" / 적용 {len(controller.applied)}건")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 5.0) / 1000
+
+    print(f"\n명령 수: {count} / 제어기 왕복 {latency * 1000:.1f} ms\n")
+    blocking = bench_blocking(min(count, 500), latency)
+    print(f"[동기 전송] {min(count, 500)}건 {blocking:.2f}s"
+          f" → {min(count, 500) / blocking:,.0f} cmds/sec")
+
+    submitted, total, stats, _ = bench_dispatcher(count, latency)
+    print(f"[디스패처] 큐 등록 {submitted * 1000:.1f} ms / 전달 완료 {total:.2f}s"
+          f" → {count / total:,.0f} cmds/sec (배치 {stats['batches']}건)")
+
+    _, total, stats, controller = bench_dispatcher(count, latency, failure_rate=0.1, lost_ack_rate=0.1)
+    print(f"[디스패처, 실패/응답 유실 10%] 전달 완료 {total:.2f}s / 재시도 {stats['retries']}회"
+          f" / 적용 {len(controller.applied)}건 (중복 응답 {controller.stats['duplicates']}건, 실패 {stats['failed']}건)")
+
+    bench_graph(count, latency)
@@ -0,0 +1,281 @@
+"""
+HITL 그래프 벤치마크 (비대화형)
+- input() 대신 스크립트 결정자(decider)로 전문가 결정을 자동 입력
+- get_sensor_data의 모든 시나리오를 N 사이클 실행 (interrupt 있음/없음 구분)
+- 노드별 p50/p99 지연, 체크포인트 쓰기 비용, 승인 대기 스레드당 메모리, 초당 사이클 수 보고
+- --serde jsonplus 로 압축 상태 직렬화기(lg_qa_state.CompactSerializer) 적용 전과 비교
+- lg_approval.py 그래프도 같은 방식으로 측정
+
+실행:
+    python bench_hitl.py --cycles 500 --decider approve --saver sqlite --serde compact
+"""
+
+import argparse
+import contextlib
+import functools
+import io
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime
+from typing import Callable
+
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.types import Command
+
+import lg_app_qa
+from lg_qa_checkpoint import SqliteCheckpointSaver
+from lg_qa_state import STATE_MSGPACK_TYPES, CompactSerializer
+
+
+BENCH_TIMESTAMP = datetime(2025, 2, 10, 14, 30, 25).timestamp()
+SERDES = {
+    "compact": CompactSerializer,
+    "jsonplus": functools.partial(JsonPlusSerializer, allowed_msgpack_modules=STATE_MSGPACK_TYPES),
+}
+
+
+# ============================================
+# 1. 스크립트 결정자
+# ============================================
+# interrupt 값(dict) -> 전문가 결정(dict)
+def approve_decider(payload: dict) -> dict:
+    return {"approved": True, "comment": "벤치마크 자동 승인"}
+
+
+def reject_decider(payload: dict) -> dict:
+    return {"approved": False, "comment": "벤치마크 자동 거부"}
+
+
+def override_decider(action: str = "REDUCE_LOAD") -> Callable[[dict], dict]:
+    def decide(payload: dict) -> dict:
+        return {"approved": True, "comment": "벤치마크 조치 수정", "override_action": action}
+    return decide
+
+
+def random_decider(seed: int = 0) -> Callable[[dict], dict]:
+    """승인/거부/수정을 섞어 결정 (재현 가능)"""
+    rng = random.Random(seed)
+    choices = [approve_decider, reject_decider, override_decider()]
+
+    def decide(payload: dict) -> dict:
+        return rng.choice(choices)(payload)
+    return decide
+
+
+DECIDERS = {
+    "approve": lambda: approve_decider,
+    "reject": lambda: reject_decider,
+    "override": override_decider,
+    "random": random_decider,
+}
+
+
+# ============================================
+# 2. 측정 도구
+# ============================================
+def percentile(values: list, q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+class Timings:
+    """이름별 소요 시간(ms) 수집"""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+
+    def wrap_node(self, name: str, fn: Callable) -> Callable:
+        """create_facility_monitor_graph(node_wrapper=...) 용"""
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                # interrupt(GraphInterrupt)로 중단된 실행도 기록
+                self.samples[name].append((time.perf_counter() - start) * 1000)
+        return timed
+
+    def wrap_saver(self, saver) -> None:
+        """체크포인터 쓰기(put/put_writes) 시간 측정"""
+        for method in ("put", "put_writes"):
+            original = getattr(saver, method)
+
+            def timed(*args, _original=original, _name=f"checkpoint.{method}", **kwargs):
+                start = time.perf_counter()
+                try:
+                    return _original(*args, **kwargs)
+                finally:
+                    self.samples[_name].append((time.perf_counter() - start) * 1000)
+            setattr(saver, method, timed)
+
+    def report(self, title: str) -> None:
+        print(f"\n{title}")
+        print(f"  {'항목':<28}{'횟수':>8}{'p50 ms':>12}{'p99 ms':>12}")
+        for name, values in sorted(self.samples.items()):
+            print(f"  {name:<28}{len(values):>8}"
+                  f"{percentile(values, 0.5):>12.3f}{percentile(values, 0.99):>12.3f}")
+
+
+def make_saver(kind: str, directory: str, serde: str = "compact"):
+    if kind == "memory":
+        return MemorySaver(serde=SERDES[serde]())
+    return SqliteCheckpointSaver(
+        os.path.join(directory, f"bench-{time.monotonic_ns()}.db"),
+        retention=None,
+        serde=SERDES[serde](),
+    )
+
+
+def make_graph(saver, serde: str = "compact", **options):
+    """create_facility_monitor_graph 는 직렬화기를 CompactSerializer로 감싸므로
+    비교용 직렬화기(--serde jsonplus)는 컴파일 후 원래대로 되돌림"""
+    graph = lg_app_qa.create_facility_monitor_graph(saver, **options)
+    if serde != "compact":
+        saver.serde = SERDES[serde]()
+    return graph
+
+
+# ============================================
+# 3. 설비 모니터링 그래프 벤치마크
+# ============================================
+def bench_facility(
+    cycles: int, scenarios: list, decider: Callable, saver_kind: str, directory: str, serde: str = "compact",
+) -> None:
+    timings = Timings()
+    saver = make_saver(saver_kind, directory, serde)
+    timings.wrap_saver(saver)
+    graph = make_graph(saver, serde, node_wrapper=timings.wrap_node)
+
+    start = time.perf_counter()
+    interrupted = 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(cycles):
+            scenario = scenarios[i % len(scenarios)]
+            config = {"configurable": {"thread_id": f"bench-{scenario}-{i}"}}
+            cycle_start = time.perf_counter()
+            result = graph.invoke({
+                "sensor_data": lg_app_qa.get_sensor_data(scenario),
+                "facility_id": f"PLANT-{i:06d}",
+                "timestamp": BENCH_TIMESTAMP,
+            }, config=config)
+            if "__interrupt__" in result:
+                interrupted += 1
+                graph.invoke(Command(resume=decider(result["__interrupt__"][0].value)), config=config)
+            timings.samples["cycle"].append((time.perf_counter() - cycle_start) * 1000)
+    elapsed = time.perf_counter() - start
+
+    timings.report(f"[설비 모니터링] 시나리오={','.join(scenarios)} 체크포인터={saver_kind}/{serde}")
+    print(f"  사이클 {cycles}회 / interrupt {interrupted}회 / {cycles / elapsed:,.1f} cycles/sec")
+    if hasattr(saver, "close"):
+        saver.close()
+
+
+def bench_pending_memory(count: int, saver_kind: str, directory: str, serde: str = "compact") -> None:
+    """승인 대기 상태로 남은 스레드 1개당 메모리(및 디스크) 사용량"""
+    saver = make_saver(saver_kind, directory, serde)
+    graph = make_graph(saver, serde)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(count):
+            graph.invoke({
+                "sensor_data": lg_app_qa.get_sensor_data("overheating"),
+                "facility_id": f"PENDING-{i:06d}",
+                "timestamp": BENCH_TIMESTAMP,
+            }, config={"configurable": {"thread_id": f"pending-{i}"}})
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    stats = after.compare_to(before, "filename")
+    grown = sum(stat.size_diff for stat in stats)
+    # 설비별 추세 윈도우는 스레드가 아니라 설비 수에 비례하므로 따로 표시
+    per_facility = sum(
+        stat.size_diff for stat in stats
+        if stat.traceback[0].filename.endswith("lg_qa_trend.py")
+    )
+    print(f"\n[승인 대기 스레드 메모리] 체크포인터={saver_kind}/{serde}")
+    print(f"  스레드 {count}개 / 스레드당 메모리 {(grown - per_facility) / count / 1024:.2f} KiB"
+          f" (+ 설비별 추세 윈도우 {per_facility / count / 1024:.2f} KiB)")
+    print(f"  스레드당 직렬화 크기 {stored_bytes(saver) / count / 1024:.2f} KiB (체크포인트 + 쓰기)")
+    if isinstance(saver, SqliteCheckpointSaver):
+        saver.flush()
+        size = os.path.getsize(saver.path) + os.path.getsize(saver.path + "-wal")
+        print(f"  스레드당 디스크 {size / count / 1024:.2f} KiB")
+        saver.close()
+
+
+def stored_bytes(saver) -> int:
+    """체크포인터에 저장된 직렬화 데이터 총 바이트"""
+    if isinstance(saver, SqliteCheckpointSaver):
+        saver.flush()
+        with saver.lock:
+            checkpoints = saver.conn.execute(
+                "SELECT COALESCE(SUM(LENGTH(checkpoint) + LENGTH(metadata)), 0) FROM checkpoints"
+            ).fetchone()[0]
+            writes = saver.conn.execute("SELECT COALESCE(SUM(LENGTH(value)), 0) FROM writes").fetchone()[0]
+        return checkpoints + writes
+
+    def walk(value) -> int:
+        if isinstance(value, (bytes, bytearray)):
+            return len(value)
+        if isinstance(value, dict):
+            return sum(walk(item) for item in value.values())
+        if isinstance(value, (tuple, list)):
+            return sum(walk(item) for item in value)
+        return 0
+    return walk(saver.storage) + walk(saver.writes)
+
+
+# ============================================
+# 4. 기본 승인 그래프 벤치마크 (lg_approval.py)
+# ============================================
+def bench_approval(cycles: int, approve: bool = True) -> None:
+    import lg_approval
+
+    latencies = []
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(cycles):
+            config = {"configurable": {"thread_id": f"approval-{i}"}}
+            cycle_start = time.perf_counter()
+            result = lg_approval.graph.invoke({"action_details": "서버 재부팅"}, config=config)
+            if "__interrupt__" in result:
+                lg_approval.graph.invoke(Command(resume=approve), config=config)
+            latencies.append((time.perf_counter() - cycle_start) * 1000)
+    elapsed = time.perf_counter() - start
+
+    print(f"\n[기본 승인 그래프] 결정={'승인' if approve else '거부'}")
+    print(f"  사이클 p50 {percentile(latencies, 0.5):.3f} ms / p99 {percentile(latencies, 0.99):.3f} ms"
+          f" / {cycles / elapsed:,.1f} cycles/sec")
+
+
+# ============================================
+# 5. 실행
+# ============================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="HITL 그래프 벤치마크")
+    parser.add_argument("--cycles", type=int, default=400)
+    parser.add_argument("--decider", choices=sorted(DECIDERS), default="approve")
+    parser.add_argument("--saver", choices=["memory", "sqlite"], default="sqlite")
+    parser.add_argument("--serde", choices=sorted(SERDES), default="compact")
+    parser.add_argument("--pending", type=int, default=1000, help="메모리 측정용 승인 대기 스레드 수")
+    args = parser.parse_args()
+
+    decider = DECIDERS[args.decider]()
+    all_scenarios = list(lg_app_qa.SENSOR_SCENARIOS)
+
+    with tempfile.TemporaryDirectory() as directory:
+        # interrupt 없음 (정상 시나리오만) / interrupt 있음 (전체 시나리오)
+        bench_facility(args.cycles, ["normal"], decider, args.saver, directory, args.serde)
+        bench_facility(args.cycles, all_scenarios, decider, args.saver, directory, args.serde)
+        bench_pending_memory(args.pending, args.saver, directory, args.serde)
+    bench_approval(args.cycles)
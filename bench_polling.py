@@ -0,0 +1,105 @@
+"""
+적응형 샘플링 벤치마크
+- 설비 N대가 5초마다 측정값을 보내는 스트림(합성, 기본 2시간)
+  · 98%: 정상 범위에서 잡음만 있는 안정 설비
+  · 2%: 임의 시각부터 20분 동안 온도가 72 -> 95 로 상승 (TEMP_HIGH 80 / TEMP_CRITICAL 90 통과)
+- 고정 주기(모든 측정값 분석)와 AdaptiveSampler(admit 통과분만 분석) 비교
+  · 분석 횟수 = 그래프 사이클 수 = 체크포인트 쓰기 횟수
+  · 감지 지연: 온도가 HIGH / CRITICAL 임계값을 처음 넘은 측정 시각 -> 그 이후 해당 위험도 이상 첫 판정 시각
+
+실행:
+    python bench_polling.py [설비 수] [시간(분)]
+"""
+
+import random
+import statistics
+import sys
+import time
+
+import lg_qa_coalesce
+import lg_qa_trend
+from lg_app_qa import analyze_sensor_data
+from lg_qa_events import ERROR, configure_events
+from lg_qa_polling import AdaptiveSampler, set_adaptive_sampler
+from lg_qa_state import RiskLevel
+from lg_qa_thresholds import get_registry
+
+
+PERIOD = 5.0
+DRIFT_EVERY = 50  # 2%
+DRIFT_SECONDS = 20 * 60
+START = 1.7e9
+
+
+def stream(facilities: int, minutes: int, seed: int = 7):
+    """(facility_id, timestamp, sensor_data) 를 측정 시각 순으로"""
+    rng = random.Random(seed)
+    steps = int(minutes * 60 / PERIOD)
+    drift_start = {
+        i: START + rng.uniform(0.1, 0.6) * minutes * 60
+        for i in range(facilities) if i % DRIFT_EVERY == DRIFT_EVERY - 1
+    }
+    for step in range(steps):
+        timestamp = START + step * PERIOD
+        for i in range(facilities):
+            temperature = 72.0
+            if i in drift_start and timestamp >= drift_start[i]:
+                temperature += min((timestamp - drift_start[i]) / DRIFT_SECONDS, 1.0) * 23.0
+            yield f"PLANT-{i:05d}", timestamp, {
+                "temperature": temperature + rng.gauss(0, 0.3),
+                "pressure": 101.0 + rng.gauss(0, 0.5),
+                "vibration": 0.5 + rng.gauss(0, 0.05),
+                "flow_rate": 150.0 + rng.gauss(0, 1.0),
+                "power_consumption": 850.0 + rng.gauss(0, 5.0),
+            }
+
+
+def run(facilities: int, minutes: int, sampler) -> tuple:
+    lg_qa_trend.set_trend_tracker(None)
+    lg_qa_coalesce.set_coalescer(None)
+    set_adaptive_sampler(sampler)
+    thresholds = get_registry().get(None)
+    crossed = {}  # (facility_id, 위험도) -> 임계값을 처음 넘은 측정 시각
+    detected = {}  # (facility_id, 위험도) -> 임계값을 넘은 뒤 해당 위험도 이상으로 처음 판정한 측정 시각
+    analyzed = 0
+    start = time.perf_counter()
+    for facility_id, timestamp, sensor_data in stream(facilities, minutes):
+        for level, limit in ((RiskLevel.HIGH, thresholds.temp_high), (RiskLevel.CRITICAL, thresholds.temp_critical)):
+            if sensor_data["temperature"] >= limit:
+                crossed.setdefault((facility_id, level), timestamp)
+        if sampler is not None and not sampler.admit(facility_id, timestamp, sensor_data):
+            continue
+        analyzed += 1
+        risk_level = analyze_sensor_data(
+            {"facility_id": facility_id, "timestamp": timestamp, "sensor_data": sensor_data},
+        )["risk_level"]
+        for level in (RiskLevel.HIGH, RiskLevel.CRITICAL):
+            if risk_level.code >= level.code and (facility_id, level) in crossed:
+                detected.setdefault((facility_id, level), timestamp)
+    elapsed = time.perf_counter() - start
+    set_adaptive_sampler(None)
+    delays = {
+        level: [detected[key] - at for key, at in crossed.items() if key[1] == level and key in detected]
+        for level in (RiskLevel.HIGH, RiskLevel.CRITICAL)
+    }
+    missed = sum(1 for key in crossed if key not in detected)
+    return analyzed, elapsed, delays, missed
+
+
+if __name__ == "__main__":
+    facilities = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    minutes = int(sys.argv[2]) if len(sys.argv) > 2 else 120
+    configure_events(level=ERROR)
+    total = facilities * int(minutes * 60 / PERIOD)
+
+    print(f"\n설비 {facilities:,}대 x {minutes}분, {PERIOD:.0f}초 주기 측정값 {total:,}건 (온도 상승 설비 {1 / DRIFT_EVERY:.0%})\n")
+    for name, sampler in (("고정 주기", None), ("AdaptiveSampler", AdaptiveSampler(base_interval=PERIOD))):
+        analyzed, elapsed, delays, missed = run(facilities, minutes, sampler)
+        print(f"{name:<16} 분석 {analyzed:9,}건 ({analyzed / total:6.1%}), {elapsed:6.2f}s")
+        for level, values in delays.items():
+            print(f"  {level} 감지 지연: 평균 {statistics.mean(values):5.1f}s  최대 {max(values):5.1f}s ({len(values)}대)")
+        print(f"  미감지: {missed}")
+        if sampler is not None:
+            intervals = [state["interval"] for state in sampler.snapshot().values()]
+            print(f"  종료 시 주기: 중앙값 {statistics.median(intervals):.0f}s, 최소 {min(intervals):.1f}s, "
+                  f"강제 통과 {sampler.stats['forced']:,}건")
@@ -0,0 +1,85 @@
+"""
+위험도 우선순위 스케줄러 벤치마크 (과부하)
+- 설비 N대 한 번의 스캔을 동시 실행 수가 작은 FleetRunner에 한꺼번에 제출
+  (처리 능력보다 많은 작업이 밀린 상태), 그중 일부 설비는 과열(CRITICAL)
+- FIFO 큐와 RiskScheduler 에서
+  · CRITICAL: 제출 -> 승인 요청(interrupt) 까지 시간 = 가동 중지 결정 착수 시간
+  · LOW: 제출 -> 완료 시간 (모두 완료되는지 = LOW 기아 없음)
+
+실행:
+    python bench_priority.py [설비 수] [동시 실행 수]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+
+from langgraph.checkpoint.memory import MemorySaver
+
+import lg_app_qa
+import lg_qa_coalesce
+import lg_qa_trend
+from lg_qa_events import ERROR, configure_events
+from lg_qa_fleet import FleetRunner
+from lg_qa_priority import RiskScheduler
+from lg_qa_state import CompactSerializer
+
+
+CRITICAL_EVERY = 50  # 2%
+
+
+def readings(count: int) -> list:
+    normal = lg_app_qa.get_sensor_data("normal")
+    overheating = lg_app_qa.get_sensor_data("overheating")
+    return [
+        (f"PLANT-{i:06d}", overheating if i % CRITICAL_EVERY == CRITICAL_EVERY - 1 else normal)
+        for i in range(count)
+    ]
+
+
+async def run(count: int, concurrency: int, scheduler) -> tuple:
+    lg_qa_trend.set_trend_tracker(None)
+    lg_qa_coalesce.set_coalescer(None)
+    graph = lg_app_qa.create_facility_monitor_graph(MemorySaver(serde=CompactSerializer()))
+    submitted, low, critical = {}, [], []
+
+    def on_result(result) -> None:
+        low.append(time.time() - submitted[result.thread_id])
+
+    async with FleetRunner(
+        graph, concurrency=concurrency, max_queued=count, on_result=on_result, scheduler=scheduler,
+    ) as runner:
+        start = time.perf_counter()
+        for facility_id, sensor_data in readings(count):
+            submitted[facility_id] = time.time()
+            await runner.submit(facility_id, sensor_data, thread_id=facility_id)
+        await runner.join()
+        elapsed = time.perf_counter() - start
+        while not runner.approvals.empty():
+            pending = runner.approvals.get_nowait()
+            critical.append(pending.parked_at.timestamp() - submitted[pending.thread_id])
+    return elapsed, low, critical
+
+
+def summary(latencies: list) -> str:
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0.0
+    return (f"{len(latencies):6,}건  p50 {statistics.median(latencies) * 1000:8.1f} ms"
+            f"  p95 {p95 * 1000:8.1f} ms  max {latencies[-1] * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    configure_events(level=ERROR)
+
+    print(f"\n설비 {count:,}대 한꺼번에 제출, 동시 실행 {concurrency}, CRITICAL {1 / CRITICAL_EVERY:.0%}\n")
+    for name, scheduler in (("FIFO", None), ("RiskScheduler", RiskScheduler())):
+        elapsed, low, critical = asyncio.run(run(count, concurrency, scheduler))
+        print(f"{name}  (전체 {elapsed:.2f}s, {count / elapsed:,.0f} cycles/sec)")
+        print(f"  CRITICAL 승인 요청까지  {summary(critical)}")
+        print(f"  LOW 완료까지            {summary(low)}")
+        if scheduler is not None:
+            late = {level: stats["late"] for level, stats in scheduler.snapshot().items()}
+            print(f"  기한 초과: {late}")
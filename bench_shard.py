@@ -0,0 +1,76 @@
+"""
+멀티프로세스 샤딩 벤치마크
+- 단일 프로세스(그래프 1개) 대비 워커 수별 초당 사이클 수
+- 승인 대기 건은 코디네이터에서 일괄 승인으로 재개 (샤드 라우팅 확인)
+
+실행:
+    python bench_shard.py [사이클 수] [워커 수 ...]
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.types import Command
+
+import lg_app_qa
+from lg_qa_events import ERROR, configure_events
+from lg_qa_shard import ShardedExecutor
+from lg_qa_state import CompactSerializer
+
+
+SCENARIOS = ["normal"] * 9 + ["overheating"]  # 대부분 정상, 10%는 승인 필요
+DECISION = {"approved": True, "comment": "벤치마크 일괄 승인"}
+
+
+def facilities(count: int) -> list:
+    return [(f"PLANT-{i:06d}", lg_app_qa.get_sensor_data(SCENARIOS[i % len(SCENARIOS)])) for i in range(count)]
+
+
+def bench_single(count: int) -> float:
+    configure_events(level=ERROR)
+    graph = lg_app_qa.create_facility_monitor_graph(MemorySaver(serde=CompactSerializer()))
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i, (facility_id, sensor_data) in enumerate(facilities(count)):
+            config = {"configurable": {"thread_id": f"single-{i}"}}
+            result = graph.invoke(
+                {"sensor_data": sensor_data, "facility_id": facility_id, "timestamp": time.time()}, config,
+            )
+            if "__interrupt__" in result:
+                graph.invoke(Command(resume=DECISION), config)
+    return time.perf_counter() - start
+
+
+def bench_sharded(count: int, workers: int, directory: str) -> tuple:
+    executor = ShardedExecutor(workers=workers, checkpoint_dir=os.path.join(directory, f"w{workers}"))
+    executor.start()  # 워커 기동(spawn + import) 시간은 제외
+    start = time.perf_counter()
+    for facility_id, sensor_data in facilities(count):
+        executor.submit(facility_id, sensor_data)
+    executor.join()
+    while not executor.approvals.empty():
+        executor.resume(executor.approvals.get_nowait().thread_id, DECISION)
+    executor.join()
+    elapsed = time.perf_counter() - start
+    stats = dict(executor.stats)
+    executor.close()
+    return elapsed, stats
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    worker_counts = [int(n) for n in sys.argv[2:]] or sorted({1, 2, os.cpu_count() or 1})
+
+    print(f"\n사이클 수: {count} / CPU 코어 {os.cpu_count()}\n")
+    single = bench_single(count)
+    print(f"{'단일 프로세스':<16}{single:8.2f}s {count / single:10,.0f} cycles/sec")
+    with tempfile.TemporaryDirectory() as directory:
+        for workers in worker_counts:
+            elapsed, stats = bench_sharded(count, workers, directory)
+            print(f"{f'워커 {workers}개':<16}{elapsed:8.2f}s {count / elapsed:10,.0f} cycles/sec"
+                  f"  (완료 {stats['completed']} / 승인 대기 {stats['interrupted']} / 실패 {stats['failed']})")
@@ -0,0 +1,94 @@
+"""
+시작 시간 벤치마크 (콜드 스타트)
+- 매 측정마다 새 인터프리터를 띄워 import 캐시 없이 측정 (반복 중 최솟값 보고)
+- lg_app_qa.py / lg_approval.py import 시간, 첫 분석까지의 시간, 첫 그래프 사이클까지의 시간
+- import 시간과 첫 분석 시간은 예산(BUDGET_MS)과 비교하여 초과 시 종료 코드 1
+  (엣지 게이트웨이에서 프로세스 재시작 후 첫 판정이 늦어지는 회귀 방지)
+
+실행:
+    python bench_startup.py [반복 횟수]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+
+# 측정 항목 -> (설명, 자식 프로세스 코드). 코드는 elapsed(ms)를 출력해야 함
+CASES = {
+    "import_app": (
+        "import lg_app_qa",
+        "import lg_app_qa",
+    ),
+    "import_approval": (
+        "import lg_approval",
+        "import lg_approval",
+    ),
+    "first_analysis": (
+        "import + 첫 분석 (analyze_sensor_data)",
+        "import lg_app_qa\n"
+        "from lg_qa_events import ERROR, configure_events\n"
+        "configure_events(level=ERROR)\n"
+        "lg_app_qa.analyze_sensor_data({'sensor_data': lg_app_qa.get_sensor_data('overheating'),"
+        " 'facility_id': 'PLANT-BENCH', 'timestamp': 0.0})",
+    ),
+    "first_cycle": (
+        "import + 첫 그래프 사이클 (컴파일 포함)",
+        "import lg_app_qa\n"
+        "from lg_qa_events import ERROR, configure_events\n"
+        "configure_events(level=ERROR)\n"
+        "lg_app_qa.get_facility_monitor_graph().invoke({'sensor_data': lg_app_qa.get_sensor_data('normal'),"
+        " 'facility_id': 'PLANT-BENCH', 'timestamp': 0.0}, {'configurable': {'thread_id': 'bench'}})",
+    ),
+    "first_approval": (
+        "import + 첫 승인 요청 (lg_approval)",
+        "import lg_approval\n"
+        "lg_approval.graph.invoke({'action_details': '서버 재부팅'}, {'configurable': {'thread_id': 'bench'}})",
+    ),
+}
+
+# 밀리초. 예산이 없는 항목은 보고만 함 (그래프 사이클은 langgraph import 시간이 대부분)
+BUDGET_MS = {
+    "import_app": 150,
+    "import_approval": 100,
+    "first_analysis": 200,
+}
+
+_TEMPLATE = """\
+import time
+_start = time.perf_counter()
+{code}
+print((time.perf_counter() - _start) * 1000)
+"""
+
+
+def measure(code: str, env: dict) -> float:
+    output = subprocess.run(
+        [sys.executable, "-c", _TEMPLATE.format(code=code)],
+        capture_output=True, text=True, check=True, env=env,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    over = []
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(os.environ, QA_CHECKPOINT_DB=os.path.join(directory, "bench.db"))
+        print(f"\n반복 {repeat}회 최솟값 (인터프리터 기동 시간 제외)\n")
+        for name, (label, code) in CASES.items():
+            elapsed = min(measure(code, env) for _ in range(repeat))
+            budget = BUDGET_MS.get(name)
+            verdict = ""
+            if budget is not None:
+                verdict = f"예산 {budget}ms {'OK' if elapsed <= budget else '초과'}"
+                if elapsed > budget:
+                    over.append(name)
+            print(f"{label:<40}{elapsed:9.1f} ms   {verdict}")
+
+    if over:
+        print(f"\n예산 초과: {', '.join(over)}")
+        sys.exit(1)
@@ -0,0 +1 @@
+"""pytest 설정: 저장소 루트의 lg_qa_* 모듈을 tests/ 에서 가져올 수 있도록 루트를 sys.path에 둠"""
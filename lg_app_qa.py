@@ -3,160 +3,251 @@
 - 이상 징후 AI 자동 감지
 - 전문가 승인 기반 가동 중지 결정
 - 안전 프로토콜 준수율 추적
+
+시작 시간: langgraph/langchain_core(약 0.8초)는 그래프를 처음 만들 때 가져옴.
+모듈 import와 분석 노드(analyze_sensor_data)는 langgraph 없이 동작하며,
+warm_up()으로 그래프 생성을 백그라운드에서 미리 시작할 수 있음 (bench_startup.py)
 """
 
+from __future__ import annotations
+
+import os
+import time
 import uuid
-import asyncio
-from datetime import datetime
-from typing import Literal, Optional
+import threading
+from typing import TYPE_CHECKING, Callable, Literal, Optional, Union
 from typing_extensions import TypedDict
-from langgraph.graph import StateGraph, START, END
-from langgraph.types import interrupt, Command
-from langgraph.checkpoint.memory import MemorySaver
+
+from lg_qa_anomaly import get_anomaly_scorer
+from lg_qa_audit import configure_audit_log, get_audit_log
+from lg_qa_coalesce import alert_signature, get_coalescer
+from lg_qa_control import get_dispatcher, idempotency_key
+from lg_qa_events import INFO, WARNING, emit
+from lg_qa_metrics import get_profiler
+from lg_qa_polling import get_adaptive_sampler
+from lg_qa_state import (
+    ISSUE_CRITICAL, ISSUE_HIGH, Action, Analysis, CompactSerializer, Issue, RiskLevel,
+    SensorReadings, coerce_action, format_timestamp, to_epoch,
+)
+from lg_qa_thresholds import get_registry
+from lg_qa_trend import get_trend_tracker
+
+if TYPE_CHECKING:
+    from langchain_core.runnables import RunnableConfig
+    from langgraph.checkpoint.base import BaseCheckpointSaver
+    from langgraph.types import Command
+
+    from lg_qa_checkpoint import SqliteCheckpointSaver
+
+# langgraph END 노드 이름 (langgraph를 가져오지 않고 라우팅 대상에 사용)
+END = "__end__"
 
 
 # ============================================
 # 1. 상태 정의 (제조 현장 데이터)
 # ============================================
 class FacilityState(TypedDict):
-    # 센서 데이터
-    sensor_data: dict
-    # AI 분석 결과
-    ai_analysis: str
-    risk_level: str  # LOW, MEDIUM, HIGH, CRITICAL
-    recommended_action: str
+    # 센서 데이터 (dict도 받지만 분석 노드에서 SensorReadings로 변환, lg_qa_state.py)
+    sensor_data: SensorReadings
+    # AI 분석 결과 (str()로 분석 문구 생성)
+    ai_analysis: Analysis
+    risk_level: RiskLevel  # LOW, HIGH, CRITICAL
+    recommended_action: Union[Action, str]  # 전문가가 직접 입력한 조치는 문자열
     # 인간 승인 관련
     human_approval: Optional[bool]
     expert_comment: Optional[str]
     # 최종 액션
     final_action: str
     # 메타데이터
-    timestamp: str
+    timestamp: float  # epoch 초 (ISO 문자열 입력은 분석 노드에서 변환)
     facility_id: str
+    # 반복 경보 병합 시 기존 승인 대기 스레드 ID (lg_qa_coalesce.py)
+    coalesced_into: Optional[str]
 
 
 # ============================================
 # 2. 센서 데이터 시뮬레이션
 # ============================================
-def get_sensor_data(scenario: str = "normal") -> dict:
-    """실제 현장에서는 SCADA/IoT 시스템에서 데이터 수집"""
-    
-    scenarios = {
-        "normal": {
-            "temperature": 72.5,
-            "pressure": 101.3,
-            "vibration": 0.5,
-            "flow_rate": 150.0,
-            "power_consumption": 850.0
-        },
-        "overheating": {
-            "temperature": 95.8,  # 임계값 초과
-            "pressure": 105.2,
-            "vibration": 2.3,
-            "flow_rate": 145.0,
-            "power_consumption": 1050.0
-        },
-        "pressure_spike": {
-            "temperature": 75.0,
-            "pressure": 125.5,  # 위험 수준
-            "vibration": 1.8,
-            "flow_rate": 140.0,
-            "power_consumption": 920.0
-        },
-        "vibration_anomaly": {
-            "temperature": 73.0,
-            "pressure": 102.0,
-            "vibration": 5.2,  # 비정상 진동
-            "flow_rate": 148.0,
-            "power_consumption": 870.0
-        }
+SENSOR_SCENARIOS = {
+    "normal": {
+        "temperature": 72.5,
+        "pressure": 101.3,
+        "vibration": 0.5,
+        "flow_rate": 150.0,
+        "power_consumption": 850.0
+    },
+    "overheating": {
+        "temperature": 95.8,  # 임계값 초과
+        "pressure": 105.2,
+        "vibration": 2.3,
+        "flow_rate": 145.0,
+        "power_consumption": 1050.0
+    },
+    "pressure_spike": {
+        "temperature": 75.0,
+        "pressure": 125.5,  # 위험 수준
+        "vibration": 1.8,
+        "flow_rate": 140.0,
+        "power_consumption": 920.0
+    },
+    "vibration_anomaly": {
+        "temperature": 73.0,
+        "pressure": 102.0,
+        "vibration": 5.2,  # 비정상 진동
+        "flow_rate": 148.0,
+        "power_consumption": 870.0
     }
+}
+
+
+def get_sensor_data(scenario: str = "normal") -> SensorReadings:
+    """실제 현장에서는 SCADA/IoT 시스템에서 데이터 수집
     
-    return scenarios.get(scenario, scenarios["normal"])
+    녹화된 텔레메트리를 연속으로 재생하려면 lg_qa_ingest.py 사용
+    """
+    
+    # 상태에 저장되므로 공용 시나리오 dict와 분리된 압축 표현으로 반환
+    return SensorReadings(SENSOR_SCENARIOS.get(scenario, SENSOR_SCENARIOS["normal"]))
 
 
 # ============================================
 # 3. AI 분석 노드
 # ============================================
-def analyze_sensor_data(state: FacilityState) -> dict:
-    """센서 데이터 분석 및 위험도 평가"""
-    
-    sensor_data = state["sensor_data"]
+def evaluate_rules(thresholds, temp: float, pressure: float, vibration: float) -> tuple:
+    """임계값 규칙 판정
     
-    # 임계값 설정 (실제 현장에서는 설비별로 다름)
-    TEMP_CRITICAL = 90.0
-    TEMP_HIGH = 80.0
-    PRESSURE_CRITICAL = 120.0
-    PRESSURE_HIGH = 110.0
-    VIBRATION_CRITICAL = 4.0
-    VIBRATION_HIGH = 2.0
-    
-    temp = sensor_data.get("temperature", 0)
-    pressure = sensor_data.get("pressure", 0)
-    vibration = sensor_data.get("vibration", 0)
+    Returns:
+        (위험 이슈, 주의 이슈, (위험도, 권장 조치, 분석 결과))
+        분석 결과는 추세 이슈가 없을 때 기준
+    """
+    (TEMP_CRITICAL, TEMP_HIGH,
+     PRESSURE_CRITICAL, PRESSURE_HIGH,
+     VIBRATION_CRITICAL, VIBRATION_HIGH) = thresholds
     
     # 위험도 분석
     critical_issues = []
     high_issues = []
     
     if temp >= TEMP_CRITICAL:
-        critical_issues.append(f"온도 위험: {temp}°C (임계값: {TEMP_CRITICAL}°C)")
+        critical_issues.append(Issue(ISSUE_CRITICAL, "temperature", temp, TEMP_CRITICAL))
     elif temp >= TEMP_HIGH:
-        high_issues.append(f"온도 주의: {temp}°C")
+        high_issues.append(Issue(ISSUE_HIGH, "temperature", temp, TEMP_HIGH))
     
     if pressure >= PRESSURE_CRITICAL:
-        critical_issues.append(f"압력 위험: {pressure} kPa (임계값: {PRESSURE_CRITICAL} kPa)")
+        critical_issues.append(Issue(ISSUE_CRITICAL, "pressure", pressure, PRESSURE_CRITICAL))
     elif pressure >= PRESSURE_HIGH:
-        high_issues.append(f"압력 주의: {pressure} kPa")
+        high_issues.append(Issue(ISSUE_HIGH, "pressure", pressure, PRESSURE_HIGH))
     
     if vibration >= VIBRATION_CRITICAL:
-        critical_issues.append(f"진동 위험: {vibration} mm/s (임계값: {VIBRATION_CRITICAL} mm/s)")
+        critical_issues.append(Issue(ISSUE_CRITICAL, "vibration", vibration, VIBRATION_CRITICAL))
     elif vibration >= VIBRATION_HIGH:
-        high_issues.append(f"진동 주의: {vibration} mm/s")
+        high_issues.append(Issue(ISSUE_HIGH, "vibration", vibration, VIBRATION_HIGH))
     
-    # 위험도 레벨 결정
+    # 위험도 레벨 결정 (분석 문구는 Analysis를 str()로 변환할 때 생성)
     if critical_issues:
-        risk_level = "CRITICAL"
-        recommended_action = "IMMEDIATE_SHUTDOWN"
-        analysis = f"🚨 긴급 상황 감지!\n" + "\n".join(critical_issues)
+        verdict = (RiskLevel.CRITICAL, Action.IMMEDIATE_SHUTDOWN, Analysis(RiskLevel.CRITICAL, critical_issues))
     elif high_issues:
-        risk_level = "HIGH"
-        recommended_action = "CONTROLLED_SHUTDOWN"
-        analysis = f"⚠️ 주의 필요!\n" + "\n".join(high_issues)
+        verdict = (RiskLevel.HIGH, Action.CONTROLLED_SHUTDOWN, Analysis(RiskLevel.HIGH, high_issues))
     else:
-        risk_level = "LOW"
-        recommended_action = "CONTINUE_MONITORING"
-        analysis = "✅ 정상 범위 내 작동 중"
-    
-    print(f"\n{'='*60}")
-    print(f"🤖 AI 분석 완료 - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"{'='*60}")
-    print(f"위험도: {risk_level}")
-    print(f"분석 결과:\n{analysis}")
-    print(f"권장 조치: {recommended_action}")
-    print(f"{'='*60}\n")
-    
-    return {
+        verdict = (RiskLevel.LOW, Action.CONTINUE_MONITORING, Analysis(RiskLevel.LOW))
+    return tuple(critical_issues), tuple(high_issues), verdict
+
+
+def analyze_sensor_data(state: FacilityState, config: Optional[RunnableConfig] = None) -> dict:
+    """센서 데이터 분석 및 위험도 평가"""
+    
+    sensor_data = SensorReadings.coerce(state["sensor_data"])
+    timestamp = to_epoch(state.get("timestamp"))
+    
+    # 임계값 설정 (설비별 레지스트리에서 조회, lg_qa_thresholds.py)
+    thresholds = get_registry().get(state.get("facility_id"))
+    
+    # 임계값 규칙 판정. 결과를 캐시하지 않음: 규칙은 비교 3회라 캐시 키 해시/조회가 더 비싸고,
+    # 나머지 단계(추세/이상 점수/샘플링)는 설비별 이력에 따라 달라지므로 메모이즈할 수 없음
+    critical_issues, high_issues, (risk_level, recommended_action, analysis) = evaluate_rules(
+        thresholds,
+        sensor_data.get("temperature", 0),
+        sensor_data.get("pressure", 0),
+        sensor_data.get("vibration", 0),
+    )
+    
+    # 추세 분석 (임계값 도달 전 상승 추세 / 급격한 변화율 → HIGH)
+    extra_issues = []
+    if state.get("facility_id"):
+        extra_issues += get_trend_tracker().update(
+            state["facility_id"],
+            timestamp,
+            sensor_data,
+            thresholds,
+        )
+    # 다변량 이상 점수 (채널 간 상관관계 이탈 → HIGH, 설정된 경우에만, lg_qa_anomaly.py)
+    scorer = get_anomaly_scorer()
+    if scorer is not None:
+        # 규칙/추세로 이미 이상인 측정값은 정상 분포 학습에서 제외되도록 판정 결과를 함께 전달
+        verdict = RiskLevel.HIGH if extra_issues and risk_level == RiskLevel.LOW else risk_level
+        extra_issues += scorer.assess(state.get("facility_id"), sensor_data, verdict)
+    if extra_issues and not critical_issues:
+        risk_level = RiskLevel.HIGH
+        recommended_action = Action.CONTROLLED_SHUTDOWN
+        analysis = Analysis(risk_level, high_issues + tuple(extra_issues))
+    
+    # 설비별 다음 샘플링 주기 갱신 (설정된 경우에만, lg_qa_polling.py)
+    sampler = get_adaptive_sampler()
+    if sampler is not None and state.get("facility_id"):
+        sampler.update(state["facility_id"], timestamp, sensor_data, risk_level, thresholds)
+    
+    emit(
+        INFO, "analysis.completed",
+        facility_id=state.get("facility_id"),
+        risk_level=risk_level,
+        analysis=analysis,
+        recommended_action=recommended_action,
+    )
+    
+    result = {
         "ai_analysis": analysis,
         "risk_level": risk_level,
         "recommended_action": recommended_action
     }
+    # 호출자가 dict / ISO 문자열로 넘긴 경우 이후 체크포인트에는 압축 표현으로 저장
+    if sensor_data is not state["sensor_data"]:
+        result["sensor_data"] = sensor_data
+    if timestamp != state.get("timestamp"):
+        result["timestamp"] = timestamp
+    
+    # 반복 경보 병합: 같은 사건의 승인 대기 건이 있으면 그 스레드에 병합
+    # (분석 결과와 함께 체크포인트에 저장되므로 승인 노드가 재개되어도 판단이 바뀌지 않음)
+    # 스레드를 여러 사이클에 재사용하므로 병합되지 않은 사이클은 이전 값을 반드시 지움
+    existing = None
+    thread_id = (config or {}).get("configurable", {}).get("thread_id")
+    if risk_level != RiskLevel.LOW and thread_id and state.get("facility_id"):
+        existing = get_coalescer().register(
+            state["facility_id"],
+            alert_signature(result),
+            thread_id,
+            sensor_data,
+            timestamp,
+        )
+    result["coalesced_into"] = existing.thread_id if existing is not None else None
+    
+    return result
 
 
 # ============================================
 # 4. 전문가 승인 노드 (interrupt 사용)
 # ============================================
-def expert_approval_node(state: FacilityState) -> Command[Literal["execute_action", "override_action"]]:
+def expert_approval_node(state: FacilityState, config: RunnableConfig) -> Command[Literal["execute_action", "override_action", "__end__"]]:
     """
     전문가 승인을 위한 Human-in-the-Loop 노드
     HIGH 또는 CRITICAL 위험도일 경우 반드시 전문가 검토 필요
     """
+    from langgraph.types import Command, interrupt
     
     risk_level = state["risk_level"]
     
     # LOW 위험도는 자동 승인
-    if risk_level == "LOW":
-        print("✅ 위험도 낮음 - 자동 승인")
+    if risk_level == RiskLevel.LOW:
+        emit(INFO, "approval.auto", facility_id=state.get("facility_id"))
         return Command(
             goto="execute_action",
             update={
@@ -165,27 +256,34 @@ def expert_approval_node(state: FacilityState) -> Command[Literal["execute_actio
             }
         )
     
+    # 이미 승인 대기 중인 같은 사건에 병합된 경우 새 interrupt 없이 종료
+    if state.get("coalesced_into"):
+        emit(INFO, "approval.coalesced", facility_id=state.get("facility_id"), thread_id=state["coalesced_into"])
+        _record_audit(state, config, "COALESCED")
+        return Command(
+            goto=END,
+            update={"final_action": "COALESCED"}
+        )
+    
     # HIGH, CRITICAL은 전문가 승인 필요
-    print(f"\n{'='*60}")
-    print(f"⏸️  전문가 검토 대기 중...")
-    print(f"{'='*60}")
-    print(f"설비 ID: {state['facility_id']}")
-    print(f"위험도: {risk_level}")
-    print(f"AI 권장 조치: {state['recommended_action']}")
-    print(f"\n센서 데이터:")
-    for key, value in state['sensor_data'].items():
-        print(f"  - {key}: {value}")
-    print(f"{'='*60}\n")
+    emit(
+        WARNING, "approval.requested",
+        facility_id=state["facility_id"],
+        risk_level=risk_level,
+        recommended_action=state["recommended_action"],
+        sensor_data=state["sensor_data"],
+    )
     
     # interrupt로 전문가 입력 대기
+    # (값은 인박스/웹 UI 등 외부로 그대로 전달되므로 JSON으로 직렬화 가능한 기본 타입만 담음)
     approval_data = interrupt({
         "type": "expert_approval_required",
         "facility_id": state["facility_id"],
-        "risk_level": risk_level,
-        "ai_analysis": state["ai_analysis"],
-        "recommended_action": state["recommended_action"],
-        "sensor_data": state["sensor_data"],
-        "timestamp": state["timestamp"]
+        "risk_level": str(risk_level),
+        "ai_analysis": str(state["ai_analysis"]),
+        "recommended_action": str(state["recommended_action"]),
+        "sensor_data": dict(state["sensor_data"]),
+        "timestamp": format_timestamp(state["timestamp"])
     })
     
     # 전문가 결정 처리
@@ -193,14 +291,16 @@ def expert_approval_node(state: FacilityState) -> Command[Literal["execute_actio
     comment = approval_data.get("comment", "")
     override_action = approval_data.get("override_action", None)
     
-    print(f"\n{'='*60}")
-    print(f"👤 전문가 결정 수신")
-    print(f"{'='*60}")
-    print(f"승인 여부: {'✅ 승인' if approved else '❌ 거부'}")
-    print(f"전문가 의견: {comment}")
-    if override_action:
-        print(f"수정된 조치: {override_action}")
-    print(f"{'='*60}\n")
+    # 사건 종료 → 이후 같은 경보는 새 승인 요청
+    get_coalescer().release(state["facility_id"], alert_signature(state), config["configurable"]["thread_id"])
+    
+    emit(
+        INFO, "approval.received",
+        facility_id=state["facility_id"],
+        approved=approved,
+        comment=comment,
+        override_action=override_action,
+    )
     
     update_data = {
         "human_approval": approved,
@@ -209,7 +309,7 @@ def expert_approval_node(state: FacilityState) -> Command[Literal["execute_actio
     
     # 전문가가 다른 조치를 지정한 경우
     if override_action:
-        update_data["recommended_action"] = override_action
+        update_data["recommended_action"] = coerce_action(override_action)
         return Command(goto="override_action", update=update_data)
     
     return Command(goto="execute_action", update=update_data)
@@ -218,61 +318,93 @@ def expert_approval_node(state: FacilityState) -> Command[Literal["execute_actio
 # ============================================
 # 5. 조치 실행 노드
 # ============================================
-def execute_action_node(state: FacilityState) -> dict:
+def execute_action_node(state: FacilityState, config: Optional[RunnableConfig] = None) -> dict:
     """승인된 조치 실행"""
-    
+    return _execute_action(state, config, overridden=False)
+
+
+def _execute_action(state: FacilityState, config: Optional[RunnableConfig], overridden: bool) -> dict:
     action = state["recommended_action"]
     approved = state.get("human_approval", False)
     
     if not approved:
-        print("❌ 전문가 승인 없음 - 조치 실행 취소")
+        emit(INFO, "action.cancelled", facility_id=state.get("facility_id"), action=action)
+        _record_audit(state, config, "NO_ACTION_TAKEN", overridden)
         return {"final_action": "NO_ACTION_TAKEN"}
     
-    print(f"\n{'='*60}")
-    print(f"⚙️  조치 실행 중...")
-    print(f"{'='*60}")
-    
-    action_map = {
-        "IMMEDIATE_SHUTDOWN": "🛑 긴급 가동 중지 실행",
-        "CONTROLLED_SHUTDOWN": "⏬ 제어된 가동 중지 실행",
-        "CONTINUE_MONITORING": "👁️ 모니터링 계속",
-        "REDUCE_LOAD": "📉 부하 감소 실행",
-        "MAINTENANCE_ALERT": "🔧 유지보수 알림 전송"
-    }
-    
-    action_message = action_map.get(action, f"조치: {action}")
-    print(f"{action_message}")
-    print(f"전문가 의견: {state.get('expert_comment', 'N/A')}")
-    print(f"{'='*60}\n")
-    
-    # 실제 시스템에서는 여기서 SCADA/PLC 제어 명령 전송
-    # send_control_command(facility_id, action)
-    
+    # 조치별 표시 문구는 콘솔 싱크에서 처리 (lg_qa_events.ACTION_MESSAGES)
+    emit(
+        INFO, "action.executed",
+        facility_id=state.get("facility_id"),
+        action=action,
+        comment=state.get("expert_comment", "N/A"),
+    )
+    
+    # SCADA/PLC 제어 명령 전송 (lg_qa_control.py)
+    # 디스패처 큐에 넣고 바로 반환하며, 전송/재시도는 디스패처 작업 스레드가 처리.
+    # 멱등 키는 승인된 사이클(스레드 + 측정 시각) 단위라 노드가 재실행되어도 명령은 한 번만 적용됨
+    dispatcher = get_dispatcher()
+    if dispatcher is not None and action != Action.CONTINUE_MONITORING:
+        facility_id = state.get("facility_id")
+        thread_id = (config or {}).get("configurable", {}).get("thread_id", "")
+        key = idempotency_key(thread_id, facility_id, str(action), to_epoch(state.get("timestamp")))
+        dispatcher.submit(facility_id, action, key)
+    
+    _record_audit(state, config, action, overridden)
     return {"final_action": action}
 
 
-def override_action_node(state: FacilityState) -> dict:
+def override_action_node(state: FacilityState, config: Optional[RunnableConfig] = None) -> dict:
     """전문가가 조치를 수정한 경우"""
-    print(f"\n⚠️ 전문가가 AI 권장 조치를 수정했습니다")
-    print(f"원래 권장 조치: {state['ai_analysis']}")
-    print(f"수정된 조치: {state['recommended_action']}\n")
-    
-    return execute_action_node(state)
+    emit(
+        INFO, "action.overridden",
+        facility_id=state.get("facility_id"),
+        original=state["ai_analysis"],
+        action=state["recommended_action"],
+    )
+    
+    return _execute_action(state, config, overridden=True)
+
+
+def _record_audit(state: FacilityState, config: Optional[RunnableConfig], final_action, overridden: bool = False) -> None:
+    """완료된 사이클을 감사 로그에 기록 (설정된 경우에만, lg_qa_audit.py)"""
+    audit_log = get_audit_log()
+    if audit_log is not None:
+        thread_id = (config or {}).get("configurable", {}).get("thread_id", "")
+        audit_log.record(state, final_action, thread_id=thread_id, overridden=overridden)
 
 
 # ============================================
 # 6. 그래프 구성
 # ============================================
-def create_facility_monitor_graph():
-    """HITL 패턴이 적용된 설비 모니터링 그래프 생성"""
+def create_facility_monitor_graph(
+    checkpointer: Optional[BaseCheckpointSaver] = None,
+    node_wrapper: Optional[Callable] = None,
+):
+    """HITL 패턴이 적용된 설비 모니터링 그래프 생성
+    
+    checkpointer를 지정하지 않으면 QA_CHECKPOINT_DB(기본 qa_checkpoints.db)
+    SQLite 파일에 저장하여, 프로세스 재시작 후에도 승인 대기 스레드를 재개할 수 있음
+    지정한 checkpointer의 직렬화기가 CompactSerializer가 아니면 감싸서 교체함 (_ensure_state_serde)
+    
+    node_wrapper(name, fn)를 주면 각 노드 함수를 감싼 함수로 등록 (측정/계측용).
+    감싼 함수는 functools.wraps로 원래 시그니처를 유지해야 함
+    """
+    from langgraph.graph import START, StateGraph
     
     builder = StateGraph(FacilityState)
+    wrap = node_wrapper or (lambda name, fn: fn)
     
     # 노드 추가
-    builder.add_node("analyze", analyze_sensor_data)
-    builder.add_node("expert_approval", expert_approval_node)
-    builder.add_node("execute_action", execute_action_node)
-    builder.add_node("override_action", override_action_node)
+    builder.add_node("analyze", wrap("analyze", analyze_sensor_data))
+    # 반환 타입(Command[Literal[...]])은 지연 import 때문에 문자열이므로 이동 대상을 직접 지정
+    builder.add_node(
+        "expert_approval",
+        wrap("expert_approval", expert_approval_node),
+        destinations=("execute_action", "override_action", END),
+    )
+    builder.add_node("execute_action", wrap("execute_action", execute_action_node))
+    builder.add_node("override_action", wrap("override_action", override_action_node))
     
     # 플로우 정의
     builder.add_edge(START, "analyze")
@@ -282,19 +414,119 @@ def create_facility_monitor_graph():
     builder.add_edge("override_action", END)
     
     # 체크포인터 설정 (상태 저장용)
-    memory = MemorySaver()
-    graph = builder.compile(checkpointer=memory)
+    if checkpointer is None:
+        checkpointer = _default_checkpointer()
+    graph = builder.compile(checkpointer=_ensure_state_serde(checkpointer))
     
     return graph
 
 
+def _ensure_state_serde(checkpointer):
+    """설비 상태 타입(SensorReadings, Analysis, RiskLevel 등)을 복원할 수 있는 직렬화기로 맞춤
+
+    기본 JsonPlusSerializer는 이 타입들을 미등록 타입으로 경고하고,
+    LANGGRAPH_STRICT_MSGPACK=true 에서는 dict로 복원해 이후 노드가 깨짐.
+    CompactSerializer가 아니면 기존 직렬화기를 inner로 감싸 제자리 교체
+    (기존 형식으로 저장된 체크포인트는 inner가 그대로 읽음)
+    """
+    serde = getattr(checkpointer, "serde", None)
+    if serde is not None and not isinstance(serde, CompactSerializer):
+        checkpointer.serde = CompactSerializer(inner=serde)
+    return checkpointer
+
+
+def _default_checkpointer() -> SqliteCheckpointSaver:
+    """QA_CHECKPOINT_DB SQLite 파일 + 설비 상태 압축 직렬화기
+    
+    스레드별 최신 체크포인트만 유지 (완료된 사이클 이력은 감사 로그에 기록, lg_qa_audit.py)
+    """
+    from lg_qa_checkpoint import SqliteCheckpointSaver
+    
+    return SqliteCheckpointSaver(
+        os.environ.get("QA_CHECKPOINT_DB", "qa_checkpoints.db"),
+        serde=CompactSerializer(),
+        compact=True,
+    )
+
+
+# ============================================
+# 6-1. 컴파일된 그래프 캐시 (프로세스 공용)
+# ============================================
+# 최초 사용 시 한 번만 컴파일하고, 모든 모니터링 사이클/스레드/asyncio 태스크가
+# 같은 그래프와 체크포인터를 공유함. 노드 함수 코드가 바뀐 경우(모듈 리로드,
+# 교체)에만 다시 컴파일하며 체크포인터는 그대로 유지하여 다른 스레드 상태를 보존.
+# 임계값은 노드가 매 호출마다 레지스트리에서 조회하므로 재컴파일이 필요 없음
+_graph_lock = threading.Lock()
+_cached_graph = None
+_cached_graph_key = None
+_cached_checkpointer: Optional[BaseCheckpointSaver] = None
+
+
+def _graph_cache_key() -> tuple:
+    """노드 함수 코드 식별자 + 프로파일러 (둘 중 하나가 바뀌면 달라짐)"""
+    return tuple(
+        id(globals()[name].__code__)
+        for name in ("analyze_sensor_data", "expert_approval_node",
+                     "execute_action_node", "override_action_node")
+    ) + (id(get_profiler()),)
+
+
+def get_facility_monitor_graph():
+    """캐시된 설비 모니터링 그래프 반환 (필요할 때만 컴파일)"""
+    global _cached_graph, _cached_graph_key, _cached_checkpointer
+    
+    key = _graph_cache_key()
+    graph = _cached_graph
+    if graph is not None and _cached_graph_key == key:
+        return graph
+    
+    with _graph_lock:
+        if _cached_graph is None or _cached_graph_key != key:
+            if _cached_checkpointer is None:
+                _cached_checkpointer = _default_checkpointer()
+            # 프로파일링 활성화 시에만 노드/체크포인터 계측 (lg_qa_metrics.py)
+            profiler = get_profiler()
+            if profiler is not None:
+                profiler.instrument_saver(_cached_checkpointer)
+            _cached_graph = create_facility_monitor_graph(
+                _cached_checkpointer,
+                node_wrapper=profiler.wrap_node if profiler is not None else None,
+            )
+            _cached_graph_key = key
+        return _cached_graph
+
+
+def reset_facility_monitor_graph(close_checkpointer: bool = True) -> None:
+    """그래프 캐시 비우기 (종료 시 또는 체크포인터 교체 시)"""
+    global _cached_graph, _cached_graph_key, _cached_checkpointer
+    
+    with _graph_lock:
+        if close_checkpointer and hasattr(_cached_checkpointer, "close"):
+            _cached_checkpointer.close()
+        _cached_graph = None
+        _cached_graph_key = None
+        _cached_checkpointer = None
+
+
+def warm_up() -> threading.Thread:
+    """그래프 생성(langgraph import + 컴파일)을 백그라운드 스레드에서 미리 시작
+    
+    입력 대기나 첫 센서 수집과 겹치게 호출하면 첫 사이클에서 기다리는 시간이 줄어듦.
+    스레드가 끝나기 전에 get_facility_monitor_graph()를 호출해도 같은 그래프를 받음
+    """
+    thread = threading.Thread(target=get_facility_monitor_graph, name="qa-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
 # ============================================
 # 7. 동기 실행 함수
 # ============================================
 def run_monitoring_cycle(scenario: str = "overheating"):
     """동기 방식으로 모니터링 사이클 실행"""
+    from langgraph.types import Command
     
-    graph = create_facility_monitor_graph()
+    graph = get_facility_monitor_graph()
     
     # 세션 설정
     config = {"configurable": {"thread_id": str(uuid.uuid4())}}
@@ -312,7 +544,7 @@ def run_monitoring_cycle(scenario: str = "overheating"):
     initial_state = {
         "sensor_data": get_sensor_data(scenario),
         "facility_id": facility_id,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": time.time()
     }
     
     # 첫 번째 실행 (interrupt까지)
@@ -375,7 +607,7 @@ def run_monitoring_cycle(scenario: str = "overheating"):
         print(f"전문가 승인: {'✅ 예' if final_result.get('human_approval') else '❌ 아니오'}")
         print(f"전문가 의견: {final_result.get('expert_comment', 'N/A')}")
         print(f"실행된 조치: {final_result['final_action']}")
-        print(f"타임스탬프: {final_result['timestamp']}")
+        print(f"타임스탬프: {format_timestamp(final_result['timestamp'])}")
         print("#"*60 + "\n")
     else:
         print("✅ 정상 작동 - 전문가 개입 불필요")
@@ -387,8 +619,12 @@ def run_monitoring_cycle(scenario: str = "overheating"):
 # ============================================
 async def run_monitoring_async(scenario: str = "overheating"):
     """비동기 스트리밍 방식으로 모니터링"""
+    import asyncio
+    from langgraph.types import Command
+    
+    from lg_qa_stream import Completed, Interrupt, astream_events
     
-    graph = create_facility_monitor_graph()
+    graph = get_facility_monitor_graph()
     config = {"configurable": {"thread_id": str(uuid.uuid4())}}
     facility_id = f"PLANT-{uuid.uuid4().hex[:8].upper()}"
     
@@ -397,42 +633,27 @@ async def run_monitoring_async(scenario: str = "overheating"):
     initial_state = {
         "sensor_data": get_sensor_data(scenario),
         "facility_id": facility_id,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": time.time()
     }
     
-    async for event in graph.astream(initial_state, stream_mode=["updates"], config=config):
-        # 이벤트 파싱
-        if isinstance(event, tuple):
-            _, content = event
-            chunk = content[1] if isinstance(content, tuple) else content
-        else:
-            chunk = event
-        
+    async for event in astream_events(graph, initial_state, config):
         # 인터럽트 감지
-        if isinstance(chunk, dict) and "__interrupt__" in chunk:
-            interrupt_data = chunk["__interrupt__"][0].value
-            
+        if isinstance(event, Interrupt):
             print("\n⏸️ 전문가 승인 대기 중...")
-            approve = input("승인? (yes/no): ").lower() == 'yes'
-            comment = input("의견: ").strip()
+            # input()은 별도 스레드에서 실행하여 이벤트 루프를 막지 않음
+            # (여러 설비를 동시에 감시하려면 lg_qa_fleet.FleetRunner 사용)
+            approve = (await asyncio.to_thread(input, "승인? (yes/no): ")).lower() == 'yes'
+            comment = (await asyncio.to_thread(input, "의견: ")).strip()
             
             decision = {"approved": approve, "comment": comment}
             
             # 재개
-            async for resume_event in graph.astream(
-                Command(resume=decision),
-                stream_mode=["updates"],
-                config=config
-            ):
-                if isinstance(resume_event, tuple):
-                    _, resume_content = resume_event
-                    resume_chunk = resume_content[1] if isinstance(resume_content, tuple) else resume_content
-                else:
-                    resume_chunk = resume_event
-                
-                if isinstance(resume_chunk, dict) and "final_action" in resume_chunk:
-                    print(f"\n✅ 완료: {resume_chunk['final_action']}")
+            async for resume_event in astream_events(graph, Command(resume=decision), config):
+                if isinstance(resume_event, Completed):
+                    print(f"\n✅ 완료: {resume_event.final_action}")
             break
+        elif isinstance(event, Completed):
+            print(f"\n✅ 완료: {event.final_action}")
 
 
 # ============================================
@@ -443,6 +664,11 @@ if __name__ == "__main__":
     print("🏭 제조/에너지 현장 HITL 모니터링 시스템")
     print("="*60)
     
+    # 메뉴 입력을 기다리는 동안 그래프 준비
+    warm_up()
+    # 완료된 사이클 감사 기록 (QA_AUDIT_DB, 기본 qa_audit.db, lg_qa_audit.py)
+    audit_log = configure_audit_log(os.environ.get("QA_AUDIT_DB", "qa_audit.db"))
+    
     print("\n시나리오를 선택하세요:")
     print("1. normal - 정상 작동")
     print("2. overheating - 과열 감지")
@@ -467,6 +693,9 @@ if __name__ == "__main__":
     mode = input("\n선택 (1-2): ").strip()
     
     if mode == "2":
+        import asyncio
+        
         asyncio.run(run_monitoring_async(selected_scenario))
     else:
-        run_monitoring_cycle(selected_scenario)
\ No newline at end of file
+        run_monitoring_cycle(selected_scenario)
+    audit_log.close()
\ No newline at end of file
@@ -1,10 +1,13 @@
+from __future__ import annotations
+
 import uuid
-import asyncio
-from typing import Literal
+import threading
+from typing import TYPE_CHECKING, Literal
 from typing_extensions import TypedDict
-from langgraph.graph import StateGraph, START, END
-from langgraph.types import interrupt, Command
-from langgraph.checkpoint.memory import InMemorySaver
+
+# langgraph(약 0.8초)는 그래프를 처음 사용할 때 가져옴 (get_graph)
+if TYPE_CHECKING:
+    from langgraph.types import Command
 
 # ============================================
 # 1. State 정의
@@ -21,6 +24,8 @@ def approval_node(state: State) -> Command[Literal["do", "cancel"]]:
     """
     그래프 실행을 일시 중단하고 사용자의 승인을 대기합니다.
     """
+    from langgraph.types import Command, interrupt
+
     approved = interrupt({
         "question": "이 작업을 승인하시겠습니까?",
         "action": state["action_details"]
@@ -49,66 +54,83 @@ def cancel_action(state: State):
 
 
 # ============================================
-# 3. 그래프 구성
+# 3. 그래프 구성 (최초 사용 시 한 번만)
 # ============================================
-builder = StateGraph(State)
-builder.add_node("approval", approval_node)
-builder.add_node("do", execute_action)
-builder.add_node("cancel", cancel_action)
+_graph_lock = threading.Lock()
+_graph = None
+
+
+def build_graph():
+    from langgraph.checkpoint.memory import InMemorySaver
+    from langgraph.graph import END, START, StateGraph
+
+    builder = StateGraph(State)
+    # 반환 타입(Command[Literal[...]])은 문자열 annotation이므로 이동 대상을 직접 지정
+    builder.add_node("approval", approval_node, destinations=("do", "cancel"))
+    builder.add_node("do", execute_action)
+    builder.add_node("cancel", cancel_action)
+
+    builder.add_edge(START, "approval")
+    builder.add_edge("do", END)
+    builder.add_edge("cancel", END)
 
-builder.add_edge(START, "approval")
-builder.add_edge("do", END)
-builder.add_edge("cancel", END)
+    return builder.compile(checkpointer=InMemorySaver())
 
-checkpointer = InMemorySaver()
-graph = builder.compile(checkpointer=checkpointer)
+
+def get_graph():
+    """공용 그래프 (처음 호출할 때 생성)"""
+    global _graph
+    if _graph is None:
+        with _graph_lock:
+            if _graph is None:
+                _graph = build_graph()
+    return _graph
+
+
+def warm_up() -> threading.Thread:
+    """그래프 생성을 백그라운드 스레드에서 미리 시작 (입력 대기와 겹치게 사용)"""
+    thread = threading.Thread(target=get_graph, name="approval-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+def __getattr__(name: str):
+    # 기존 코드 호환: lg_approval.graph / lg_approval.checkpointer
+    if name == "graph":
+        return get_graph()
+    if name == "checkpointer":
+        return get_graph().checkpointer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # ============================================
-# 4. 비동기 스트리밍 HITL 구현 (수정 버전)
+# 4. 비동기 스트리밍 HITL 구현
 # ============================================
 async def run_streaming_hitl():
     """비동기 스트리밍 방식으로 Human-in-the-Loop 처리"""
-    
+    import asyncio
+
+    from lg_qa_stream import Interrupt, NodeUpdate, astream_events
+
+    graph = get_graph()
     config = {"configurable": {"thread_id": str(uuid.uuid4())}}
     print(f"새로운 세션 ID: {config['configurable']['thread_id']}")
     
     initial_input = {"action_details": "서버 재부팅"}
     print("\n=== 비동기 스트림 시작 ===\n")
     
-    # astream 반환값 언패킹 수정
-    async for event in graph.astream(
-        initial_input,
-        stream_mode=["updates"],
-        config=config
-    ):
-        # event는 (metadata, (mode, chunk)) 형식
-        # 또는 단순히 chunk 형식일 수 있음
-        
-        # 디버깅: 이벤트 구조 확인
-        print(f"[DEBUG] 이벤트 타입: {type(event)}")
-        print(f"[DEBUG] 이벤트 내용: {event}\n")
-        
-        # updates 모드에서 chunk 추출
-        if isinstance(event, tuple) and len(event) == 2:
-            metadata, content = event
-            if isinstance(content, tuple) and len(content) == 2:
-                mode, chunk = content
-            else:
-                chunk = content
-        else:
-            chunk = event
-        
+    # 스트림 출력은 타입이 있는 이벤트로 변환되어 전달됨 (lg_qa_stream.py)
+    async for event in astream_events(graph, initial_input, config):
         # 인터럽트 감지
-        if isinstance(chunk, dict) and "__interrupt__" in chunk:
-            interrupt_info = chunk["__interrupt__"][0].value
+        if isinstance(event, Interrupt):
+            interrupt_info = event.value
             print(f"\n{'='*50}")
             print(f"[보류 중] 질문: {interrupt_info['question']}")
             print(f"[보류 중] 대상 작업: {interrupt_info['action']}")
             print(f"{'='*50}\n")
             
-            # 사용자 입력 받기
-            user_input = input("승인하시겠습니까? (yes/no): ").strip().lower()
+            # 사용자 입력 받기 (별도 스레드에서 실행하여 이벤트 루프를 막지 않음)
+            user_input = (await asyncio.to_thread(input, "승인하시겠습니까? (yes/no): ")).strip().lower()
             user_response = user_input == 'yes'
             
             print(f"\n--- '{user_response}' 값으로 재개합니다 ---\n")
@@ -116,32 +138,20 @@ async def run_streaming_hitl():
             # 그래프 재개
             await run_resumed_stream(user_response, config)
             break
-        else:
+        elif isinstance(event, NodeUpdate):
             # 일반 업데이트 출력
-            if isinstance(chunk, dict):
-                print(f"[업데이트] {chunk}")
+            print(f"[업데이트] {event.node}: {event.values}")
 
 
 async def run_resumed_stream(response: bool, config: dict):
     """그래프 재개 후 스트리밍"""
-    
-    async for event in graph.astream(
-        Command(resume=response),
-        stream_mode=["updates"],
-        config=config
-    ):
-        # 동일한 언패킹 로직
-        if isinstance(event, tuple) and len(event) == 2:
-            metadata, content = event
-            if isinstance(content, tuple) and len(content) == 2:
-                mode, chunk = content
-            else:
-                chunk = content
-        else:
-            chunk = event
-            
-        if isinstance(chunk, dict):
-            print(f"[재개 후 업데이트] {chunk}")
+    from langgraph.types import Command
+
+    from lg_qa_stream import NodeUpdate, astream_events
+
+    async for event in astream_events(get_graph(), Command(resume=response), config):
+        if isinstance(event, NodeUpdate):
+            print(f"[재개 후 업데이트] {event.node}: {event.values}")
     
     print("\n=== 작업 완료 ===")
 
@@ -151,7 +161,9 @@ async def run_resumed_stream(response: bool, config: dict):
 # ============================================
 def run_simple_hitl():
     """동기 방식의 간단한 HITL 예제"""
-    
+    from langgraph.types import Command
+
+    graph = get_graph()
     config = {"configurable": {"thread_id": str(uuid.uuid4())}}
     print(f"세션 ID: {config['configurable']['thread_id']}")
     
@@ -186,9 +198,13 @@ if __name__ == "__main__":
     print("1. 비동기 스트리밍 방식 (권장)")
     print("2. 동기 방식 (간단)")
     
+    # 모드 입력을 기다리는 동안 그래프 준비
+    warm_up()
     choice = input("\n선택 (1 or 2): ").strip()
     
     if choice == "1":
+        import asyncio
+
         asyncio.run(run_streaming_hitl())
     elif choice == "2":
         run_simple_hitl()
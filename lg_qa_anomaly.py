@@ -0,0 +1,319 @@
+"""
+다변량 이상 점수 (마할라노비스 거리)
+- 채널 5개(온도/압력/진동/유량/전력)를 함께 보고 채널 간 상관관계에서 벗어난 측정값 감지
+  예: 유량은 줄었는데 전력은 늘어남 → 채널별로는 임계값 안이어도 HIGH
+- 설비별 정상 측정값의 평균/공분산을 온라인으로 갱신
+  (규칙/추세로 HIGH 이상이거나 이상으로 판정된 값은 학습에서 제외)
+  · fit()으로 녹화된 정상 데이터로 미리 학습 가능 (lg_qa_ingest.py 재생 데이터 등)
+    facility_id 없이 학습하면 공용 분포 → 처음 보는 설비의 시작값
+  · 최근 window 개 샘플 비중으로 갱신하므로 설비 운전점이 천천히 바뀌면 따라감
+- 정밀도 행렬(공분산 역행렬)은 refresh 개 샘플마다 다시 계산 → 점수는 행렬-벡터 곱 1회
+- score_batch: N x 5 행렬을 설비별로 묶어 한 번에 점수화 (lg_qa_batch.analyze_sensor_batch(scorer=...))
+
+기본은 비활성(get_anomaly_scorer() = None). configure_anomaly_scorer()로 켜면
+analyze_sensor_data가 규칙/추세 판정과 함께 점수를 확인함.
+numpy는 점수기를 처음 만들 때 가져옴 (lg_app_qa 시작 시간 예산, bench_startup.py)
+
+사용 예:
+    scorer = configure_anomaly_scorer()
+    scorer.fit(recorded_normal_rows)       # 선택: 없으면 min_samples 개를 받은 뒤부터 판정
+"""
+
+import math
+import threading
+from typing import Optional, Sequence
+
+from lg_qa_state import ISSUE_ANOMALY, SENSOR_FIELDS, Issue, RiskLevel
+
+
+# 자유도 5 카이제곱 분포 기준 마할라노비스 거리 (정규 분포 가정 시 측정값당 오경보 확률 -> 거리)
+CHI2_5DOF_DISTANCE = {
+    1e-3: 4.529,
+    1e-4: 5.074,
+    1e-5: 5.555,
+    1e-6: 5.991,
+}
+
+# 채널별 최소 표준편차 (센서 분해능 수준). 값이 거의 변하지 않는 채널의
+# 분산이 0에 가까워져 작은 잡음이 큰 점수가 되는 것을 방지
+MIN_STD = {
+    "temperature": 0.2,
+    "pressure": 0.2,
+    "vibration": 0.02,
+    "flow_rate": 0.5,
+    "power_consumption": 2.0,
+}
+
+
+# ============================================
+# 1. 온라인 마할라노비스 점수기
+# ============================================
+class DistributionModel:
+    """정상 운전 분포 1개 (평균/공분산/정밀도 행렬)
+
+    갱신은 lock 안에서 새 배열을 만들어 교체하므로, 점수 계산은
+    lock 안에서 (mean, precision) 참조만 함께 가져오면 일관된 값을 사용함
+    """
+
+    __slots__ = ("count", "mean", "cov", "precision", "pending", "lock")
+
+    def __init__(self, floor):
+        import numpy as np
+
+        self.count = 0
+        self.mean = np.zeros(len(SENSOR_FIELDS))
+        self.cov = np.zeros((len(SENSOR_FIELDS), len(SENSOR_FIELDS)))
+        self.precision = np.diag(1.0 / floor)
+        self.pending = 0  # 마지막 정밀도 갱신 이후 학습 샘플 수
+        self.lock = threading.Lock()
+
+    def snapshot(self) -> tuple:
+        """(학습 샘플 수, 평균, 정밀도 행렬)"""
+        with self.lock:
+            return self.count, self.mean, self.precision
+
+
+class MahalanobisScorer:
+    """정상 운전 분포(평균/공분산) 대비 마할라노비스 거리로 이상 판정
+
+    분포는 설비별로 따로 학습 (설비마다 운전점이 다르므로, 추세 감시기와 같이 facility_id 기준).
+    fit()/observe()에 facility_id를 주지 않으면 공용(fleet) 분포를 학습하며,
+    처음 보는 설비는 공용 분포가 준비되어 있으면 그 값으로 시작해 자기 측정값으로 적응함.
+    score_batch()는 facility_ids를 주면 행마다 그 설비 분포로, 없으면 공용 분포로 점수화
+
+    Args:
+        threshold: 이상 판정 거리 (기본: 오경보 확률 1e-5, CHI2_5DOF_DISTANCE)
+        min_samples: 판정을 시작하기 전에 학습할 최소 샘플 수 (그 전에는 점수 0)
+            공용 분포로 시작한 설비는 이 샘플 수만큼의 가중치로 시작 → 빨리 적응
+        window: 온라인 갱신 시 기존 통계의 최대 가중치(샘플 수). 작을수록 빨리 적응
+        refresh: 정밀도 행렬을 다시 계산하는 주기(학습 샘플 수)
+        shrinkage: 공분산 대각 성분에 더하는 비율 (역행렬 안정화)
+        learn: assess()로 받은 정상 측정값을 학습에 반영할지 여부
+    """
+
+    def __init__(
+        self,
+        threshold: float = CHI2_5DOF_DISTANCE[1e-5],
+        min_samples: int = 200,
+        window: int = 20000,
+        refresh: int = 256,
+        shrinkage: float = 0.01,
+        learn: bool = True,
+        min_std: Optional[dict] = None,
+    ):
+        import numpy as np
+
+        self.threshold = threshold
+        self.min_samples = min_samples
+        self.window = window
+        self.refresh = refresh
+        self.shrinkage = shrinkage
+        self.learn = learn
+        min_std = {**MIN_STD, **(min_std or {})}
+        self._floor = np.array([min_std[channel] ** 2 for channel in SENSOR_FIELDS])
+        self.fleet = DistributionModel(self._floor)
+        self.stats = {"scored": 0, "anomalies": 0, "learned": 0}
+        self._models: dict = {}  # facility_id -> DistributionModel
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+    @property
+    def ready(self) -> bool:
+        """공용 분포 판정 가능 여부"""
+        return self.fleet.count >= self.min_samples
+
+    def model(self, facility_id: Optional[str] = None) -> DistributionModel:
+        """설비 분포 (처음 보는 설비는 공용 분포로 시작, facility_id 없으면 공용 분포)"""
+        if not facility_id:
+            return self.fleet
+        model = self._models.get(facility_id)
+        if model is None:
+            with self._lock:
+                model = self._models.get(facility_id)
+                if model is None:
+                    model = self._models[facility_id] = self._seed()
+        return model
+
+    def _seed(self) -> DistributionModel:
+        model = DistributionModel(self._floor)
+        with self.fleet.lock:
+            if self.fleet.count >= self.min_samples:
+                model.count = self.min_samples
+                model.mean, model.cov, model.precision = self.fleet.mean, self.fleet.cov, self.fleet.precision
+        return model
+
+    def forget(self, facility_id: str) -> None:
+        """설비 해제 시 분포 삭제"""
+        self._models.pop(facility_id, None)
+
+    # ----------------------------------------
+    # 학습
+    # ----------------------------------------
+    def fit(self, rows, facility_id: Optional[str] = None) -> "MahalanobisScorer":
+        """정상 데이터로 통계 초기화 (rows: N x 5 배열 또는 sensor_data 목록)"""
+        matrix = as_matrix(rows)
+        model = self.model(facility_id)
+        with model.lock:
+            model.count = len(matrix)
+            model.mean = matrix.mean(axis=0)
+            centered = matrix - model.mean
+            model.cov = centered.T @ centered / max(len(matrix), 1)
+            self._refresh(model)
+        return self
+
+    def observe(self, rows, facility_id: Optional[str] = None) -> None:
+        """정상 데이터 추가 학습 (기존 통계와 배치 통계를 합침)"""
+        import numpy as np
+
+        matrix = as_matrix(rows)
+        size = len(matrix)
+        if not size:
+            return
+        batch_mean = matrix.mean(axis=0)
+        centered = matrix - batch_mean
+        batch_cov = centered.T @ centered / size
+        model = self.model(facility_id)
+        with model.lock:
+            # 기존 통계 가중치를 window로 제한 → 오래된 샘플의 영향이 점차 줄어듦
+            weight = min(model.count, self.window)
+            total = weight + size
+            delta = batch_mean - model.mean
+            model.mean = model.mean + delta * (size / total)
+            model.cov = (
+                (weight * model.cov + size * batch_cov) / total
+                + np.outer(delta, delta) * (weight * size / total ** 2)
+            )
+            model.count += size
+            self.stats["learned"] += size
+            model.pending += size
+            if model.pending >= self.refresh or model.count - size < self.min_samples <= model.count:
+                self._refresh(model)
+
+    def _learn_one(self, model: DistributionModel, row) -> None:
+        """observe()의 1행 전용 경로 (배치 공분산 계산 생략)"""
+        import numpy as np
+
+        with model.lock:
+            weight = min(model.count, self.window)
+            total = weight + 1
+            delta = row - model.mean
+            model.mean = model.mean + delta / total
+            model.cov = model.cov * (weight / total) + np.outer(delta, delta) * (weight / total ** 2)
+            model.count += 1
+            self.stats["learned"] += 1
+            model.pending += 1
+            if model.pending >= self.refresh or model.count == self.min_samples:
+                self._refresh(model)
+
+    def _refresh(self, model: DistributionModel) -> None:
+        import numpy as np
+
+        regularized = model.cov.copy()
+        diagonal = np.diag(model.cov)
+        regularized[np.diag_indices_from(regularized)] = (
+            np.maximum(diagonal, self._floor) + self.shrinkage * diagonal
+        )
+        model.precision = np.linalg.inv(regularized)
+        model.pending = 0
+
+    # ----------------------------------------
+    # 점수
+    # ----------------------------------------
+    def score_batch(self, rows, facility_id: Optional[str] = None, facility_ids: Optional[Sequence[str]] = None):
+        """행별 마할라노비스 거리 (학습 샘플이 min_samples 미만인 분포의 행은 0)
+
+        facility_ids: 행별 설비 ID. 주면 설비별로 묶어 각 설비 분포로 점수화 (assess()와 같은 분포)
+        facility_id: 모든 행을 이 설비 분포로 점수화. 둘 다 없으면 공용 분포
+        """
+        import numpy as np
+
+        matrix = as_matrix(rows)
+        if facility_ids is None:
+            return self._score(matrix, self.model(facility_id))
+        groups: dict = {}
+        for i, row_facility in enumerate(facility_ids):
+            groups.setdefault(row_facility, []).append(i)
+        scores = np.zeros(len(matrix))
+        for row_facility, index in groups.items():
+            scores[index] = self._score(matrix[index], self.model(row_facility))
+        return scores
+
+    def _score(self, matrix, model: DistributionModel):
+        import numpy as np
+
+        count, mean, precision = model.snapshot()
+        if count < self.min_samples:
+            return np.zeros(len(matrix))
+        centered = matrix - mean
+        return np.sqrt(np.einsum("ij,jk,ik->i", centered, precision, centered))
+
+    def assess(self, facility_id: Optional[str], sensor_data, risk_level: RiskLevel = RiskLevel.LOW) -> list:
+        """측정값 1건을 설비 분포로 판정 후 이상 이슈(Issue) 목록 반환 (없으면 빈 리스트)
+
+        risk_level: 규칙/추세 판정 결과. LOW이고 이상도 아닐 때만 학습에 반영 (learn=True)
+            → 임계값을 넘은 측정값이 정상 분포로 학습되지 않음. 누락된 채널은 평균값으로 간주
+        """
+        import numpy as np
+
+        model = self.model(facility_id)
+        count, mean, precision = model.snapshot()
+        row = np.array([sensor_data.get(channel, math.nan) for channel in SENSOR_FIELDS])
+        missing = np.isnan(row)
+        if missing.any():
+            row[missing] = mean[missing]
+
+        issues = []
+        if count >= self.min_samples:
+            centered = row - mean
+            weighted = precision @ centered
+            distance = math.sqrt(max(float(centered @ weighted), 0.0))
+            self.stats["scored"] += 1
+            if distance >= self.threshold:
+                self.stats["anomalies"] += 1
+                # 거리 제곱 = Σ 채널별 기여도(centered * weighted) → 기여도가 가장 큰 채널로 표시
+                channel = SENSOR_FIELDS[int(np.argmax(centered * weighted))]
+                issues.append(Issue(ISSUE_ANOMALY, channel, round(distance, 2), self.threshold))
+        if self.learn and not issues and risk_level == RiskLevel.LOW:
+            self._learn_one(model, row)
+        return issues
+
+
+def as_matrix(rows):
+    """N x 5 float 배열 (sensor_data 목록이면 SENSOR_FIELDS 순서로 변환, 누락 채널은 0)"""
+    import numpy as np
+
+    if isinstance(rows, np.ndarray):
+        return rows.reshape(-1, len(SENSOR_FIELDS)).astype(np.float64, copy=False)
+    return np.array(
+        [[row.get(channel, 0) for channel in SENSOR_FIELDS] for row in rows],
+        dtype=np.float64,
+    ).reshape(-1, len(SENSOR_FIELDS))
+
+
+# ============================================
+# 2. 공용 점수기
+# ============================================
+_scorer = None
+
+
+def get_anomaly_scorer():
+    """설정된 공용 점수기 (없으면 None → 다변량 판정 생략)
+
+    assess(facility_id, sensor_data, risk_level) -> Issue 목록 을 제공하는 객체면 교체 가능
+    """
+    return _scorer
+
+
+def configure_anomaly_scorer(**options) -> MahalanobisScorer:
+    """공용 점수기를 새 MahalanobisScorer로 교체"""
+    global _scorer
+    _scorer = MahalanobisScorer(**options)
+    return _scorer
+
+
+def set_anomaly_scorer(scorer) -> None:
+    """공용 점수기 직접 지정 (None이면 비활성화)"""
+    global _scorer
+    _scorer = scorer
@@ -0,0 +1,306 @@
+"""
+감사 추적 저장소 (완료된 모니터링 사이클)
+- 사이클이 끝날 때(조치 실행/취소/병합) FacilityState 요약을 한 행으로 추가
+  · 시각, 설비, 위험도, 권장/실행 조치, 전문가 승인/의견, 조치 수정 여부, 분석 문구, 센서 값
+- 추가 전용: UPDATE / DELETE 는 트리거가 거부 (기록 변경 불가)
+- 쓰기는 버퍼에 모았다가 한 트랜잭션으로 일괄 커밋 (lg_qa_checkpoint.py와 같은 방식)
+- 조회 조건별 인덱스: 설비/위험도/실행 조치 + 시각, 시각 단독, 조치 수정 건 전용 부분 인덱스
+  → 수백만 행에서도 "PLANT-X의 지난 분기 조치 수정 건" 같은 조회가 인덱스 범위 검색으로 끝남
+
+사용 예:
+    audit = configure_audit_log("qa_audit.db")     # 이후 완료된 사이클이 자동 기록됨
+    audit.query(facility_id="PLANT-X", overridden=True,
+                since="2025-07-01", until="2025-10-01")
+"""
+
+import sqlite3
+import threading
+import time
+from typing import Any, NamedTuple, Optional
+
+from lg_qa_state import RISK_LEVEL_BY_CODE, SENSOR_FIELDS, RiskLevel, SensorReadings, to_epoch
+
+
+# ============================================
+# 1. 스키마
+# ============================================
+_TABLE = """
+CREATE TABLE IF NOT EXISTS {name} (
+    seq INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,                -- 사이클 측정 시각 (epoch 초)
+    facility_id TEXT NOT NULL,
+    thread_id TEXT NOT NULL,
+    risk INTEGER NOT NULL,           -- RiskLevel.code (0=LOW, 1=HIGH, 2=CRITICAL)
+    recommended_action TEXT,
+    final_action TEXT NOT NULL,
+    approved INTEGER,                -- 전문가/자동 승인 여부 (NULL = 승인 단계 없음)
+    overridden INTEGER NOT NULL,     -- 전문가가 조치를 수정한 경우 1
+    expert_comment TEXT,
+    analysis TEXT,
+    temperature REAL,
+    pressure REAL,
+    vibration REAL,
+    flow_rate REAL,
+    power_consumption REAL,
+    recorded_at REAL NOT NULL,
+    UNIQUE (thread_id, facility_id, ts)  -- 노드 재실행 시 중복 기록 방지 (thread_id 없는 기록도 설비별로 구분)
+);
+"""
+
+SCHEMA = _TABLE.format(name="audit") + """
+CREATE INDEX IF NOT EXISTS audit_facility ON audit (facility_id, ts);
+CREATE INDEX IF NOT EXISTS audit_risk ON audit (risk, ts);
+CREATE INDEX IF NOT EXISTS audit_action ON audit (final_action, ts);
+CREATE INDEX IF NOT EXISTS audit_time ON audit (ts);
+CREATE INDEX IF NOT EXISTS audit_overrides ON audit (facility_id, ts) WHERE overridden = 1;
+CREATE TRIGGER IF NOT EXISTS audit_no_update BEFORE UPDATE ON audit
+BEGIN SELECT RAISE(ABORT, 'audit log is append-only'); END;
+CREATE TRIGGER IF NOT EXISTS audit_no_delete BEFORE DELETE ON audit
+BEGIN SELECT RAISE(ABORT, 'audit log is append-only'); END;
+"""
+
+# 이전 버전의 중복 방지 키 (UNIQUE (thread_id, ts)): thread_id 없이 기록한 서로 다른 설비가 충돌함
+_LEGACY_KEY = ["thread_id", "ts"]
+
+_COLUMNS = (
+    "ts", "facility_id", "thread_id", "risk", "recommended_action", "final_action",
+    "approved", "overridden", "expert_comment", "analysis", *SENSOR_FIELDS, "recorded_at",
+)
+_INSERT = f"INSERT OR IGNORE INTO audit ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})"
+_SELECT = f"SELECT seq, {', '.join(_COLUMNS)} FROM audit"
+
+_RISK_CODES = {level.value: level.code for level in RiskLevel}
+
+
+class AuditRecord(NamedTuple):
+    seq: int
+    timestamp: float
+    facility_id: str
+    thread_id: str
+    risk_level: RiskLevel
+    recommended_action: Optional[str]
+    final_action: str
+    approved: Optional[bool]
+    overridden: bool
+    expert_comment: Optional[str]
+    analysis: Optional[str]
+    sensor_data: dict
+    recorded_at: float
+
+
+def _migrate(conn: sqlite3.Connection) -> None:
+    """이전 버전 DB의 중복 방지 키를 (thread_id, facility_id, ts)로 교체 (기존 기록은 그대로 복사)"""
+    if not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'audit'").fetchone():
+        return
+    keys = [
+        [column for _, _, column in conn.execute(f"PRAGMA index_info('{name}')")]
+        for _, name, unique, *_ in conn.execute("PRAGMA index_list(audit)")
+        if unique
+    ]
+    if _LEGACY_KEY not in keys:
+        return
+    columns = ", ".join(("seq", *_COLUMNS))
+    with conn:
+        conn.execute("BEGIN")
+        conn.execute("DROP TABLE IF EXISTS audit_migrating")
+        conn.execute(_TABLE.format(name="audit_migrating"))
+        conn.execute(f"INSERT INTO audit_migrating ({columns}) SELECT {columns} FROM audit")
+        conn.execute("DROP TABLE audit")  # 인덱스/트리거도 함께 삭제 → SCHEMA가 다시 생성
+        conn.execute("ALTER TABLE audit_migrating RENAME TO audit")
+
+
+def _record(row: tuple) -> AuditRecord:
+    sensors = row[11:11 + len(SENSOR_FIELDS)]
+    return AuditRecord(
+        seq=row[0],
+        timestamp=row[1],
+        facility_id=row[2],
+        thread_id=row[3],
+        risk_level=RISK_LEVEL_BY_CODE[row[4]],
+        recommended_action=row[5],
+        final_action=row[6],
+        approved=None if row[7] is None else bool(row[7]),
+        overridden=bool(row[8]),
+        expert_comment=row[9],
+        analysis=row[10],
+        sensor_data={name: value for name, value in zip(SENSOR_FIELDS, sensors) if value is not None},
+        recorded_at=row[-1],
+    )
+
+
+# ============================================
+# 2. 저장소
+# ============================================
+class AuditLog:
+    """SQLite(WAL) 추가 전용 감사 로그
+
+    Args:
+        path: DB 파일 경로 (":memory:" 가능)
+        batch_size: 버퍼에 쌓인 행이 이 수를 넘으면 커밋
+        flush_interval: 마지막 커밋 후 이 시간(초)이 지나면 다음 기록에서 커밋
+
+    조회 전에는 버퍼를 먼저 커밋하므로 조회 결과에 방금 기록한 사이클도 포함됨.
+    프로세스가 비정상 종료되면 커밋 전 버퍼(최대 flush_interval 분)는 유실될 수 있음
+    """
+
+    def __init__(self, path: str = "qa_audit.db", *, batch_size: int = 512, flush_interval: float = 0.05):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        _migrate(self.conn)
+        self.conn.executescript(SCHEMA)
+        self.lock = threading.RLock()
+        self._buffer: list = []
+        self._last_flush = time.monotonic()
+
+    def __enter__(self) -> "AuditLog":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self.lock:
+            self.flush()
+            self.conn.close()
+
+    # ----------------------------------------
+    # 기록
+    # ----------------------------------------
+    def record(self, state: dict, final_action: Any, *, thread_id: str = "", overridden: bool = False) -> None:
+        """완료된 사이클 1건 추가 (state = FacilityState, final_action = 이번 사이클 결과)"""
+        sensor_data = state.get("sensor_data") or {}
+        if isinstance(sensor_data, SensorReadings):
+            sensors = sensor_data.row()
+        else:
+            sensors = tuple(sensor_data.get(name) for name in SENSOR_FIELDS)
+        risk_level = state.get("risk_level", RiskLevel.LOW)
+        approved = state.get("human_approval")
+        analysis = state.get("ai_analysis")
+        recommended = state.get("recommended_action")
+        row = (
+            to_epoch(state.get("timestamp")),
+            state.get("facility_id") or "",
+            thread_id,
+            _RISK_CODES[str(risk_level)],
+            None if recommended is None else str(recommended),
+            str(final_action),
+            None if approved is None else int(approved),
+            int(overridden),
+            state.get("expert_comment"),
+            None if analysis is None else str(analysis),
+            *sensors,
+            time.time(),
+        )
+        with self.lock:
+            self._buffer.append(row)
+            if len(self._buffer) >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval:
+                self.flush()
+
+    def flush(self) -> None:
+        """버퍼의 기록을 한 트랜잭션으로 커밋"""
+        with self.lock:
+            self._last_flush = time.monotonic()
+            if not self._buffer:
+                return
+            with self.conn:
+                self.conn.execute("BEGIN")
+                self.conn.executemany(_INSERT, self._buffer)
+            self._buffer.clear()
+
+    # ----------------------------------------
+    # 조회
+    # ----------------------------------------
+    def _where(
+        self,
+        facility_id: Optional[str],
+        risk_level: Optional[str],
+        final_action: Optional[str],
+        overridden: Optional[bool],
+        since: Any,
+        until: Any,
+    ) -> tuple:
+        clauses, params = [], []
+        if facility_id is not None:
+            clauses.append("facility_id = ?")
+            params.append(facility_id)
+        if risk_level is not None:
+            clauses.append("risk = ?")
+            params.append(_RISK_CODES[str(risk_level)])
+        if final_action is not None:
+            clauses.append("final_action = ?")
+            params.append(str(final_action))
+        if overridden is not None:
+            # 부분 인덱스(audit_overrides)는 조건이 상수일 때만 사용됨
+            clauses.append("overridden = 1" if overridden else "overridden = 0")
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(to_epoch(since))
+        if until is not None:
+            clauses.append("ts < ?")
+            params.append(to_epoch(until))
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def query(
+        self,
+        facility_id: Optional[str] = None,
+        risk_level: Optional[str] = None,
+        final_action: Optional[str] = None,
+        overridden: Optional[bool] = None,
+        since: Any = None,
+        until: Any = None,
+        limit: Optional[int] = None,
+    ) -> list:
+        """조건에 맞는 기록 (시각 순). since/until은 epoch 초, ISO 문자열 또는 datetime ([since, until))"""
+        where, params = self._where(facility_id, risk_level, final_action, overridden, since, until)
+        sql = f"{_SELECT}{where} ORDER BY ts, seq"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self.lock:
+            self.flush()
+            rows = self.conn.execute(sql, params).fetchall()
+        return [_record(row) for row in rows]
+
+    def count(
+        self,
+        facility_id: Optional[str] = None,
+        risk_level: Optional[str] = None,
+        final_action: Optional[str] = None,
+        overridden: Optional[bool] = None,
+        since: Any = None,
+        until: Any = None,
+    ) -> int:
+        where, params = self._where(facility_id, risk_level, final_action, overridden, since, until)
+        with self.lock:
+            self.flush()
+            return self.conn.execute(f"SELECT COUNT(*) FROM audit{where}", params).fetchone()[0]
+
+
+# ============================================
+# 3. 공용 감사 로그
+# ============================================
+_audit_log: Optional[AuditLog] = None
+
+
+def get_audit_log() -> Optional[AuditLog]:
+    """설정된 공용 감사 로그 (없으면 None → 기록하지 않음)"""
+    return _audit_log
+
+
+def configure_audit_log(path: str = "qa_audit.db", **options) -> AuditLog:
+    """공용 감사 로그 교체 (이전 로그는 버퍼를 커밋한 뒤 닫음)"""
+    global _audit_log
+    previous, _audit_log = _audit_log, AuditLog(path, **options)
+    if previous is not None:
+        previous.close()
+    return _audit_log
+
+
+def set_audit_log(audit_log: Optional[AuditLog]) -> None:
+    """공용 감사 로그 직접 지정 (None이면 해제, 이전 로그는 닫지 않음)"""
+    global _audit_log
+    _audit_log = audit_log
@@ -0,0 +1,151 @@
+"""
+설비 센서 배치 분석 (벡터화)
+- SCADA 스캔 1회분(수천 대)의 측정값을 한 번에 위험도 평가
+- 설비별 결과는 analyze_sensor_data(단일 상태 경로)와 동일
+"""
+
+from typing import Optional, Sequence
+
+import numpy as np
+
+from lg_qa_state import ACTION_BY_CODE, RISK_LEVEL_BY_CODE, SENSOR_FIELDS
+from lg_qa_thresholds import ThresholdRegistry, get_registry
+from lg_qa_trend import TREND_CHANNELS, TrendTracker, get_trend_tracker
+
+
+# ============================================
+# 1. 채널 / 코드 정의
+# ============================================
+SENSOR_CHANNELS = SENSOR_FIELDS
+
+# 위험도 코드: 0=LOW, 1=HIGH, 2=CRITICAL (RiskLevel.code / Action.code와 동일)
+RISK_LOW, RISK_HIGH, RISK_CRITICAL = 0, 1, 2
+RISK_LEVELS = np.array(RISK_LEVEL_BY_CODE, dtype=object)
+RECOMMENDED_ACTIONS = np.array(ACTION_BY_CODE[:3], dtype=object)
+
+
+# ============================================
+# 2. 컬럼 변환
+# ============================================
+def columns_from_records(records: list) -> dict:
+    """sensor_data dict 목록을 채널별 NumPy 배열(컬럼 블록)로 변환
+
+    누락된 채널은 analyze_sensor_data와 같이 0으로 채움
+    """
+    return {
+        channel: np.fromiter(
+            (record.get(channel, 0) for record in records),
+            dtype=np.float64,
+            count=len(records),
+        )
+        for channel in SENSOR_CHANNELS
+    }
+
+
+def thresholds_for(facility_ids: Optional[Sequence[str]], registry: ThresholdRegistry) -> np.ndarray:
+    """설비별 임계값 행렬 (N x 6, Thresholds 필드 순서)
+
+    설비별 설정이 없으면 기본값 한 행만 반환해 브로드캐스트로 처리
+    """
+    default, facilities = registry.table()
+    if facility_ids is None or not facilities:
+        return np.array([default], dtype=np.float64)
+    return np.array(
+        [facilities.get(facility_id, default) for facility_id in facility_ids],
+        dtype=np.float64,
+    )
+
+
+def trend_mask(
+    readings: dict,
+    facility_ids: Sequence[str],
+    timestamps: Sequence[float],
+    registry: ThresholdRegistry,
+    tracker: TrendTracker,
+) -> np.ndarray:
+    """행별 추세 이상 여부 (설비당 O(1) 증분 갱신)"""
+    channels = [(name, np.asarray(readings[name])) for name in TREND_CHANNELS if name in readings]
+    mask = np.zeros(len(facility_ids), dtype=bool)
+    for i, facility_id in enumerate(facility_ids):
+        sensor_data = {name: values[i] for name, values in channels}
+        mask[i] = bool(tracker.update(facility_id, timestamps[i], sensor_data, registry.get(facility_id)))
+    return mask
+
+
+# ============================================
+# 3. 벡터화 분석
+# ============================================
+def analyze_sensor_batch(
+    readings: dict,
+    facility_ids: Optional[Sequence[str]] = None,
+    registry: Optional[ThresholdRegistry] = None,
+    timestamps: Optional[Sequence[float]] = None,
+    tracker: Optional[TrendTracker] = None,
+    scorer=None,
+) -> dict:
+    """컬럼 블록 전체를 한 번에 분석
+
+    Args:
+        readings: 채널명 -> 길이 N 배열 (temperature, pressure, vibration,
+            flow_rate, power_consumption). 누락된 채널은 0으로 간주
+        facility_ids: 행별 설비 ID (설비별 임계값 적용). 없으면 기본 임계값
+        registry: 임계값 레지스트리 (기본: 공용 레지스트리)
+        timestamps: 행별 측정 시각(epoch 초). facility_ids와 함께 주면
+            단일 경로와 같이 추세 감시기(lg_qa_trend.py)에 반영하고 추세 이상을 HIGH로 판정
+        tracker: 추세 감시기 (기본: 공용 감시기)
+        scorer: 다변량 이상 점수기 (lg_qa_anomaly.MahalanobisScorer). 주면 점수가
+            threshold 이상인 행을 HIGH로 판정 (배치 경로에서는 학습하지 않음).
+            facility_ids가 있으면 설비별 분포, 없으면 공용 분포로 점수화
+
+    Returns:
+        risk_code (int8), risk_level, recommended_action 배열 (길이 N)
+        scorer를 주면 anomaly_score (행별 마할라노비스 거리) 추가
+    """
+    size = max((len(np.asarray(v)) for v in readings.values()), default=0)
+    registry = registry or get_registry()
+    (
+        temp_critical, temp_high,
+        pressure_critical, pressure_high,
+        vibration_critical, vibration_high,
+    ) = thresholds_for(facility_ids, registry).T
+
+    def channel(name: str) -> np.ndarray:
+        if name not in readings:
+            return np.zeros(size, dtype=np.float64)
+        return np.asarray(readings[name], dtype=np.float64)
+
+    temp = channel("temperature")
+    pressure = channel("pressure")
+    vibration = channel("vibration")
+
+    # 단일 경로의 if/elif 체인과 동일한 비교(>=)를 채널별로 수행
+    critical = (
+        (temp >= temp_critical)
+        | (pressure >= pressure_critical)
+        | (vibration >= vibration_critical)
+    )
+    high = (
+        (temp >= temp_high)
+        | (pressure >= pressure_high)
+        | (vibration >= vibration_high)
+    )
+    if timestamps is not None and facility_ids is not None:
+        high = high | trend_mask(readings, facility_ids, timestamps, registry, tracker or get_trend_tracker())
+    if scorer is not None:
+        # 누락된 채널은 단일 경로와 달리 0으로 점수화되므로 채널 5개를 모두 넘기는 것을 권장
+        # facility_ids를 주면 단일 경로(assess)와 같은 설비별 분포로 점수화
+        score = scorer.score_batch(
+            np.column_stack([channel(name) for name in SENSOR_CHANNELS]), facility_ids=facility_ids,
+        )
+        high = high | (score >= scorer.threshold)
+
+    risk_code = np.where(critical, RISK_CRITICAL, np.where(high, RISK_HIGH, RISK_LOW)).astype(np.int8)
+
+    result = {
+        "risk_code": risk_code,
+        "risk_level": RISK_LEVELS[risk_code],
+        "recommended_action": RECOMMENDED_ACTIONS[risk_code],
+    }
+    if scorer is not None:
+        result["anomaly_score"] = score
+    return result
@@ -0,0 +1,688 @@
+"""
+설비 모니터링용 SQLite 체크포인터
+- WAL 모드 단일 연결 재사용 (스레드 간 락으로 공유)
+- 쓰기는 메모리 버퍼에 모았다가 한 트랜잭션으로 일괄 커밋
+- interrupt 발생 시에는 즉시 커밋 → 재시작 후 Command(resume=...) 로 재개 가능
+- 완료된 스레드는 보존 기간이 지나면 자동 정리
+- compact=True 이면 커밋할 때 스레드별 최신 체크포인트(+ 대기 중 interrupt)만 남김
+  (설비별로 thread_id를 재사용하는 연속 감시에서도 스레드당 행 수가 일정)
+- CompactMemorySaver: 같은 압축 + 전체 메모리 상한을 적용한 메모리 체크포인터
+
+사용 예:
+    saver = SqliteCheckpointSaver("qa_checkpoints.db")
+    graph = create_facility_monitor_graph(checkpointer=saver)
+
+    # 프로세스 재시작 후 대기 중인 승인 재개
+    for thread_id in saver.pending_threads():
+        graph.invoke(Command(resume=decision), {"configurable": {"thread_id": thread_id}})
+
+    # 또는 조건에 맞는 대기 건을 한 번에 재개 (lg_qa_inbox.py)
+    report = await bulk_resume_pending(graph, decision, risk_level="HIGH", facility_prefix="PLANT-A")
+"""
+
+import asyncio
+import random
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Iterable, Iterator, Optional, Sequence
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    INTERRUPT,
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    SerializerProtocol,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+    writes_sort_key,
+)
+from langgraph.checkpoint.memory import InMemorySaver
+
+
+# ============================================
+# 1. 스키마
+# ============================================
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    type TEXT,
+    checkpoint BLOB,
+    metadata_type TEXT,
+    metadata BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    type TEXT,
+    value BLOB,
+    task_path TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+-- 스레드 상태: 대기 중 승인 목록 / 완료 스레드 정리용
+CREATE TABLE IF NOT EXISTS threads (
+    thread_id TEXT PRIMARY KEY,
+    interrupted INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS threads_status ON threads (interrupted, updated_at);
+"""
+
+# 스레드(?1)의 네임스페이스별 최신 체크포인트보다 오래된 행 삭제
+_KEEP_LATEST = [
+    f"DELETE FROM {table} WHERE thread_id = ?1 AND checkpoint_id < ("
+    "SELECT MAX(c.checkpoint_id) FROM checkpoints c "
+    f"WHERE c.thread_id = ?1 AND c.checkpoint_ns = {table}.checkpoint_ns)"
+    for table in ("checkpoints", "writes")
+]
+
+
+# ============================================
+# 2. 체크포인터
+# ============================================
+class SqliteCheckpointSaver(BaseCheckpointSaver[str]):
+    """SQLite(WAL) 기반 체크포인터
+
+    Args:
+        path: DB 파일 경로 (":memory:" 가능)
+        batch_size: 버퍼에 쌓인 행이 이 수를 넘으면 커밋
+        flush_interval: 마지막 커밋 후 이 시간(초)이 지나면 다음 쓰기에서 커밋
+        retention: 완료 스레드 보존 기간(초). None이면 자동 정리 안 함
+        prune_interval: 자동 정리 검사 주기(초)
+        compact: True면 커밋할 때 쓰기가 있었던 스레드의 이전 체크포인트/쓰기 삭제
+            (prune(strategy="keep_latest")와 같음. get_state_history는 최신 1건만 반환)
+
+    읽기 전에는 버퍼를 먼저 커밋하므로 읽기 결과는 최신 상태와 같음
+    (get_tuple은 읽는 스레드의 쓰기가 버퍼에 있을 때만 커밋하므로, 여러 스레드를
+    동시에 재개해도 서로의 읽기 때문에 커밋이 잘게 나뉘지 않음).
+    deferred(thread_ids) 안에서는 해당 스레드의 쓰기만 시간 기준 커밋을 미루고
+    블록이 끝날 때 한 번에 커밋 (다른 스레드의 쓰기는 평소대로 커밋되며 그때
+    버퍼 전체가 함께 커밋됨).
+    버퍼에만 있던 완료 스레드의 마지막 체크포인트는 프로세스가 비정상
+    종료되면 유실될 수 있으나, interrupt로 대기 중인 스레드는 즉시
+    커밋되므로 유실되지 않음
+    """
+
+    def __init__(
+        self,
+        path: str = "qa_checkpoints.db",
+        *,
+        batch_size: int = 512,
+        flush_interval: float = 0.05,
+        retention: Optional[float] = 3600.0,
+        prune_interval: float = 60.0,
+        compact: bool = False,
+        serde: Optional[SerializerProtocol] = None,
+    ) -> None:
+        super().__init__(serde=serde)
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retention = retention
+        self.prune_interval = prune_interval
+        self.compact = compact
+
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.lock = threading.RLock()
+
+        # 쓰기 버퍼 (키 -> 행). 같은 키는 마지막 값만 남김
+        self._checkpoints: dict = {}
+        self._writes_replace: dict = {}
+        self._writes_ignore: dict = {}
+        self._threads: dict = {}
+        self._dirty: set = set()  # 버퍼에 체크포인트/쓰기가 있는 thread_id
+        self._interrupted_at: dict = {}  # thread_id -> interrupt가 걸린 체크포인트 ID (재개 전까지)
+        self._deferred: Counter = Counter()  # 쓰기를 미룬 thread_id(None=전체) -> 중첩 수
+        self._last_flush = time.monotonic()
+        self._next_prune = time.monotonic() + prune_interval
+
+    # ----------------------------------------
+    # 생명주기
+    # ----------------------------------------
+    def __enter__(self) -> "SqliteCheckpointSaver":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "SqliteCheckpointSaver":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self.lock:
+            self.flush()
+            self.conn.close()
+
+    # ----------------------------------------
+    # 일괄 커밋
+    # ----------------------------------------
+    def _buffered(self) -> int:
+        return (
+            len(self._checkpoints)
+            + len(self._writes_replace)
+            + len(self._writes_ignore)
+            + len(self._threads)
+        )
+
+    def flush(self) -> None:
+        """버퍼의 모든 쓰기를 한 트랜잭션으로 커밋"""
+        with self.lock:
+            self._last_flush = time.monotonic()
+            if not self._buffered():
+                return
+            with self.conn:
+                self.conn.execute("BEGIN")
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    self._checkpoints.values(),
+                )
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    self._writes_replace.values(),
+                )
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    self._writes_ignore.values(),
+                )
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO threads VALUES (?, ?, ?)",
+                    self._threads.values(),
+                )
+                if self.compact:
+                    params = [(thread_id,) for thread_id in self._dirty]
+                    for sql in _KEEP_LATEST:
+                        self.conn.executemany(sql, params)
+            self._checkpoints.clear()
+            self._writes_replace.clear()
+            self._writes_ignore.clear()
+            self._threads.clear()
+            self._dirty.clear()
+
+    @contextmanager
+    def deferred(self, thread_ids: Optional[Iterable[str]] = None) -> Iterator["SqliteCheckpointSaver"]:
+        """블록 안의 쓰기를 모아 끝날 때 커밋 (일괄 재개 등)
+
+        thread_ids를 주면 그 스레드들의 쓰기만 미루고, 생략하면 모든 스레드의 쓰기를 미룸.
+        버퍼가 batch_size를 넘거나 interrupt가 기록되면 블록 안에서도 커밋함
+        """
+        keys = [None] if thread_ids is None else list(dict.fromkeys(thread_ids))
+        with self.lock:
+            self._deferred.update(keys)
+        try:
+            yield self
+        finally:
+            with self.lock:
+                for key in keys:
+                    self._deferred[key] -= 1
+                    if not self._deferred[key]:
+                        del self._deferred[key]
+                if not self._deferred:
+                    self.flush()
+
+    def _is_deferred(self, thread_id: str) -> bool:
+        return None in self._deferred or thread_id in self._deferred
+
+    def _maybe_flush(self, thread_id: str) -> None:
+        now = time.monotonic()
+        if self._buffered() >= self.batch_size or (
+            not self._is_deferred(thread_id) and now - self._last_flush >= self.flush_interval
+        ):
+            self.flush()
+        if self.retention is not None and now >= self._next_prune:
+            self._next_prune = now + self.prune_interval
+            self.prune_completed(self.retention)
+
+    def _touch_thread(self, thread_id: str, interrupted: bool) -> None:
+        self._threads[thread_id] = (thread_id, int(interrupted), time.time())
+
+    # ----------------------------------------
+    # 조회
+    # ----------------------------------------
+    def _load_writes(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> list:
+        rows = self.conn.execute(
+            "SELECT task_id, channel, type, value, task_path, idx FROM writes "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+        rows.sort(key=lambda r: writes_sort_key(r[4], r[0], r[5]))
+        return [
+            (task_id, channel, self.serde.loads_typed((type_, value)))
+            for task_id, channel, type_, value, _, _ in rows
+        ]
+
+    def _make_tuple(self, thread_id: str, checkpoint_ns: str, row: tuple) -> CheckpointTuple:
+        checkpoint_id, parent_checkpoint_id, type_, checkpoint, metadata_type, metadata = row
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint=self.serde.loads_typed((type_, checkpoint)),
+            metadata=self.serde.loads_typed((metadata_type, metadata)),
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_checkpoint_id,
+                    }
+                }
+                if parent_checkpoint_id
+                else None
+            ),
+            pending_writes=self._load_writes(thread_id, checkpoint_ns, checkpoint_id),
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """체크포인트 조회 (checkpoint_id가 없으면 최신)"""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        columns = "checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata"
+        with self.lock:
+            if thread_id in self._dirty:
+                self.flush()
+            if checkpoint_id := get_checkpoint_id(config):
+                row = self.conn.execute(
+                    f"SELECT {columns} FROM checkpoints "
+                    "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                    (thread_id, checkpoint_ns, checkpoint_id),
+                ).fetchone()
+            else:
+                row = self.conn.execute(
+                    f"SELECT {columns} FROM checkpoints "
+                    "WHERE thread_id = ? AND checkpoint_ns = ? "
+                    "ORDER BY checkpoint_id DESC LIMIT 1",
+                    (thread_id, checkpoint_ns),
+                ).fetchone()
+            if row is None:
+                return None
+            return self._make_tuple(thread_id, checkpoint_ns, row)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        """체크포인트 목록 (최신순)"""
+        query = (
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, "
+            "type, checkpoint, metadata_type, metadata FROM checkpoints"
+        )
+        where, params = [], []
+        if config:
+            where.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            if (checkpoint_ns := config["configurable"].get("checkpoint_ns")) is not None:
+                where.append("checkpoint_ns = ?")
+                params.append(checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                where.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            where.append("checkpoint_id < ?")
+            params.append(before_id)
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += " ORDER BY checkpoint_id DESC"
+        if limit is not None and not filter:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        with self.lock:
+            self.flush()
+            rows = self.conn.execute(query, params).fetchall()
+            results = []
+            for thread_id, checkpoint_ns, *row in rows:
+                if limit is not None and len(results) >= limit:
+                    break
+                item = self._make_tuple(thread_id, checkpoint_ns, tuple(row))
+                if filter and not all(
+                    item.metadata.get(key) == value for key, value in filter.items()
+                ):
+                    continue
+                results.append(item)
+        yield from results
+
+    def pending_threads(self) -> list:
+        """interrupt로 전문가 승인을 기다리는 스레드 ID 목록"""
+        with self.lock:
+            self.flush()
+            return [
+                row[0]
+                for row in self.conn.execute(
+                    "SELECT thread_id FROM threads WHERE interrupted = 1 ORDER BY updated_at"
+                )
+            ]
+
+    # ----------------------------------------
+    # 저장
+    # ----------------------------------------
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """체크포인트 저장 (버퍼에 적재)"""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        type_, serialized = self.serde.dumps_typed(checkpoint)
+        metadata_type, serialized_metadata = self.serde.dumps_typed(
+            get_checkpoint_metadata(config, metadata)
+        )
+        with self.lock:
+            self._checkpoints[(thread_id, checkpoint_ns, checkpoint["id"])] = (
+                thread_id,
+                checkpoint_ns,
+                checkpoint["id"],
+                config["configurable"].get("checkpoint_id"),  # parent
+                type_,
+                serialized,
+                metadata_type,
+                serialized_metadata,
+            )
+            self._dirty.add(thread_id)
+            # 새 체크포인트가 생겼다면 이전 interrupt는 처리된 것.
+            # 비동기 실행에서는 interrupt가 걸린 체크포인트 자신의 put이 interrupt 쓰기보다
+            # 늦게 도착할 수 있으므로 (실행기 스레드) 그보다 나중 체크포인트일 때만 해제
+            if self._interrupted_at.get(thread_id, "") < checkpoint["id"]:
+                self._interrupted_at.pop(thread_id, None)
+                self._touch_thread(thread_id, interrupted=False)
+            self._maybe_flush(thread_id)
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """노드 중간 쓰기 저장. interrupt가 포함되면 즉시 커밋"""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        interrupted = False
+        with self.lock:
+            for idx, (channel, value) in enumerate(writes):
+                idx = WRITES_IDX_MAP.get(channel, idx)
+                key = (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+                type_, serialized = self.serde.dumps_typed(value)
+                row = (*key, channel, type_, serialized, task_path)
+                # 특수 채널(음수 idx)은 덮어쓰기, 일반 쓰기는 최초 값 유지
+                if idx < 0:
+                    self._writes_replace[key] = row
+                else:
+                    self._writes_ignore.setdefault(key, row)
+                interrupted = interrupted or channel == INTERRUPT
+            self._dirty.add(thread_id)
+            if interrupted:
+                self._interrupted_at[thread_id] = max(self._interrupted_at.get(thread_id, ""), checkpoint_id)
+                self._touch_thread(thread_id, interrupted=True)
+                self.flush()
+            else:
+                self._maybe_flush(thread_id)
+
+    # ----------------------------------------
+    # 삭제 / 정리
+    # ----------------------------------------
+    def delete_thread(self, thread_id: str) -> None:
+        """스레드의 모든 체크포인트/쓰기 삭제"""
+        self._delete_threads([thread_id])
+
+    def _delete_threads(self, thread_ids: Sequence[str]) -> None:
+        params = [(thread_id,) for thread_id in thread_ids]
+        with self.lock:
+            self.flush()
+            with self.conn:
+                self.conn.execute("BEGIN")
+                for table in ("checkpoints", "writes", "threads"):
+                    self.conn.executemany(f"DELETE FROM {table} WHERE thread_id = ?", params)
+            for thread_id in thread_ids:
+                self._interrupted_at.pop(thread_id, None)
+
+    def prune(self, thread_ids: Sequence[str], *, strategy: str = "keep_latest") -> None:
+        """스레드별 체크포인트 정리
+
+        strategy:
+            "keep_latest" - 네임스페이스별 최신 체크포인트(와 그 쓰기)만 유지
+            "delete" - 스레드 전체 삭제
+        """
+        if strategy == "delete":
+            self._delete_threads(thread_ids)
+            return
+        if strategy != "keep_latest":
+            raise ValueError(f"알 수 없는 정리 방식: {strategy}")
+        params = [(thread_id,) for thread_id in thread_ids]
+        with self.lock:
+            self.flush()
+            with self.conn:
+                self.conn.execute("BEGIN")
+                for sql in _KEEP_LATEST:
+                    self.conn.executemany(sql, params)
+
+    def prune_completed(self, older_than: float = 0.0) -> int:
+        """승인 대기가 아니며 older_than초 동안 갱신되지 않은 스레드 삭제"""
+        with self.lock:
+            self.flush()
+            thread_ids = [
+                row[0]
+                for row in self.conn.execute(
+                    "SELECT thread_id FROM threads WHERE interrupted = 0 AND updated_at <= ?",
+                    (time.time() - older_than,),
+                )
+            ]
+            if thread_ids:
+                self._delete_threads(thread_ids)
+            return len(thread_ids)
+
+    # ----------------------------------------
+    # 비동기 버전 (기본 실행기 스레드에서 실행)
+    # ----------------------------------------
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.get_running_loop().run_in_executor(None, self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        items = await asyncio.get_running_loop().run_in_executor(
+            None, lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in items:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        # 버퍼가 차면 커밋(SQLite 트랜잭션)까지 하고 lock도 읽기와 공유하므로 이벤트 루프 밖에서 실행
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self.put, config, checkpoint, metadata, new_versions
+        )
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.get_running_loop().run_in_executor(
+            None, self.put_writes, config, writes, task_id, task_path
+        )
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.get_running_loop().run_in_executor(None, self.delete_thread, thread_id)
+
+    async def aprune(self, thread_ids: Sequence[str], *, strategy: str = "keep_latest") -> None:
+        await asyncio.get_running_loop().run_in_executor(
+            None, lambda: self.prune(thread_ids, strategy=strategy)
+        )
+
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        next_v = current_v + 1
+        next_h = random.random()
+        return f"{next_v:032}.{next_h:016}"
+
+
+# ============================================
+# 3. 메모리 체크포인터 (압축 + 메모리 상한)
+# ============================================
+class CompactMemorySaver(InMemorySaver):
+    """스레드별 최신 상태만 보관하는 메모리 체크포인터
+
+    - 채널 값은 InMemorySaver와 같이 바뀐 채널만 (채널, 버전) 단위로 저장 (델타)
+    - 새 체크포인트 저장 시 같은 스레드의 이전 체크포인트/쓰기와 대체된 채널 값 삭제
+      → 스레드당 메모리 = 최신 상태 1벌 + 대기 중 interrupt
+    - max_bytes를 넘으면 가장 오래 사용하지 않은 완료 스레드부터 통째로 삭제
+      (interrupt로 승인 대기 중인 스레드는 삭제하지 않음)
+
+    Args:
+        max_bytes: 직렬화된 체크포인트/채널 값/쓰기 합계 상한 (None이면 상한 없음)
+    """
+
+    def __init__(self, *, serde: Optional[SerializerProtocol] = None, max_bytes: Optional[int] = 256 * 2**20):
+        super().__init__(serde=serde)
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.stats = {"compacted": 0, "evicted": 0}
+        self._usage: OrderedDict = OrderedDict()  # thread_id -> 사용 바이트 (최근 사용이 끝)
+        self._interrupted: set = set()
+        self._versions: dict = {}  # (thread_id, checkpoint_ns) -> {채널: 현재 버전}
+        self._lock = threading.RLock()
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        with self._lock:
+            result = super().put(config, checkpoint, metadata, new_versions)
+            thread_id = config["configurable"]["thread_id"]
+            checkpoint_ns = config["configurable"]["checkpoint_ns"]
+
+            # 이전 체크포인트와 그 쓰기 (대기 중이던 interrupt는 새 체크포인트가 생기면 처리된 것)
+            checkpoints = self.storage[thread_id][checkpoint_ns]
+            for checkpoint_id in [key for key in checkpoints if key != checkpoint["id"]]:
+                del checkpoints[checkpoint_id]
+                self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+                self.stats["compacted"] += 1
+
+            # 새 버전으로 대체된 채널 값
+            versions = self._versions.setdefault((thread_id, checkpoint_ns), {})
+            for channel, version in new_versions.items():
+                previous = versions.get(channel)
+                if previous is not None and previous != version:
+                    self.blobs.pop((thread_id, checkpoint_ns, channel, previous), None)
+                versions[channel] = version
+
+            self._interrupted.discard(thread_id)
+            self._account(thread_id)
+        return result
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        with self._lock:
+            super().put_writes(config, writes, task_id, task_path)
+            thread_id = config["configurable"]["thread_id"]
+            if any(channel == INTERRUPT for channel, _ in writes):
+                self._interrupted.add(thread_id)
+            self._account(thread_id)
+
+    def delete_thread(self, thread_id: str) -> None:
+        """스레드 삭제 (보관 중인 키만 직접 삭제하므로 전체 키를 순회하지 않음)"""
+        with self._lock:
+            for checkpoint_ns, checkpoints in self.storage.pop(thread_id, {}).items():
+                for checkpoint_id in checkpoints:
+                    self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+                for channel, version in self._versions.pop((thread_id, checkpoint_ns), {}).items():
+                    self.blobs.pop((thread_id, checkpoint_ns, channel, version), None)
+            self.total_bytes -= self._usage.pop(thread_id, 0)
+            self._interrupted.discard(thread_id)
+
+    def pending_threads(self) -> list:
+        """interrupt로 전문가 승인을 기다리는 스레드 ID 목록"""
+        return list(self._interrupted)
+
+    def _thread_bytes(self, thread_id: str) -> int:
+        size = 0
+        for checkpoint_ns, checkpoints in self.storage.get(thread_id, {}).items():
+            for checkpoint_id, (checkpoint, metadata, _) in checkpoints.items():
+                size += len(checkpoint[1]) + len(metadata[1])
+                for _, _, value, _ in self.writes.get((thread_id, checkpoint_ns, checkpoint_id), {}).values():
+                    size += len(value[1])
+            for channel, version in self._versions.get((thread_id, checkpoint_ns), {}).items():
+                blob = self.blobs.get((thread_id, checkpoint_ns, channel, version))
+                if blob is not None:
+                    size += len(blob[1])
+        return size
+
+    def _account(self, thread_id: str) -> None:
+        """스레드 사용량 갱신 + 상한 초과 시 오래된 완료 스레드 삭제"""
+        size = self._thread_bytes(thread_id)
+        self.total_bytes += size - self._usage.get(thread_id, 0)
+        self._usage[thread_id] = size
+        self._usage.move_to_end(thread_id)
+        if self.max_bytes is None or self.total_bytes <= self.max_bytes:
+            return
+        for victim in list(self._usage):
+            if self.total_bytes <= self.max_bytes:
+                break
+            if victim == thread_id or victim in self._interrupted:
+                continue
+            self.delete_thread(victim)
+            self.stats["evicted"] += 1
@@ -0,0 +1,159 @@
+"""
+반복 경보 병합 (interrupt 전 단계)
+- 같은 설비에서 같은 위험 유형(risk_level + 권장 조치)이 반복되면
+  새 interrupt를 만들지 않고 기존 승인 대기 건에 병합
+- 병합 시 최신 측정값/횟수만 갱신 → interrupt 수는 폴링 주기가 아니라
+  서로 다른 사건 수에 비례
+- 병합된 측정값은 표시용 (병합기 항목과 인박스 payload만 갱신).
+  승인 대기 스레드의 체크포인트 상태는 interrupt 시점 값 그대로이며,
+  재개 후 실행되는 조치도 그 값을 기준으로 함
+- 등록 후 ttl 초가 지나면 만료 (병합으로 연장되지 않음) → 대기 스레드가 실패해
+  release()가 호출되지 않아도 같은 경보는 늦어도 ttl 뒤에 새 interrupt가 됨
+- is_pending 을 지정하면 병합 전에 대상 스레드가 아직 승인 대기인지 확인
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+
+# ============================================
+# 1. 병합 항목
+# ============================================
+@dataclass
+class CoalescedAlert:
+    facility_id: str
+    signature: tuple
+    thread_id: str  # interrupt가 걸려 있는 승인 대기 스레드
+    sensor_data: dict
+    timestamp: float  # epoch 초
+    count: int = 1
+    first_seen: float = field(default_factory=time.time)  # 등록 시각 (만료 기준)
+    last_seen: float = field(default_factory=time.time)  # 마지막 병합 시각 (표시용)
+
+
+def alert_signature(state: dict) -> tuple:
+    """위험 유형 서명 (측정값 자체는 포함하지 않음)"""
+    return (state["risk_level"], state["recommended_action"])
+
+
+# ============================================
+# 2. 병합기
+# ============================================
+class AlertCoalescer:
+    """(facility_id, 서명) -> 승인 대기 중인 경보
+
+    Args:
+        ttl: 등록 후 만료까지의 시간(초)
+        is_pending: thread_id -> 승인 대기 여부. 병합할 때마다 호출되므로 빠른 조회여야 함
+            (예: 인박스 lambda thread_id: inbox.get(thread_id) is not None)
+    """
+
+    def __init__(self, ttl: float = 900.0, is_pending: Optional[Callable[[str], bool]] = None):
+        self.ttl = ttl
+        self.is_pending = is_pending
+        self._alerts: dict = {}
+        self._lock = threading.Lock()
+        self._listeners: list = []
+        self._ops = 0
+        self.stats = {"raised": 0, "merged": 0, "expired": 0}
+
+    def subscribe(self, listener: Callable[[CoalescedAlert], None]) -> None:
+        """병합 발생 시 호출할 콜백 등록 (예: ApprovalInbox.update_readings)"""
+        self._listeners.append(listener)
+
+    def register(
+        self,
+        facility_id: str,
+        signature: tuple,
+        thread_id: str,
+        sensor_data: dict,
+        timestamp: float,
+    ) -> Optional[CoalescedAlert]:
+        """경보 등록. 같은 사건의 승인 대기 건이 이미 있으면 병합하고 그 항목 반환
+
+        Returns:
+            None - 새 사건 (호출한 스레드가 interrupt를 걸어야 함)
+            CoalescedAlert - 다른 스레드의 기존 대기 건에 병합됨
+                (sensor_data/timestamp는 표시용으로만 갱신, 대기 스레드 상태는 그대로)
+        """
+        now = time.time()
+        key = (facility_id, signature)
+        with self._lock:
+            self._ops += 1
+            if self._ops % 1024 == 0:
+                self._purge(now)
+
+            alert = self._alerts.get(key)
+            if alert is not None and alert.thread_id != thread_id and (
+                now - alert.first_seen > self.ttl
+                or (self.is_pending is not None and not self.is_pending(alert.thread_id))
+            ):
+                # 만료 또는 대상 스레드가 더 이상 승인 대기가 아님 (실패/종료) → 새 사건
+                del self._alerts[key]
+                self.stats["expired"] += 1
+                alert = None
+
+            if alert is None:
+                self._alerts[key] = CoalescedAlert(
+                    facility_id, signature, thread_id, sensor_data, timestamp,
+                    first_seen=now, last_seen=now,
+                )
+                self.stats["raised"] += 1
+                return None
+
+            if alert.thread_id == thread_id:
+                # 승인 대기 스레드 자신이 재개되며 노드를 다시 실행하는 경우
+                return None
+
+            alert.sensor_data = sensor_data
+            alert.timestamp = timestamp
+            alert.count += 1
+            alert.last_seen = now
+            self.stats["merged"] += 1
+
+        for listener in self._listeners:
+            listener(alert)
+        return alert
+
+    def release(self, facility_id: str, signature: tuple, thread_id: str) -> Optional[CoalescedAlert]:
+        """전문가 결정 후 사건 종료 (이후 같은 경보는 새 interrupt)"""
+        key = (facility_id, signature)
+        with self._lock:
+            alert = self._alerts.get(key)
+            if alert is not None and alert.thread_id == thread_id:
+                return self._alerts.pop(key)
+        return None
+
+    def get(self, facility_id: str, signature: tuple) -> Optional[CoalescedAlert]:
+        return self._alerts.get((facility_id, signature))
+
+    def __len__(self) -> int:
+        return len(self._alerts)
+
+    def _purge(self, now: float) -> None:
+        expired = [key for key, alert in self._alerts.items() if now - alert.first_seen > self.ttl]
+        for key in expired:
+            del self._alerts[key]
+        self.stats["expired"] += len(expired)
+
+
+_coalescer: Optional[AlertCoalescer] = None
+_coalescer_lock = threading.Lock()
+
+
+def get_coalescer() -> AlertCoalescer:
+    """프로세스 공용 경보 병합기"""
+    global _coalescer
+    if _coalescer is None:
+        with _coalescer_lock:
+            if _coalescer is None:
+                _coalescer = AlertCoalescer()
+    return _coalescer
+
+
+def set_coalescer(coalescer: Optional[AlertCoalescer]) -> None:
+    """공용 경보 병합기 교체 (테스트/벤치마크용, None이면 초기화)"""
+    global _coalescer
+    _coalescer = coalescer
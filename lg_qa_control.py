@@ -0,0 +1,396 @@
+"""
+제어 명령 디스패처 (execute_action_node -> SCADA/PLC)
+- 노드는 명령을 큐에 넣고 바로 반환 → 그래프가 제어기 왕복을 기다리지 않음
+- 제어기별 큐 + 배치 전송 (batch_size 개 또는 linger 초 중 먼저 도달하는 쪽)
+- 제어기별 지속 연결 풀 (연결 수 = 동시 전송 배치 수), 끊긴 연결은 버리고 새로 연결
+- 실패 시 같은 멱등 키로 재전송 (지수 백오프) → 응답만 유실된 명령이 두 번 실행되지 않음
+- 로컬 가짜 제어기(FakeController)로 지연/실패/응답 유실을 재현
+
+기본값은 디스패처 없음(기존과 같이 명령을 보내지 않음). 사용 예:
+    configure_dispatcher({"default": FakeController(latency=0.02)}, pool_size=8)
+    ...  # 그래프 실행 (승인된 조치가 디스패처로 전달됨)
+    get_dispatcher().flush()
+"""
+
+import hashlib
+import queue
+import random
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from lg_qa_events import ERROR, emit
+
+
+# 명령 처리 결과
+STATUS_APPLIED = "applied"
+STATUS_DUPLICATE = "duplicate"  # 같은 멱등 키가 이미 적용됨 (재전송으로 인한 중복)
+STATUS_FAILED = "failed"
+
+
+class ControllerError(ConnectionError):
+    """제어기 연결/전송 실패 (재시도 대상)"""
+
+
+# ============================================
+# 1. 명령
+# ============================================
+@dataclass
+class ControlCommand:
+    facility_id: str
+    action: str
+    idempotency_key: str
+    controller: str
+    created_at: float = field(default_factory=time.time)
+    attempts: int = 0
+
+
+@dataclass
+class CommandResult:
+    idempotency_key: str
+    facility_id: str
+    action: str
+    status: str
+    attempts: int
+    latency: float  # 큐 등록부터 확인 응답까지 (초)
+    error: Optional[str] = None
+
+
+def idempotency_key(thread_id: str, facility_id: str, action: str, cycle: float) -> str:
+    """승인 1건 = 명령 1건. 같은 사이클의 노드가 재실행돼도 같은 키
+
+    cycle은 승인된 사이클의 측정 시각(epoch 초). 설비별로 스레드를 재사용해도
+    사이클마다 따로 승인된 같은 조치는 서로 다른 키가 됨
+    """
+    return hashlib.blake2b(
+        f"{thread_id}\x00{facility_id}\x00{action}\x00{cycle!r}".encode("utf-8"), digest_size=16,
+    ).hexdigest()
+
+
+# ============================================
+# 2. 가짜 제어기 (테스트/벤치마크용)
+# ============================================
+class FakeController:
+    """배치 1건당 latency 초가 걸리는 로컬 제어기
+
+    Args:
+        latency: 배치 왕복 시간(초)
+        failure_rate: 배치 전송이 연결 오류로 실패할 확률
+        lost_ack_rate: 명령은 적용했지만 응답이 유실될 확률 (멱등 키 검증용)
+        connect_latency: 새 연결 수립 시간(초)
+        seed: 실패 재현용 난수 시드
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.005,
+        failure_rate: float = 0.0,
+        lost_ack_rate: float = 0.0,
+        connect_latency: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.lost_ack_rate = lost_ack_rate
+        self.connect_latency = connect_latency
+        self.applied: dict = {}  # 멱등 키 -> (facility_id, action)
+        self.stats = {"connects": 0, "batches": 0, "commands": 0, "duplicates": 0}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def connect(self) -> "FakeConnection":
+        if self.connect_latency:
+            time.sleep(self.connect_latency)
+        with self._lock:
+            self.stats["connects"] += 1
+        return FakeConnection(self)
+
+    def _send(self, commands: list) -> dict:
+        time.sleep(self.latency)
+        with self._lock:
+            if self._rng.random() < self.failure_rate:
+                raise ControllerError("가짜 제어기 연결 오류")
+            results = {}
+            for command in commands:
+                if command.idempotency_key in self.applied:
+                    self.stats["duplicates"] += 1
+                    results[command.idempotency_key] = STATUS_DUPLICATE
+                else:
+                    self.applied[command.idempotency_key] = (command.facility_id, command.action)
+                    results[command.idempotency_key] = STATUS_APPLIED
+            self.stats["batches"] += 1
+            self.stats["commands"] += len(commands)
+            lost = self._rng.random() < self.lost_ack_rate
+        if lost:
+            raise ControllerError("가짜 제어기 응답 유실")
+        return results
+
+
+class FakeConnection:
+    def __init__(self, controller: FakeController):
+        self.controller = controller
+        self.closed = False
+
+    def send_batch(self, commands: list) -> dict:
+        """명령 목록 전송 -> 멱등 키별 처리 결과"""
+        if self.closed:
+            raise ControllerError("닫힌 연결")
+        return self.controller._send(commands)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+# ============================================
+# 3. 연결 풀
+# ============================================
+class ConnectionPool:
+    """제어기 1개에 대한 지속 연결 풀 (필요할 때 최대 size 개까지 연결)
+
+    controller.connect()가 send_batch(commands) / close()를 가진 연결을 반환해야 함
+    """
+
+    def __init__(self, controller, size: int = 4):
+        self.controller = controller
+        self.size = size
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._closed = False
+
+    def acquire(self):
+        self._slots.acquire()
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            return self.controller.connect()
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, connection, broken: bool = False) -> None:
+        if broken or self._closed:
+            connection.close()
+        else:
+            self._idle.put(connection)
+        self._slots.release()
+
+    def close(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+# ============================================
+# 4. 디스패처
+# ============================================
+class ControlDispatcher:
+    """제어기별 배치 + 연결 풀 + 재시도 디스패처
+
+    Args:
+        controllers: 제어기 ID -> 제어기 (connect() 메서드)
+        route: facility_id -> 제어기 ID (기본: 첫 번째 제어기)
+        pool_size: 제어기별 연결 수 (= 동시에 전송 중인 배치 수)
+        batch_size: 배치 1건의 최대 명령 수
+        linger: 배치를 채우기 위해 기다리는 최대 시간(초)
+        max_retries: 전송 실패 시 재시도 횟수
+        backoff: 첫 재시도 대기 시간(초, 이후 2배씩)
+        max_pending: 제어기별 큐 크기 (가득 차면 submit이 대기)
+    """
+
+    def __init__(
+        self,
+        controllers: dict,
+        route: Optional[Callable[[str], str]] = None,
+        pool_size: int = 4,
+        batch_size: int = 128,
+        linger: float = 0.002,
+        max_retries: int = 5,
+        backoff: float = 0.05,
+        max_pending: int = 100_000,
+    ):
+        if not controllers:
+            raise ValueError("제어기가 최소 1개 필요합니다")
+        default = next(iter(controllers))
+        self.route = route or (lambda facility_id: default)
+        self.batch_size = batch_size
+        self.linger = linger
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.pool_size = pool_size
+        self.stats = {"submitted": 0, "batches": 0, "retries": 0, "applied": 0,
+                      "duplicate": 0, "failed": 0}
+        self._stats_lock = threading.Lock()
+        self._pools = {cid: ConnectionPool(c, pool_size) for cid, c in controllers.items()}
+        self._queues = {cid: queue.Queue(maxsize=max_pending) for cid in controllers}
+        self._inflight: dict = {}  # 멱등 키 -> Future (큐/전송 중 중복 제출 방지)
+        self._inflight_lock = threading.Lock()
+        self._threads = [
+            threading.Thread(target=self._worker, args=(cid,), name=f"qa-control-{cid}-{n}", daemon=True)
+            for cid in controllers
+            for n in range(pool_size)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, facility_id: str, action: str, key: str) -> Future:
+        """명령 큐 등록 (제어기 응답을 기다리지 않음). 처리 결과는 Future로 확인"""
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future
+            future = self._inflight[key] = Future()
+        command = ControlCommand(facility_id, str(action), key, self.route(facility_id))
+        self._count("submitted")
+        self._queues[command.controller].put((command, future))
+        return future
+
+    def pending(self) -> int:
+        with self._inflight_lock:
+            return len(self._inflight)
+
+    def flush(self) -> None:
+        """큐/전송 중인 명령이 모두 끝날 때까지 대기"""
+        for q in self._queues.values():
+            q.join()  # 큐에서 꺼낸 명령은 결과가 정해진 뒤 task_done
+
+    def close(self) -> None:
+        self.flush()
+        for q in self._queues.values():
+            for _ in range(self.pool_size):
+                q.put(None)
+        for thread in self._threads:
+            thread.join()
+        for pool in self._pools.values():
+            pool.close()
+
+    # --------------------------------------------
+    # 작업 스레드
+    # --------------------------------------------
+    def _count(self, name: str, n: int = 1) -> None:
+        with self._stats_lock:
+            self.stats[name] += n
+
+    def _next_batch(self, q: queue.Queue) -> Optional[list]:
+        item = q.get()
+        if item is None:
+            q.task_done()
+            return None
+        batch = [item]
+        deadline = time.monotonic() + self.linger
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = q.get(timeout=remaining) if remaining > 0 else q.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                # 종료 신호는 다시 넣어 다음 루프에서 처리
+                q.task_done()
+                q.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _worker(self, controller_id: str) -> None:
+        q = self._queues[controller_id]
+        pool = self._pools[controller_id]
+        while True:
+            batch = self._next_batch(q)
+            if batch is None:
+                return
+            try:
+                self._send(pool, batch)
+            except BaseException as exc:
+                # 예상하지 못한 오류로 _send가 끝나도 작업 스레드는 계속 실행
+                emit(ERROR, "control.worker_error", controller=controller_id, error=repr(exc))
+            finally:
+                # 결과가 정해지지 않은 명령은 실패 처리 (Future 대기자/멱등 키가 남지 않도록)
+                for command, future in batch:
+                    if not future.done():
+                        self._finish(command, future, STATUS_FAILED, ControllerError("전송 중단"))
+                    q.task_done()
+
+    def _send(self, pool: ConnectionPool, batch: list) -> None:
+        waiting = batch
+        error = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self._count("retries")
+                time.sleep(self.backoff * (2 ** (attempt - 1)))
+            commands = [command for command, _ in waiting]
+            for command in commands:
+                command.attempts += 1
+            self._count("batches")
+            try:
+                connection = pool.acquire()
+            except Exception as exc:
+                # 연결 실패 = 전송 실패와 같이 재시도
+                error = exc
+                continue
+            try:
+                results = connection.send_batch(commands)
+            except Exception as exc:
+                # 응답을 못 받았으므로 적용 여부를 알 수 없음 → 같은 멱등 키로 재전송
+                pool.release(connection, broken=True)
+                error = exc
+                continue
+            pool.release(connection)
+            retry = []
+            for command, future in waiting:
+                status = results.get(command.idempotency_key, STATUS_FAILED)
+                if status == STATUS_FAILED:
+                    retry.append((command, future))
+                else:
+                    self._finish(command, future, status)
+            if not retry:
+                return
+            waiting, error = retry, None
+        for command, future in waiting:
+            self._finish(command, future, STATUS_FAILED, error)
+
+    def _finish(self, command: ControlCommand, future: Future, status: str, error=None) -> None:
+        result = CommandResult(
+            command.idempotency_key, command.facility_id, command.action, status,
+            command.attempts, time.time() - command.created_at,
+            None if error is None else repr(error),
+        )
+        self._count(status)
+        if status == STATUS_FAILED:
+            emit(ERROR, "control.failed", facility_id=command.facility_id, action=command.action,
+                 attempts=command.attempts, error=result.error)
+        with self._inflight_lock:
+            self._inflight.pop(command.idempotency_key, None)
+        future.set_result(result)
+
+
+# ============================================
+# 5. 프로세스 공용 디스패처
+# ============================================
+_dispatcher: Optional[ControlDispatcher] = None
+
+
+def get_dispatcher() -> Optional[ControlDispatcher]:
+    """설정된 공용 디스패처 (없으면 None → 제어 명령을 보내지 않음)"""
+    return _dispatcher
+
+
+def configure_dispatcher(controllers: dict, **options) -> ControlDispatcher:
+    """공용 디스패처 교체 (이전 디스패처는 남은 명령을 보낸 뒤 종료)"""
+    global _dispatcher
+    previous, _dispatcher = _dispatcher, ControlDispatcher(controllers, **options)
+    if previous is not None:
+        previous.close()
+    return _dispatcher
+
+
+def set_dispatcher(dispatcher: Optional[ControlDispatcher]) -> None:
+    """공용 디스패처 직접 지정 (None이면 해제, 이전 디스패처는 닫지 않음)"""
+    global _dispatcher
+    _dispatcher = dispatcher
@@ -0,0 +1,301 @@
+"""
+승인 지연 에스컬레이션 / 자동 재개 스케줄러
+- 승인 대기(expert_approval interrupt) 스레드마다 위험도별 단계 기한을 타이머 휠에 등록
+  · 등록/취소 O(1), 기한 확인은 지난 틱의 슬롯만 확인 → 전체 대기 스레드를 순회하지 않음
+- 기한 도달 시 위험도별 정책에 따라
+  · ESCALATE: 상위 전문가 호출 (이벤트 + 콜백)
+  · AUTO_RESUME: 안전 기본 결정으로 자동 재개 (예: CRITICAL → IMMEDIATE_SHUTDOWN)
+- ApprovalInbox에 연결하면 등록/결정/재개에 맞춰 자동으로 추적/취소
+
+사용 예:
+    scheduler = EscalationScheduler(graph)
+    scheduler.attach(inbox)                 # 인박스 항목 등록 시 기한 추적 시작
+    asyncio.create_task(scheduler.run())    # tick 초마다 기한 확인
+"""
+
+import asyncio
+import math
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from langgraph.types import Command
+
+from lg_qa_events import ERROR, WARNING, emit
+from lg_qa_inbox import ITEM_ADDED, ITEM_REMOVED, ITEM_RESOLVED, ApprovalInbox
+from lg_qa_state import Action, RiskLevel
+
+
+# ============================================
+# 1. 타이머 휠
+# ============================================
+class TimerWheel:
+    """해시 타이머 휠 (슬롯 = 틱 번호 % slots, 한 바퀴 이상 남은 항목은 슬롯에 그대로 둠)
+
+    Args:
+        tick: 틱 간격(초) = 기한 해상도
+        slots: 슬롯 수 (tick * slots 보다 먼 기한은 여러 바퀴 뒤에 만료)
+    """
+
+    def __init__(self, tick: float = 1.0, slots: int = 4096, now: Optional[float] = None):
+        self.tick = tick
+        self.slots = slots
+        self._wheel: list = [{} for _ in range(slots)]  # 슬롯별 key -> 만료 틱 번호
+        self._where: dict = {}  # key -> 슬롯 번호
+        self._current = self._tick_of(time.time() if now is None else now)
+
+    def _tick_of(self, t: float) -> int:
+        return math.floor(t / self.tick)
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def __contains__(self, key) -> bool:
+        return key in self._where
+
+    def add(self, key, deadline: float) -> None:
+        """기한 등록 (같은 키는 교체). 이미 지난 기한은 다음 틱에 만료"""
+        self.cancel(key)
+        due = max(math.ceil(deadline / self.tick), self._current + 1)
+        slot = due % self.slots
+        self._wheel[slot][key] = due
+        self._where[key] = slot
+
+    def cancel(self, key) -> bool:
+        slot = self._where.pop(key, None)
+        if slot is None:
+            return False
+        del self._wheel[slot][key]
+        return True
+
+    def advance(self, now: Optional[float] = None) -> list:
+        """now 까지 지난 틱의 만료 키 목록 (만료 순서대로)"""
+        target = self._tick_of(time.time() if now is None else now)
+        if target <= self._current:
+            return []
+        expired = []
+        # 한 바퀴 이상 건너뛴 경우에도 각 슬롯은 한 번만 확인
+        for t in range(self._current + 1, min(target, self._current + self.slots) + 1):
+            slot = self._wheel[t % self.slots]
+            if not slot:
+                continue
+            due_keys = sorted((due, key) for key, due in slot.items() if due <= target)
+            for _, key in due_keys:
+                del slot[key]
+                del self._where[key]
+                expired.append(key)
+        self._current = target
+        return expired
+
+
+# ============================================
+# 2. 에스컬레이션 정책
+# ============================================
+ESCALATE = "escalate"
+AUTO_RESUME = "auto_resume"
+
+
+@dataclass(frozen=True)
+class EscalationStep:
+    after: float  # interrupt 발생 후 경과 시간(초)
+    kind: str  # ESCALATE | AUTO_RESUME
+    level: int = 1  # 에스컬레이션 단계 (호출 대상 구분용)
+    decision: Optional[dict] = None  # AUTO_RESUME 시 재개 값
+
+
+# 승인 없이 기한이 지난 CRITICAL 건에 적용할 안전 기본 결정
+SAFE_SHUTDOWN_DECISION = {
+    "approved": True,
+    "comment": "승인 시간 초과 - 안전 기본 조치 자동 실행",
+    "override_action": Action.IMMEDIATE_SHUTDOWN.value,
+}
+
+# 위험도 -> 단계 목록 (after 오름차순). HIGH는 자동 재개 없이 단계적 호출만
+DEFAULT_POLICY = {
+    RiskLevel.CRITICAL.value: (
+        EscalationStep(120, ESCALATE, 1),
+        EscalationStep(300, AUTO_RESUME, decision=SAFE_SHUTDOWN_DECISION),
+    ),
+    RiskLevel.HIGH.value: (
+        EscalationStep(900, ESCALATE, 1),
+        EscalationStep(3600, ESCALATE, 2),
+    ),
+}
+
+
+@dataclass
+class TrackedApproval:
+    thread_id: str
+    facility_id: str
+    risk_level: str
+    since: float  # interrupt 발생 시각 (epoch 초)
+    step: int = 0  # 다음에 실행할 단계 번호
+
+
+# ============================================
+# 3. 스케줄러
+# ============================================
+class EscalationScheduler:
+    """승인 대기 스레드별 기한 추적 + 에스컬레이션/자동 재개
+
+    Args:
+        graph: 자동 재개에 사용할 그래프
+        policy: 위험도 -> EscalationStep 목록 (기본 DEFAULT_POLICY)
+        tick: 기한 확인 간격(초)
+        slots: 타이머 휠 슬롯 수
+        on_escalate: ESCALATE 단계 실행 시 호출할 콜백 (TrackedApproval, EscalationStep)
+        retry_after: 자동 재개 실패 시 다시 시도할 때까지의 시간(초)
+        concurrency: 자동 재개 동시 실행 수
+    """
+
+    def __init__(
+        self,
+        graph=None,
+        policy: Optional[dict] = None,
+        tick: float = 1.0,
+        slots: int = 4096,
+        on_escalate: Optional[Callable[[TrackedApproval, EscalationStep], None]] = None,
+        retry_after: float = 30.0,
+        concurrency: int = 32,
+    ):
+        self.graph = graph
+        self.policy = DEFAULT_POLICY if policy is None else policy
+        self.on_escalate = on_escalate
+        self.retry_after = retry_after
+        self.concurrency = concurrency
+        self.wheel = TimerWheel(tick, slots)
+        self.inbox: Optional[ApprovalInbox] = None
+        self.stats = {"tracked": 0, "escalated": 0, "auto_resumed": 0, "failed": 0}
+        self._tracked: dict = {}
+
+    def __len__(self) -> int:
+        return len(self._tracked)
+
+    # ----------------------------------------
+    # 추적
+    # ----------------------------------------
+    def track(self, thread_id: str, risk_level: str, facility_id: str = "", since: Optional[float] = None) -> bool:
+        """승인 대기 스레드 기한 추적 시작 (정책에 없는 위험도는 무시)"""
+        steps = self.policy.get(str(risk_level))
+        if not steps:
+            return False
+        entry = TrackedApproval(thread_id, facility_id, str(risk_level), time.time() if since is None else since)
+        self._tracked[thread_id] = entry
+        self.wheel.add(thread_id, entry.since + steps[0].after)
+        self.stats["tracked"] += 1
+        return True
+
+    def cancel(self, thread_id: str) -> None:
+        """전문가가 결정했거나 재개된 스레드 추적 중지"""
+        if self._tracked.pop(thread_id, None) is not None:
+            self.wheel.cancel(thread_id)
+
+    def attach(self, inbox: ApprovalInbox) -> None:
+        """인박스 항목 등록 시 추적, 결정 기록/삭제 시 취소"""
+        self.inbox = inbox
+        inbox.subscribe(self._on_inbox)
+        for item in inbox.select():
+            self.track(item.thread_id, item.risk_level, item.facility_id, item.received_at)
+
+    def _on_inbox(self, event: str, item) -> None:
+        if event == ITEM_ADDED:
+            self.track(item.thread_id, item.risk_level, item.facility_id, item.received_at)
+        elif event in (ITEM_RESOLVED, ITEM_REMOVED):
+            self.cancel(item.thread_id)
+
+    # ----------------------------------------
+    # 기한 처리
+    # ----------------------------------------
+    def due(self, now: Optional[float] = None) -> list:
+        """기한이 지난 (TrackedApproval, EscalationStep) 목록. 다음 단계 기한은 바로 등록"""
+        now = time.time() if now is None else now
+        fired = []
+        for thread_id in self.wheel.advance(now):
+            entry = self._tracked.get(thread_id)
+            if entry is None:
+                continue
+            steps = self.policy[entry.risk_level]
+            # 밀린 단계는 한 번에 실행 (스케줄러가 오래 멈춰 있던 경우 등)
+            while True:
+                fired.append((entry, steps[entry.step]))
+                entry.step += 1
+                if entry.step >= len(steps):
+                    del self._tracked[thread_id]
+                    break
+                deadline = entry.since + steps[entry.step].after
+                if deadline > now:
+                    self.wheel.add(thread_id, deadline)
+                    break
+        return fired
+
+    async def advance(self, now: Optional[float] = None) -> list:
+        """기한 도달 단계 실행 (에스컬레이션 알림 + 자동 재개)
+
+        Returns:
+            실행한 (TrackedApproval, EscalationStep) 목록
+        """
+        now = time.time() if now is None else now
+        fired = self.due(now)
+        decisions = {}
+        for entry, step in fired:
+            if step.kind == ESCALATE:
+                self.stats["escalated"] += 1
+                emit(WARNING, "approval.escalated", facility_id=entry.facility_id, thread_id=entry.thread_id,
+                     risk_level=entry.risk_level, stage=step.level, waited=step.after)
+                if self.on_escalate is not None:
+                    self.on_escalate(entry, step)
+            else:
+                decisions[entry.thread_id] = (entry, step)
+        if decisions:
+            await self._auto_resume(decisions, now)
+        return fired
+
+    async def _auto_resume(self, decisions: dict, now: float) -> None:
+        for entry, step in decisions.values():
+            emit(WARNING, "approval.timeout", facility_id=entry.facility_id, thread_id=entry.thread_id,
+                 risk_level=entry.risk_level, waited=step.after, decision=step.decision)
+            # 재개 중 인박스 삭제 알림으로 취소되지 않도록 먼저 추적 해제
+            self._tracked.pop(entry.thread_id, None)
+            self.wheel.cancel(entry.thread_id)
+
+        if self.inbox is not None:
+            results = await self.inbox.resume(
+                self.graph, {thread_id: step.decision for thread_id, (_, step) in decisions.items()},
+                self.concurrency,
+            )
+        else:
+            semaphore = asyncio.Semaphore(self.concurrency)
+
+            async def resume(thread_id: str, decision: dict):
+                async with semaphore:
+                    config = {"configurable": {"thread_id": thread_id}}
+                    # 그 사이 다른 경로로 재개된 스레드는 건너뜀
+                    if not (await self.graph.aget_state(config)).interrupts:
+                        return None
+                    return await self.graph.ainvoke(Command(resume=decision), config=config)
+
+            thread_ids = list(decisions)
+            outcomes = await asyncio.gather(
+                *(resume(thread_id, decisions[thread_id][1].decision) for thread_id in thread_ids),
+                return_exceptions=True,
+            )
+            results = dict(zip(thread_ids, outcomes))
+
+        for thread_id, result in results.items():
+            entry, step = decisions[thread_id]
+            if isinstance(result, BaseException):
+                # 실패 건은 같은 단계를 retry_after 초 뒤 다시 시도
+                self.stats["failed"] += 1
+                emit(ERROR, "approval.timeout_failed", facility_id=entry.facility_id,
+                     thread_id=thread_id, error=repr(result))
+                entry.step -= 1
+                self._tracked[thread_id] = entry
+                self.wheel.add(thread_id, now + self.retry_after)
+            elif result is not None:
+                self.stats["auto_resumed"] += 1
+
+    async def run(self, stop: Optional[asyncio.Event] = None) -> None:
+        """tick 초마다 기한 확인 (stop 이벤트가 설정되면 종료)"""
+        while stop is None or not stop.is_set():
+            await self.advance()
+            await asyncio.sleep(self.wheel.tick)
@@ -0,0 +1,295 @@
+"""
+구조화 이벤트 기록 (노드의 print() 대체)
+- 노드는 이벤트 이름과 원본 필드만 넘기고, 문자열 포맷/시각 변환/출력은 싱크에서 처리
+- 레벨 필터와 이벤트별 샘플링은 기록 생성 전에 판단 (비활성 이벤트 비용 ≈ 0)
+- background=True 이면 기록을 큐에 넣고 백그라운드 스레드가 일괄 출력
+  (큐가 가득 차면 노드를 막지 않고 버린 뒤 개수만 집계)
+
+기본 설정은 대화형 실행을 위해 콘솔에 즉시 출력하며 기존 배너와 같은 형식.
+플릿 규모 실행 예:
+    configure_events(
+        level=WARNING,
+        sinks=[JsonLinesSink("events.jsonl")],
+        background=True,
+        sample={"analysis.completed": 0.01},
+    )
+"""
+
+import json
+import queue
+import random
+import sys
+import threading
+import time
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Optional
+
+
+DEBUG, INFO, WARNING, ERROR = 10, 20, 30, 40
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+
+
+# ============================================
+# 1. 콘솔 렌더러 (이벤트 -> 사람이 읽는 배너)
+# ============================================
+ACTION_MESSAGES = {
+    "IMMEDIATE_SHUTDOWN": "🛑 긴급 가동 중지 실행",
+    "CONTROLLED_SHUTDOWN": "⏬ 제어된 가동 중지 실행",
+    "CONTINUE_MONITORING": "👁️ 모니터링 계속",
+    "REDUCE_LOAD": "📉 부하 감소 실행",
+    "MAINTENANCE_ALERT": "🔧 유지보수 알림 전송"
+}
+
+
+def _render_analysis(ts: float, f: dict) -> str:
+    line = "=" * 60
+    return (
+        f"\n{line}\n"
+        f"🤖 AI 분석 완료 - {datetime.fromtimestamp(ts).strftime('%Y-%m-%d %H:%M:%S')}\n"
+        f"{line}\n"
+        f"위험도: {f['risk_level']}\n"
+        f"분석 결과:\n{f['analysis']}\n"
+        f"권장 조치: {f['recommended_action']}\n"
+        f"{line}\n\n"
+    )
+
+
+def _render_approval_requested(ts: float, f: dict) -> str:
+    line = "=" * 60
+    sensors = "".join(f"  - {key}: {value}\n" for key, value in f["sensor_data"].items())
+    return (
+        f"\n{line}\n"
+        f"⏸️  전문가 검토 대기 중...\n"
+        f"{line}\n"
+        f"설비 ID: {f['facility_id']}\n"
+        f"위험도: {f['risk_level']}\n"
+        f"AI 권장 조치: {f['recommended_action']}\n"
+        f"\n센서 데이터:\n"
+        f"{sensors}"
+        f"{line}\n\n"
+    )
+
+
+def _render_approval_received(ts: float, f: dict) -> str:
+    line = "=" * 60
+    override = f"수정된 조치: {f['override_action']}\n" if f.get("override_action") else ""
+    return (
+        f"\n{line}\n"
+        f"👤 전문가 결정 수신\n"
+        f"{line}\n"
+        f"승인 여부: {'✅ 승인' if f['approved'] else '❌ 거부'}\n"
+        f"전문가 의견: {f['comment']}\n"
+        f"{override}"
+        f"{line}\n\n"
+    )
+
+
+def _render_action_executed(ts: float, f: dict) -> str:
+    line = "=" * 60
+    action = f["action"]
+    return (
+        f"\n{line}\n"
+        f"⚙️  조치 실행 중...\n"
+        f"{line}\n"
+        f"{ACTION_MESSAGES.get(action, f'조치: {action}')}\n"
+        f"전문가 의견: {f['comment']}\n"
+        f"{line}\n\n"
+    )
+
+
+RENDERERS: dict = {
+    "analysis.completed": _render_analysis,
+    "approval.auto": lambda ts, f: "✅ 위험도 낮음 - 자동 승인\n",
+    "approval.coalesced": lambda ts, f: f"🔁 동일 경보 병합 - 기존 승인 요청 대기 중 ({f['thread_id']})\n",
+    "approval.requested": _render_approval_requested,
+    "approval.received": _render_approval_received,
+    "approval.escalated": lambda ts, f: (
+        f"⏰ 승인 지연 {f['waited']:.0f}초 - 상위 전문가 호출 (단계 {f['stage']}):"
+        f" {f['facility_id']} / {f['risk_level']}\n"
+    ),
+    "approval.timeout": lambda ts, f: (
+        f"⏱️ 승인 시간 초과 {f['waited']:.0f}초 - 안전 기본 결정으로 자동 재개:"
+        f" {f['facility_id']} / {f['risk_level']}\n"
+    ),
+    "action.cancelled": lambda ts, f: "❌ 전문가 승인 없음 - 조치 실행 취소\n",
+    "action.executed": _render_action_executed,
+    "action.overridden": lambda ts, f: (
+        f"\n⚠️ 전문가가 AI 권장 조치를 수정했습니다\n"
+        f"원래 권장 조치: {f['original']}\n"
+        f"수정된 조치: {f['action']}\n\n"
+    ),
+}
+
+
+# ============================================
+# 2. 싱크
+# ============================================
+class ConsoleSink:
+    """사람이 읽는 형식으로 출력 (등록된 렌더러가 없으면 한 줄 요약)"""
+
+    def __init__(self, stream=None):
+        self.stream = stream
+
+    def write(self, records: list) -> None:
+        # 호출 시점의 sys.stdout 사용 (redirect_stdout 등과 호환)
+        stream = self.stream or sys.stdout
+        for ts, level, event, fields in records:
+            renderer = RENDERERS.get(event)
+            if renderer is not None:
+                stream.write(renderer(ts, fields))
+            else:
+                stream.write(f"[{LEVEL_NAMES.get(level, level)}] {event} {fields}\n")
+        stream.flush()
+
+
+def _json_default(value):
+    # SensorReadings 등 Mapping은 객체로, 그 밖의 값(Analysis 등)은 표시 문자열로
+    if isinstance(value, Mapping):
+        return dict(value)
+    return str(value)
+
+
+class JsonLinesSink:
+    """한 줄에 JSON 1건 (기계 처리용)"""
+
+    def __init__(self, path: str):
+        self.file = open(path, "a", encoding="utf-8")
+
+    def write(self, records: list) -> None:
+        self.file.write("".join(
+            json.dumps(
+                {"ts": ts, "level": LEVEL_NAMES.get(level, level), "event": event, **fields},
+                ensure_ascii=False,
+                default=_json_default,
+            ) + "\n"
+            for ts, level, event, fields in records
+        ))
+        self.file.flush()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+# ============================================
+# 3. 이벤트 기록기
+# ============================================
+class EventEmitter:
+    """레벨/샘플링 필터 + (선택) 백그라운드 큐 기반 이벤트 기록기
+
+    Args:
+        level: 이 레벨 미만 이벤트는 즉시 무시
+        sinks: 기록을 받을 싱크 목록 (write(records) 메서드)
+        background: True면 백그라운드 스레드에서 일괄 출력
+        sample: 이벤트 이름 -> 기록 비율(0~1)
+        max_queue: 백그라운드 큐 크기 (가득 차면 버림)
+        batch_size: 한 번에 싱크로 넘길 최대 기록 수
+    """
+
+    def __init__(
+        self,
+        level: int = INFO,
+        sinks: Optional[list] = None,
+        background: bool = False,
+        sample: Optional[dict] = None,
+        max_queue: int = 65536,
+        batch_size: int = 512,
+    ):
+        self.level = level
+        self.sinks = sinks if sinks is not None else [ConsoleSink()]
+        self.sample = sample or {}
+        self.batch_size = batch_size
+        self.dropped = 0
+        self.sink_errors = 0  # 싱크 write() 실패 횟수 (해당 묶음은 그 싱크에서만 유실)
+        self.last_sink_error: Optional[BaseException] = None
+        self._queue: Optional[queue.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        if background:
+            self._queue = queue.Queue(maxsize=max_queue)
+            self._thread = threading.Thread(target=self._drain, name="qa-events", daemon=True)
+            self._thread.start()
+
+    def enabled(self, level: int) -> bool:
+        return level >= self.level
+
+    def emit(self, level: int, event: str, **fields) -> None:
+        if level < self.level:
+            return
+        rate = self.sample.get(event)
+        if rate is not None and random.random() >= rate:
+            return
+        record = (time.time(), level, event, fields)
+        if self._queue is None:
+            self._write([record])
+            return
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _write(self, records: list) -> None:
+        # 싱크 하나의 오류로 다른 싱크 출력이나 백그라운드 스레드가 멈추지 않도록 싱크별로 처리
+        for sink in self.sinks:
+            try:
+                sink.write(records)
+            except Exception as exc:
+                self.sink_errors += 1
+                self.last_sink_error = exc
+
+    def _drain(self) -> None:
+        while True:
+            record = self._queue.get()
+            if record is None:
+                self._queue.task_done()
+                return
+            batch = [record]
+            while len(batch) < self.batch_size:
+                try:
+                    record = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if record is None:
+                    # 종료 신호는 다시 넣어 다음 루프에서 처리
+                    self._queue.task_done()
+                    self._queue.put(None)
+                    break
+                batch.append(record)
+            try:
+                self._write(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def flush(self) -> None:
+        """백그라운드 큐의 기록이 모두 출력될 때까지 대기"""
+        if self._queue is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        if self._queue is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._queue = None
+        for sink in self.sinks:
+            if hasattr(sink, "close"):
+                sink.close()
+
+
+_emitter = EventEmitter()
+
+
+def get_emitter() -> EventEmitter:
+    return _emitter
+
+
+def configure_events(**options) -> EventEmitter:
+    """공용 이벤트 기록기 교체 (이전 기록기는 비우고 종료)"""
+    global _emitter
+    previous, _emitter = _emitter, EventEmitter(**options)
+    previous.close()
+    return _emitter
+
+
+def emit(level: int, event: str, **fields) -> None:
+    """공용 이벤트 기록기로 기록"""
+    _emitter.emit(level, event, **fields)
@@ -0,0 +1,212 @@
+"""
+설비 플릿 동시 모니터링 (asyncio)
+- 수천 개 설비 스레드를 graph.astream 으로 동시에 실행
+- 동시 실행 수 제한 + 작업 큐 크기 제한(백프레셔)
+- 전문가 승인 interrupt는 대기열에 보관하고 즉시 다음 설비로 진행
+  → 응답이 늦은 전문가 때문에 정상 설비 감시가 멈추지 않음
+- scheduler=RiskScheduler() 를 주면 FIFO 대신 위험도 기한 순으로 실행 (lg_qa_priority.py)
+"""
+
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+from langgraph.types import Command
+
+from lg_app_qa import get_facility_monitor_graph
+from lg_qa_stream import Completed, Interrupt, astream_events
+
+
+# ============================================
+# 1. 작업 / 결과 정의
+# ============================================
+@dataclass
+class FleetJob:
+    facility_id: str
+    thread_id: str
+    input: Any  # 초기 상태 dict 또는 Command(resume=...)
+
+
+@dataclass
+class PendingApproval:
+    """승인 대기열에 보관된 interrupt"""
+    facility_id: str
+    thread_id: str
+    payload: dict  # expert_approval_node의 interrupt 값
+    parked_at: datetime = field(default_factory=datetime.now)
+
+
+@dataclass
+class FleetResult:
+    facility_id: str
+    thread_id: str
+    final_action: Optional[str]
+    error: Optional[BaseException] = None
+
+
+# ============================================
+# 2. 플릿 실행기
+# ============================================
+class FleetRunner:
+    """동시 실행 수가 제한된 설비 모니터링 실행기
+
+    사용 예:
+        async with FleetRunner(concurrency=128) as runner:
+            for facility_id, sensor_data in readings.items():
+                await runner.submit(facility_id, sensor_data)  # 큐가 차면 대기
+            await runner.join()
+            while not runner.approvals.empty():
+                pending = runner.approvals.get_nowait()
+                ...
+                await runner.resume(pending.thread_id, decision)
+
+    Args:
+        graph: 실행할 그래프 (기본: 캐시된 설비 모니터링 그래프)
+        concurrency: 동시에 실행할 그래프 스레드 수
+        max_queued: 대기 가능한 작업 수. 가득 차면 submit()이 대기(백프레셔)
+        on_result: 사이클 완료 시 호출할 콜백 (FleetResult)
+        scheduler: 작업 큐 대신 사용할 우선순위 스케줄러 (lg_qa_priority.RiskScheduler).
+            사이클 결과의 위험도를 scheduler.observe()로 알려 다음 작업 분류에 사용
+    """
+
+    def __init__(
+        self,
+        graph=None,
+        *,
+        concurrency: int = 64,
+        max_queued: Optional[int] = None,
+        on_result: Optional[Callable[[FleetResult], None]] = None,
+        scheduler=None,
+    ):
+        self.graph = graph or get_facility_monitor_graph()
+        self.concurrency = concurrency
+        self.scheduler = scheduler
+        if scheduler is not None:
+            # max_queued 대신 scheduler의 LOW 대기 한도 적용 (위험 작업은 제출이 막히지 않음)
+            self.jobs = scheduler
+        else:
+            self.jobs = asyncio.Queue(maxsize=max_queued or concurrency * 4)
+        # 승인 대기열은 제한 없음 (감시 루프를 막지 않기 위해)
+        self.approvals: asyncio.Queue = asyncio.Queue()
+        self.on_result = on_result
+        self.stats = {"submitted": 0, "completed": 0, "interrupted": 0, "failed": 0}
+        self._workers: list = []
+
+    # ----------------------------------------
+    # 생명주기
+    # ----------------------------------------
+    async def __aenter__(self) -> "FleetRunner":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.stop()
+
+    def start(self) -> None:
+        if not self._workers:
+            self._workers = [
+                asyncio.create_task(self._worker(), name=f"fleet-worker-{i}")
+                for i in range(self.concurrency)
+            ]
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def join(self) -> None:
+        """제출된 모든 작업이 끝날 때까지 대기 (승인 대기 스레드는 보관된 상태)"""
+        await self.jobs.join()
+
+    # ----------------------------------------
+    # 작업 제출
+    # ----------------------------------------
+    async def submit(
+        self,
+        facility_id: str,
+        sensor_data: dict,
+        thread_id: Optional[str] = None,
+        timestamp: Optional[float] = None,
+    ) -> str:
+        """모니터링 사이클 1회 제출. 큐가 가득 차면 자리가 날 때까지 대기
+
+        timestamp: 측정 시각(epoch 초, 녹화 데이터 재생 시 원래 시각 유지). 없으면 현재 시각
+        """
+        thread_id = thread_id or str(uuid.uuid4())
+        initial_state = {
+            "sensor_data": sensor_data,
+            "facility_id": facility_id,
+            "timestamp": timestamp or time.time(),
+        }
+        await self.jobs.put(FleetJob(facility_id, thread_id, initial_state))
+        self.stats["submitted"] += 1
+        return thread_id
+
+    async def resume(self, thread_id: str, decision: dict, facility_id: str = "") -> None:
+        """보관된 승인 건을 전문가 결정으로 재개"""
+        await self.jobs.put(FleetJob(facility_id, thread_id, Command(resume=decision)))
+
+    # ----------------------------------------
+    # 워커
+    # ----------------------------------------
+    async def _worker(self) -> None:
+        while True:
+            job = await self.jobs.get()
+            try:
+                await self._run(job)
+            finally:
+                self.jobs.task_done()
+
+    async def _run(self, job: FleetJob) -> None:
+        config = {"configurable": {"thread_id": job.thread_id}}
+        final_action = None
+        try:
+            async for event in astream_events(self.graph, job.input, config, reuse=True):
+                if isinstance(event, Interrupt):
+                    payload = event.value
+                    self.stats["interrupted"] += 1
+                    if self.scheduler is not None:
+                        self.scheduler.observe(payload.get("facility_id", job.facility_id), payload.get("risk_level"))
+                    self.approvals.put_nowait(
+                        PendingApproval(payload.get("facility_id", job.facility_id), job.thread_id, payload)
+                    )
+                    return
+                if isinstance(event, Completed):
+                    final_action = event.final_action
+                    if self.scheduler is not None:
+                        self.scheduler.observe(job.facility_id, event.values.get("risk_level"))
+        except Exception as e:
+            # 한 설비의 오류가 다른 설비 감시를 막지 않도록 기록만 하고 계속
+            self.stats["failed"] += 1
+            self._emit(FleetResult(job.facility_id, job.thread_id, None, error=e))
+            return
+        self.stats["completed"] += 1
+        self._emit(FleetResult(job.facility_id, job.thread_id, final_action))
+
+    def _emit(self, result: FleetResult) -> None:
+        if self.on_result is not None:
+            self.on_result(result)
+
+
+# ============================================
+# 3. 간편 실행 함수
+# ============================================
+async def run_fleet(readings: dict, concurrency: int = 64, scheduler=None) -> tuple:
+    """설비별 센서 데이터(dict: facility_id -> sensor_data)를 한 번 스캔 (scheduler: FleetRunner 참고)
+
+    Returns:
+        (완료 결과 목록, 승인 대기 목록)
+    """
+    results = []
+    async with FleetRunner(concurrency=concurrency, on_result=results.append, scheduler=scheduler) as runner:
+        for facility_id, sensor_data in readings.items():
+            await runner.submit(facility_id, sensor_data)
+        await runner.join()
+        pending = []
+        while not runner.approvals.empty():
+            pending.append(runner.approvals.get_nowait())
+    return results, pending
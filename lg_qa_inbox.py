@@ -0,0 +1,427 @@
+"""
+전문가 승인 인박스
+- 여러 스레드에서 발생한 expert_approval interrupt를 한곳에 수집
+- 위험도(CRITICAL 우선) + 대기 시간(오래된 순) 으로 정렬해 제공
+- 설비 ID 조회/접두어 검색은 정렬 인덱스 이진 탐색 (O(log n))
+- 전문가 결정은 모아서 Command(resume=...) 로 일괄 재개
+- bulk_resume: 위험도/설비 접두어/권장 조치 조건에 맞는 대기 건을 같은 결정으로
+  동시에 재개하고 스레드별 결과 보고 (체크포인트 쓰기는 모아서 커밋)
+- subscribe: 항목 등록/결정/삭제 알림 (예: 승인 지연 에스컬레이션, lg_qa_escalation.py)
+
+asyncio 이벤트 루프 한 곳에서 사용하는 것을 전제로 함 (락 없음)
+"""
+
+import asyncio
+import bisect
+import contextlib
+import heapq
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Optional
+
+from langgraph.types import Command
+
+from lg_qa_state import RiskLevel, format_timestamp, to_epoch
+
+
+# 숫자가 작을수록 먼저 처리 (위험도 코드가 높은 순: CRITICAL, HIGH, LOW)
+RISK_PRIORITY = {
+    level.value: rank
+    for rank, level in enumerate(sorted(RiskLevel, key=lambda level: level.code, reverse=True))
+}
+# 알 수 없는 위험도 값은 HIGH 와 같은 순위
+_UNKNOWN_PRIORITY = RISK_PRIORITY[RiskLevel.HIGH.value]
+
+
+# ============================================
+# 1. 인박스 항목
+# ============================================
+@dataclass
+class InboxItem:
+    thread_id: str
+    facility_id: str
+    risk_level: str
+    payload: dict  # interrupt 값 (facility_id, risk_level, ai_analysis, sensor_data, ...)
+    received_at: float = field(default_factory=time.time)
+    seq: int = 0  # 힙 항목과 대조하기 위한 등록 순번
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.received_at
+
+
+@dataclass
+class ApprovalSelector:
+    """일괄 처리 대상 조건 (지정한 조건을 모두 만족하는 항목)"""
+    risk_level: Optional[str] = None
+    facility_prefix: str = ""
+    recommended_action: Optional[str] = None
+
+    def matches(self, item: InboxItem) -> bool:
+        return (
+            (self.risk_level is None or item.risk_level == self.risk_level)
+            and item.facility_id.startswith(self.facility_prefix)
+            and (
+                self.recommended_action is None
+                or item.payload.get("recommended_action") == self.recommended_action
+            )
+        )
+
+
+# 인박스 알림 종류 (subscribe 콜백의 첫 인자)
+ITEM_ADDED = "added"
+ITEM_RESOLVED = "resolved"  # 결정 기록됨 (재개 전)
+ITEM_REMOVED = "removed"    # 재개 완료 또는 교체
+
+
+# 재개 결과 상태
+RESUME_COMPLETED = "completed"      # 그래프 종료
+RESUME_INTERRUPTED = "interrupted"  # 다시 승인 대기 (인박스에 재등록됨)
+RESUME_FAILED = "failed"            # 예외 (인박스에 남음)
+
+
+@dataclass
+class ResumeOutcome:
+    thread_id: str
+    facility_id: str
+    status: str
+    final_action: Optional[str] = None
+    error: Optional[BaseException] = None
+
+
+@dataclass
+class BulkResumeReport:
+    outcomes: dict  # thread_id -> ResumeOutcome
+    elapsed: float
+
+    @property
+    def counts(self) -> dict:
+        """상태별 건수"""
+        result: dict = {}
+        for outcome in self.outcomes.values():
+            result[outcome.status] = result.get(outcome.status, 0) + 1
+        return result
+
+    @property
+    def failed(self) -> list:
+        return [outcome for outcome in self.outcomes.values() if outcome.status == RESUME_FAILED]
+
+
+# ============================================
+# 2. 인박스
+# ============================================
+class ApprovalInbox:
+    """승인 대기 interrupt 인덱스
+
+    - _items: thread_id -> InboxItem
+    - _queue: (위험도 순위, 수신 시각, 순번, thread_id) 힙 (처리된 항목은 꺼낼 때 건너뜀)
+    - _by_facility: (facility_id, thread_id) 정렬 리스트
+    - _resolved: thread_id -> 전문가 결정 (재개 전 대기)
+    """
+
+    def __init__(self):
+        self._items: dict = {}
+        self._queue: list = []
+        self._by_facility: list = []
+        self._resolved: dict = {}
+        self._seq = itertools.count()
+        self._listeners: list = []
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, thread_id: str) -> bool:
+        return thread_id in self._items
+
+    def subscribe(self, listener) -> None:
+        """항목 변경 시 호출할 콜백 등록: listener(ITEM_ADDED | ITEM_RESOLVED | ITEM_REMOVED, item)"""
+        self._listeners.append(listener)
+
+    def _notify(self, event: str, item: InboxItem) -> None:
+        for listener in self._listeners:
+            listener(event, item)
+
+    # ----------------------------------------
+    # 수집
+    # ----------------------------------------
+    def add(self, thread_id: str, payload: dict, received_at: Optional[float] = None) -> InboxItem:
+        """interrupt 값 등록 (같은 스레드는 최신 값으로 교체)"""
+        if thread_id in self._items:
+            self._remove(thread_id)
+        item = InboxItem(
+            thread_id=thread_id,
+            facility_id=payload.get("facility_id", ""),
+            risk_level=payload.get("risk_level", "HIGH"),
+            payload=payload,
+        )
+        if received_at is not None:
+            item.received_at = received_at
+        item.seq = next(self._seq)
+        self._items[thread_id] = item
+        heapq.heappush(
+            self._queue,
+            (RISK_PRIORITY.get(item.risk_level, _UNKNOWN_PRIORITY), item.received_at, item.seq, thread_id),
+        )
+        bisect.insort(self._by_facility, (item.facility_id, thread_id))
+        self._notify(ITEM_ADDED, item)
+        return item
+
+    def add_pending(self, pending) -> InboxItem:
+        """lg_qa_fleet.PendingApproval 등록"""
+        return self.add(pending.thread_id, pending.payload, pending.parked_at.timestamp())
+
+    async def collect(self, approvals: asyncio.Queue) -> None:
+        """FleetRunner.approvals 큐를 계속 비우며 등록 (백그라운드 태스크로 실행)"""
+        while True:
+            self.add_pending(await approvals.get())
+
+    def restore(self, graph, thread_ids: Iterable[str]) -> int:
+        """체크포인터에 남아 있는 승인 대기 스레드 복구 (프로세스 재시작 후)"""
+        count = 0
+        for thread_id in thread_ids:
+            snapshot = graph.get_state({"configurable": {"thread_id": thread_id}})
+            count += self._restore_snapshot(thread_id, snapshot)
+        return count
+
+    async def arestore(self, graph, thread_ids: Iterable[str]) -> int:
+        """restore의 비동기 버전 (이벤트 루프 안에서는 이쪽을 사용)"""
+        count = 0
+        for thread_id in thread_ids:
+            snapshot = await graph.aget_state({"configurable": {"thread_id": thread_id}})
+            count += self._restore_snapshot(thread_id, snapshot)
+        return count
+
+    def _restore_snapshot(self, thread_id: str, snapshot) -> int:
+        # 접수 시각은 복구 시각이 아니라 승인 요청 시각 (interrupt 직전 체크포인트 시각,
+        # 없으면 payload의 측정 시각) → 재시작해도 에스컬레이션 기한이 다시 시작되지 않음
+        for pending in snapshot.interrupts:
+            received_at = to_epoch(snapshot.created_at or pending.value.get("timestamp"))
+            self.add(thread_id, pending.value, received_at)
+        return len(snapshot.interrupts)
+
+    def update_readings(self, alert) -> None:
+        """반복 경보가 병합되면 대기 항목의 최신 측정값 갱신 (표시용, 스레드 체크포인트 상태는 그대로)
+
+        lg_qa_coalesce.get_coalescer().subscribe(inbox.update_readings) 로 연결
+        """
+        item = self._items.get(alert.thread_id)
+        if item is not None:
+            item.payload = {
+                **item.payload,
+                "sensor_data": dict(alert.sensor_data),
+                "timestamp": format_timestamp(alert.timestamp),
+                "repeat_count": alert.count,
+            }
+
+    # ----------------------------------------
+    # 조회
+    # ----------------------------------------
+    def get(self, thread_id: str) -> Optional[InboxItem]:
+        return self._items.get(thread_id)
+
+    def by_facility(self, facility_id: str) -> list:
+        """설비 ID 로 대기 항목 조회 (이진 탐색)"""
+        i = bisect.bisect_left(self._by_facility, (facility_id, ""))
+        result = []
+        while i < len(self._by_facility) and self._by_facility[i][0] == facility_id:
+            result.append(self._items[self._by_facility[i][1]])
+            i += 1
+        return result
+
+    def by_prefix(self, prefix: str) -> list:
+        """설비 ID 접두어로 대기 항목 조회 (예: "PLANT-A")"""
+        i = bisect.bisect_left(self._by_facility, (prefix, ""))
+        result = []
+        while i < len(self._by_facility) and self._by_facility[i][0].startswith(prefix):
+            result.append(self._items[self._by_facility[i][1]])
+            i += 1
+        return result
+
+    def select(self, selector: Optional[ApprovalSelector] = None, **criteria) -> list:
+        """조건에 맞는 대기 항목 (결정 기록 전인 항목만, 우선순위 순)
+
+        select(ApprovalSelector(...)) 또는 select(risk_level="HIGH", facility_prefix="PLANT-A")
+        """
+        selector = selector or ApprovalSelector(**criteria)
+        candidates = self.by_prefix(selector.facility_prefix) if selector.facility_prefix else self._items.values()
+        items = [
+            item for item in candidates
+            if item.thread_id not in self._resolved and selector.matches(item)
+        ]
+        items.sort(key=lambda item: (RISK_PRIORITY.get(item.risk_level, _UNKNOWN_PRIORITY), item.received_at, item.seq))
+        return items
+
+    def peek(self, n: int = 10) -> list:
+        """우선순위 상위 n건 (CRITICAL 먼저, 같은 위험도는 오래된 순)
+
+        힙을 바꾸지 않고 루트부터 작은 순으로 따라 내려가며 필요한 만큼만 확인
+        → O((n + 건너뛴 항목 수) log n), 전체 대기 건수와 무관
+        """
+        self._drop_stale()
+        result = []
+        frontier = [(self._queue[0], 0)] if self._queue else []
+        while frontier and len(result) < n:
+            entry, index = heapq.heappop(frontier)
+            if self._is_live(entry):
+                result.append(self._items[entry[3]])
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(self._queue):
+                    heapq.heappush(frontier, (self._queue[child], child))
+        return result
+
+    def counts(self) -> dict:
+        """위험도별 대기 건수"""
+        result: dict = {}
+        for item in self._items.values():
+            result[item.risk_level] = result.get(item.risk_level, 0) + 1
+        return result
+
+    def _is_current(self, entry: tuple) -> bool:
+        item = self._items.get(entry[3])
+        return item is not None and item.seq == entry[2]
+
+    def _is_live(self, entry: tuple) -> bool:
+        # 결정이 기록된 항목은 재개 전까지 힙에 남겨 두되 조회에서는 제외
+        return self._is_current(entry) and entry[3] not in self._resolved
+
+    def _drop_stale(self) -> None:
+        # 삭제되었거나 교체된 항목이 힙 맨 위에 있으면 정리
+        while self._queue and not self._is_current(self._queue[0]):
+            heapq.heappop(self._queue)
+
+    # ----------------------------------------
+    # 결정 / 재개
+    # ----------------------------------------
+    def resolve(self, thread_id: str, decision: dict) -> None:
+        """전문가 결정 기록 (flush 시 재개)"""
+        if thread_id not in self._items:
+            raise KeyError(f"승인 대기 항목 없음: {thread_id}")
+        self._resolved[thread_id] = decision
+        self._notify(ITEM_RESOLVED, self._items[thread_id])
+
+    def resolve_many(self, items: Iterable, decision: dict) -> int:
+        """같은 결정을 여러 항목에 일괄 기록"""
+        count = 0
+        for item in items:
+            self.resolve(getattr(item, "thread_id", item), decision)
+            count += 1
+        return count
+
+    @property
+    def resolved_count(self) -> int:
+        return len(self._resolved)
+
+    async def flush(self, graph, concurrency: int = 32) -> dict:
+        """기록된 결정을 Command(resume=...) 로 일괄 재개
+
+        Returns:
+            thread_id -> 최종 상태 dict 또는 예외
+        """
+        resolved, self._resolved = self._resolved, {}
+        return await self._resume(graph, resolved, concurrency)
+
+    async def resume(self, graph, decisions: dict, concurrency: int = 32) -> dict:
+        """지정한 항목만 즉시 재개 (thread_id -> 결정). 기록해 둔 다른 결정은 그대로 유지
+
+        Returns:
+            thread_id -> 최종 상태 dict 또는 예외
+        """
+        decisions = {thread_id: decision for thread_id, decision in decisions.items() if thread_id in self._items}
+        for thread_id in decisions:
+            self._resolved.pop(thread_id, None)
+        return await self._resume(graph, decisions, concurrency)
+
+    async def bulk_resume(
+        self,
+        graph,
+        decision: dict,
+        selector: Optional[ApprovalSelector] = None,
+        *,
+        concurrency: int = 64,
+        **criteria,
+    ) -> BulkResumeReport:
+        """조건에 맞는 모든 대기 건을 같은 결정으로 동시에 재개
+
+        예: await inbox.bulk_resume(graph, {"approved": True, "comment": "일괄 승인"},
+                                    risk_level="HIGH", facility_prefix="PLANT-A")
+        """
+        start = time.perf_counter()
+        items = self.select(selector, **criteria)
+        resolved = {item.thread_id: decision for item in items}
+        facility_ids = {item.thread_id: item.facility_id for item in items}
+        raw = await self._resume(graph, resolved, concurrency)
+
+        outcomes = {}
+        for thread_id, result in raw.items():
+            if isinstance(result, BaseException):
+                outcome = ResumeOutcome(thread_id, facility_ids[thread_id], RESUME_FAILED, error=result)
+            elif isinstance(result, dict) and "__interrupt__" in result:
+                outcome = ResumeOutcome(thread_id, facility_ids[thread_id], RESUME_INTERRUPTED)
+            else:
+                outcome = ResumeOutcome(
+                    thread_id, facility_ids[thread_id], RESUME_COMPLETED,
+                    final_action=result.get("final_action") if isinstance(result, dict) else None,
+                )
+            outcomes[thread_id] = outcome
+        return BulkResumeReport(outcomes, time.perf_counter() - start)
+
+    async def _resume(self, graph, resolved: dict, concurrency: int) -> dict:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def resume(thread_id: str, decision: dict) -> Any:
+            async with semaphore:
+                return await graph.ainvoke(
+                    Command(resume=decision),
+                    config={"configurable": {"thread_id": thread_id}},
+                )
+
+        # 체크포인터가 지원하면 재개하는 스레드의 쓰기만 모아 한 번에 커밋
+        # (SqliteCheckpointSaver.deferred. 다른 스레드의 커밋 주기는 그대로)
+        deferred = getattr(graph.checkpointer, "deferred", None)
+        thread_ids = list(resolved)
+        with deferred(thread_ids) if deferred is not None else contextlib.nullcontext():
+            outcomes = await asyncio.gather(
+                *(resume(thread_id, resolved[thread_id]) for thread_id in thread_ids),
+                return_exceptions=True,
+            )
+        report = {}
+        for thread_id, outcome in zip(thread_ids, outcomes):
+            report[thread_id] = outcome
+            if isinstance(outcome, BaseException):
+                # 재개 실패 건은 다시 결정할 수 있도록 인박스에 남김
+                continue
+            self._remove(thread_id)
+            if isinstance(outcome, dict) and "__interrupt__" in outcome:
+                # 재개 후 다시 승인이 필요해진 경우 새 항목으로 등록
+                self.add(thread_id, outcome["__interrupt__"][0].value)
+        return report
+
+    def _remove(self, thread_id: str) -> None:
+        item = self._items.pop(thread_id)
+        self._resolved.pop(thread_id, None)
+        self._notify(ITEM_REMOVED, item)
+        i = bisect.bisect_left(self._by_facility, (item.facility_id, thread_id))
+        if i < len(self._by_facility) and self._by_facility[i] == (item.facility_id, thread_id):
+            del self._by_facility[i]
+        # 힙에 남은 처리 완료 항목이 너무 많아지면 재구성
+        if len(self._queue) > 2 * len(self._items) + 64:
+            self._queue = [entry for entry in self._queue if self._is_current(entry)]
+            heapq.heapify(self._queue)
+
+
+async def bulk_resume_pending(
+    graph,
+    decision: dict,
+    selector: Optional[ApprovalSelector] = None,
+    *,
+    concurrency: int = 64,
+    **criteria,
+) -> BulkResumeReport:
+    """체크포인터에 남아 있는 승인 대기 스레드 중 조건에 맞는 건을 일괄 재개
+
+    인박스 없이 (예: 프로세스 재시작 직후) 사용. 체크포인터에 pending_threads()가 필요
+    """
+    inbox = ApprovalInbox()
+    await inbox.arestore(graph, graph.checkpointer.pending_threads())
+    return await inbox.bulk_resume(graph, decision, selector, concurrency=concurrency, **criteria)
@@ -0,0 +1,189 @@
+"""
+센서 텔레메트리 스트리밍 수집
+- 녹화된 텔레메트리(CSV) 또는 로컬 소켓(SCADA 대용)을 async generator로 읽기
+- 설비별로 마이크로 배치(배치 안에서는 설비당 최신 값만 유지)하여 분석 그래프로 전달
+- 모든 단계가 크기 제한 큐로 연결되어 메모리 사용량이 일정
+- speed 배율로 하루치 데이터를 실시간보다 빠르게 재생
+
+CSV 형식 (헤더 필수):
+    timestamp,facility_id,temperature,pressure,vibration,flow_rate,power_consumption
+    2025-02-10T14:30:25,PLANT-A1B2C3D4,72.5,101.3,0.5,150.0,850.0
+
+소켓 형식: 한 줄에 JSON 객체 1개 (CSV와 같은 키)
+"""
+
+import asyncio
+import csv
+import json
+from datetime import datetime
+from typing import AsyncIterator, Iterable, NamedTuple, Optional
+
+from lg_qa_state import SENSOR_FIELDS, SensorReadings
+
+
+TELEMETRY_FIELDS = ("timestamp", "facility_id") + SENSOR_FIELDS
+
+
+# ============================================
+# 1. 측정값 레코드
+# ============================================
+class SensorReading(NamedTuple):
+    facility_id: str
+    timestamp: float  # epoch 초
+    sensor_data: SensorReadings
+
+
+def _parse_timestamp(value) -> float:
+    """epoch 초 또는 ISO 문자열 → epoch 초"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return datetime.fromisoformat(value).timestamp()
+
+
+def _parse_record(record: dict) -> SensorReading:
+    return SensorReading(
+        facility_id=record["facility_id"],
+        timestamp=_parse_timestamp(record["timestamp"]),
+        sensor_data=SensorReadings({
+            name: float(record[name])
+            for name in SENSOR_FIELDS
+            if record.get(name) not in (None, "")
+        }),
+    )
+
+
+# ============================================
+# 2. 소스 (async generator)
+# ============================================
+async def _replay(records: Iterable[dict], speed: Optional[float]) -> AsyncIterator[SensorReading]:
+    """레코드를 기록된 시간 간격 / speed 배율로 재생 (speed=None이면 최대 속도)"""
+    first_ts = None
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    for i, record in enumerate(records):
+        reading = _parse_record(record)
+        if speed:
+            if first_ts is None:
+                first_ts = reading.timestamp
+            delay = (reading.timestamp - first_ts) / speed - (loop.time() - start)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        elif i % 256 == 0:
+            # 최대 속도 재생에서도 이벤트 루프에 주기적으로 양보
+            await asyncio.sleep(0)
+        yield reading
+
+
+async def read_csv_telemetry(path: str, speed: Optional[float] = None) -> AsyncIterator[SensorReading]:
+    """녹화된 CSV 텔레메트리 재생 (파일은 한 줄씩 읽어 메모리 일정)"""
+    with open(path, newline="", encoding="utf-8") as f:
+        async for reading in _replay(csv.DictReader(f), speed):
+            yield reading
+
+
+async def read_socket_telemetry(host: str = "127.0.0.1", port: int = 9020) -> AsyncIterator[SensorReading]:
+    """로컬 소켓(SCADA 대용)에서 줄 단위 JSON 텔레메트리 수신"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while line := await reader.readline():
+            if line.strip():
+                yield _parse_record(json.loads(line))
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+def write_csv_telemetry(path: str, readings: Iterable[SensorReading]) -> int:
+    """측정값을 재생 가능한 CSV로 기록"""
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(TELEMETRY_FIELDS)
+        for reading in readings:
+            writer.writerow(
+                [reading.timestamp, reading.facility_id]
+                + [reading.sensor_data.get(name, "") for name in SENSOR_FIELDS]
+            )
+            count += 1
+    return count
+
+
+# ============================================
+# 3. 마이크로 배치
+# ============================================
+async def micro_batches(
+    source: AsyncIterator[SensorReading],
+    max_batch: int = 512,
+    max_delay: float = 0.05,
+    buffer_size: int = 4096,
+) -> AsyncIterator[dict]:
+    """측정값을 facility_id -> 최신 SensorReading 배치로 묶기
+
+    - 배치 안에 설비가 max_batch 개 모이거나 max_delay 초가 지나면 배출
+    - 같은 설비의 측정값이 배치 안에 여러 번 오면 최신 값만 유지
+    - 소스와 배처 사이 큐(buffer_size)가 차면 소스 읽기가 멈춤 (메모리 상한)
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=buffer_size)
+    done = object()
+
+    async def pump() -> None:
+        try:
+            async for reading in source:
+                await queue.put(reading)
+        finally:
+            await queue.put(done)
+
+    pump_task = asyncio.create_task(pump())
+    loop = asyncio.get_running_loop()
+    try:
+        finished = False
+        while not finished:
+            batch: dict = {}
+            item = await queue.get()
+            deadline = loop.time() + max_delay
+            while True:
+                if item is done:
+                    finished = True
+                    break
+                batch[item.facility_id] = item
+                if len(batch) >= max_batch:
+                    break
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            if batch:
+                yield batch
+        await pump_task
+    finally:
+        pump_task.cancel()
+
+
+# ============================================
+# 4. 그래프로 전달
+# ============================================
+async def ingest(source: AsyncIterator[SensorReading], runner, sampler=None, **batch_options) -> int:
+    """마이크로 배치를 FleetRunner 로 제출 (러너 큐가 차면 수집도 대기)
+
+    sampler: lg_qa_polling.AdaptiveSampler. 설비별 주기가 안 된 측정값은 제출하지 않음
+        (임계값 접근 구간의 측정값은 주기와 무관하게 제출)
+
+    Returns:
+        제출한 모니터링 사이클 수
+    """
+    submitted = 0
+    async for batch in micro_batches(source, **batch_options):
+        for reading in batch.values():
+            if sampler is not None and not sampler.admit(reading.facility_id, reading.timestamp, reading.sensor_data):
+                continue
+            await runner.submit(
+                reading.facility_id,
+                reading.sensor_data,
+                timestamp=reading.timestamp,
+            )
+            submitted += 1
+    return submitted
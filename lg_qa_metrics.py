@@ -0,0 +1,303 @@
+"""
+그래프 노드별 프로파일링 + Prometheus 텍스트 형식 메트릭
+- create_facility_monitor_graph(node_wrapper=...)로 모든 노드를 감싸 측정
+  · 노드 실행 시간 (결과별: ok / interrupt / resumed / error)
+  · 노드 입력 상태 크기 (체크포인터 직렬화 기준 바이트)
+  · 노드 실행 중 메모리 할당 (trace_allocations=True 일 때, tracemalloc 기준)
+- 체크포인터 쓰기/읽기 시간 (put / put_writes / put_writes_interrupt / get_tuple)
+- 로컬 HTTP 엔드포인트(/metrics) 또는 파일로 내보내기
+
+비활성 상태(기본)에서는 노드를 감싸지 않으므로 추가 비용이 없음.
+사용 예:
+    enable_profiling(port=9464)          # 이후 get_facility_monitor_graph()가 계측 그래프 반환
+    curl http://127.0.0.1:9464/metrics
+"""
+
+import functools
+import os
+import threading
+import time
+import tracemalloc
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Callable, Optional
+
+# langgraph / http.server 는 프로파일러를 실제로 만들거나 엔드포인트를 열 때 가져옴
+# (lg_app_qa는 get_profiler()만 확인하므로 비활성 상태에서는 import 비용 없음)
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+
+# 초 단위
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+# 바이트 단위
+SIZE_BUCKETS = (256, 512, 1024, 2048, 4096, 8192, 16384, 65536, 262144, 1048576)
+
+
+# ============================================
+# 1. 히스토그램
+# ============================================
+class Histogram:
+    """누적 버킷 히스토그램 (Prometheus histogram 과 같은 의미)"""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: tuple):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # 마지막 칸 = +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """버킷 상한 기준 근사 분위수"""
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= target and count:
+                return bound
+        return float("inf")
+
+
+def _format_labels(labels: tuple) -> str:
+    return ",".join(f'{key}="{value}"' for key, value in labels)
+
+
+# ============================================
+# 2. 프로파일러
+# ============================================
+class GraphProfiler:
+    """노드/체크포인터 계측기
+
+    Args:
+        trace_allocations: 노드별 메모리 할당 측정 (tracemalloc 사용, 자체 비용이 큼).
+            tracemalloc은 프로세스 전역이므로 노드가 동시에 실행되면 근사값
+        measure_state: 노드 입력 상태 크기 측정 (상태를 한 번 더 직렬화)
+        serde: 상태 크기 측정용 직렬화기 (기본: 설비 그래프 체크포인터와 같은 CompactSerializer,
+            create_facility_monitor_graph가 체크포인터 직렬화기를 이 형식으로 맞춤)
+    """
+
+    METRICS = {
+        "qa_node_seconds": ("histogram", "노드 실행 시간(초)", LATENCY_BUCKETS),
+        "qa_node_state_bytes": ("histogram", "노드 입력 상태 직렬화 크기(바이트)", SIZE_BUCKETS),
+        "qa_node_alloc_bytes": ("histogram", "노드 실행 중 최대 메모리 할당(바이트)", SIZE_BUCKETS),
+        "qa_checkpoint_seconds": ("histogram", "체크포인터 호출 시간(초)", LATENCY_BUCKETS),
+    }
+
+    def __init__(self, trace_allocations: bool = False, measure_state: bool = True, serde=None):
+        from lg_qa_state import CompactSerializer
+
+        self.trace_allocations = trace_allocations
+        self.measure_state = measure_state
+        self.serde = serde or CompactSerializer()
+        self._histograms: dict = {}
+        self._lock = threading.Lock()
+        self._interrupted: set = set()
+        self._server: Optional["ThreadingHTTPServer"] = None
+        self._patched: list = []  # (saver, 메서드 이름, 원래 인스턴스 속성)
+        self._started_tracing = trace_allocations and not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+
+    def observe(self, metric: str, labels: tuple, value: float) -> None:
+        key = (metric, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.METRICS[metric][2])
+            histogram.observe(value)
+
+    def histogram(self, metric: str, **labels) -> Optional[Histogram]:
+        return self._histograms.get((metric, tuple(sorted(labels.items()))))
+
+    # --------------------------------------------
+    # 노드 계측
+    # --------------------------------------------
+    def wrap_node(self, name: str, fn: Callable) -> Callable:
+        """create_facility_monitor_graph(node_wrapper=...) 용"""
+        from langgraph.errors import GraphInterrupt
+
+        @functools.wraps(fn)
+        def profiled(*args, **kwargs):
+            if self.measure_state and args:
+                self.observe("qa_node_state_bytes", (("node", name),),
+                             len(self.serde.dumps_typed(args[0])[1]))
+            if self.trace_allocations:
+                tracemalloc.reset_peak()
+                base = tracemalloc.get_traced_memory()[0]
+            outcome = "ok"
+            start = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+                thread_id = _thread_id(kwargs.get("config"))
+                if thread_id is not None and thread_id in self._interrupted:
+                    # interrupt로 중단됐던 노드가 재개되어 완료됨
+                    self._interrupted.discard(thread_id)
+                    outcome = "resumed"
+                return result
+            except GraphInterrupt:
+                outcome = "interrupt"
+                thread_id = _thread_id(kwargs.get("config"))
+                if thread_id is not None:
+                    self._interrupted.add(thread_id)
+                raise
+            except Exception:
+                outcome = "error"
+                raise
+            finally:
+                self.observe("qa_node_seconds", (("node", name), ("outcome", outcome)),
+                             time.perf_counter() - start)
+                if self.trace_allocations:
+                    self.observe("qa_node_alloc_bytes", (("node", name),),
+                                 max(tracemalloc.get_traced_memory()[1] - base, 0))
+
+        return profiled
+
+    # --------------------------------------------
+    # 체크포인터 계측
+    # --------------------------------------------
+    def instrument_saver(self, saver) -> None:
+        """체크포인터 put / put_writes / get_tuple 시간 측정 (같은 인스턴스에 한 번만 적용)"""
+        from langgraph.checkpoint.base import INTERRUPT
+
+        if getattr(saver, "_qa_profiler", None) is self:
+            return
+        saver._qa_profiler = self
+
+        for method in ("put", "put_writes", "get_tuple"):
+            original = getattr(saver, method)
+            self._patched.append((saver, method, saver.__dict__.get(method)))
+
+            def timed(*args, _original=original, _method=method, **kwargs):
+                op = _method
+                if _method == "put_writes":
+                    writes = args[1] if len(args) > 1 else kwargs.get("writes", ())
+                    if any(channel == INTERRUPT for channel, _ in writes):
+                        # interrupt 값 직렬화/저장
+                        op = "put_writes_interrupt"
+                start = time.perf_counter()
+                try:
+                    return _original(*args, **kwargs)
+                finally:
+                    self.observe("qa_checkpoint_seconds", (("op", op),), time.perf_counter() - start)
+
+            setattr(saver, method, timed)
+
+    # --------------------------------------------
+    # 내보내기
+    # --------------------------------------------
+    def render(self) -> str:
+        """Prometheus 텍스트 노출 형식"""
+        with self._lock:
+            items = sorted(
+                (key, list(h.counts), h.sum, h.count) for key, h in self._histograms.items()
+            )
+        lines = []
+        described = set()
+        for (metric, labels), counts, total, count in items:
+            kind, description, bounds = self.METRICS[metric]
+            if metric not in described:
+                described.add(metric)
+                lines.append(f"# HELP {metric} {description}")
+                lines.append(f"# TYPE {metric} {kind}")
+            label_text = _format_labels(labels)
+            prefix = f"{label_text}," if label_text else ""
+            cumulative = 0
+            for bound, bucket in zip(bounds, counts):
+                cumulative += bucket
+                lines.append(f'{metric}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{{prefix}le="+Inf"}} {count}')
+            lines.append(f"{metric}_sum{{{label_text}}} {total:.9g}")
+            lines.append(f"{metric}_count{{{label_text}}} {count}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str) -> None:
+        """파일로 기록 (node_exporter textfile collector 등에서 읽을 수 있도록 원자적 교체)"""
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(tmp, path)
+
+    def serve(self, port: int = 9464, host: str = "127.0.0.1") -> "ThreadingHTTPServer":
+        """백그라운드 스레드에서 GET /metrics 제공"""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        profiler = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = profiler.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=self._server.serve_forever, name="qa-metrics", daemon=True).start()
+        return self._server
+
+    def close(self) -> None:
+        """엔드포인트 종료 + 체크포인터 계측 해제 + (직접 시작한 경우) tracemalloc 중지"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        for saver, method, previous in reversed(self._patched):
+            if previous is None:
+                saver.__dict__.pop(method, None)
+            else:
+                setattr(saver, method, previous)
+        for saver in {id(saver): saver for saver, _, _ in self._patched}.values():
+            saver._qa_profiler = None
+        self._patched.clear()
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+
+def _thread_id(config) -> Optional[str]:
+    if not config:
+        return None
+    return config.get("configurable", {}).get("thread_id")
+
+
+# ============================================
+# 3. 프로세스 공용 프로파일러
+# ============================================
+_profiler: Optional[GraphProfiler] = None
+
+
+def get_profiler() -> Optional[GraphProfiler]:
+    """활성화된 공용 프로파일러 (비활성이면 None)"""
+    return _profiler
+
+
+def enable_profiling(port: Optional[int] = None, host: str = "127.0.0.1", **options) -> GraphProfiler:
+    """공용 프로파일러 활성화 (port를 주면 /metrics 엔드포인트도 시작)
+
+    get_facility_monitor_graph()는 다음 호출 시 계측된 그래프로 다시 컴파일함
+    """
+    global _profiler
+    disable_profiling()
+    _profiler = GraphProfiler(**options)
+    if port is not None:
+        _profiler.serve(port, host)
+    return _profiler
+
+
+def disable_profiling() -> None:
+    global _profiler
+    if _profiler is not None:
+        _profiler.close()
+    _profiler = None
@@ -0,0 +1,273 @@
+"""
+설비별 적응형 샘플링 주기
+- 분석 노드(analyze_sensor_data)의 판정 결과로 설비마다 다음 샘플 시각을 정함
+  · HIGH / CRITICAL: 최소 주기
+  · LOW 이지만 온도/압력/진동이 HIGH 임계값의 approach_ratio 이상: 임계값에 가까울수록 짧게
+  · 상승 추세로 HIGH 도달이 예상되면 도달 전 eta_samples 회 이상 샘플하도록 단축
+  · 안정 LOW 가 stable_after 회 연속: 주기를 backoff 배씩 늘림 (max_interval 까지)
+- 시각은 측정 시각(epoch 초) 기준 → 녹화 데이터 재생에서도 같은 결과
+- 수신 스트림(lg_qa_ingest.ingest(sampler=...)): 주기가 안 된 측정값은 그래프 실행 없이 건너뜀
+  단, 측정값 자체가 임계값 접근 구간이면 주기와 무관하게 바로 통과 → 감지 지연 없음
+- 요청형 수집(poll_facilities): 주기가 된 설비만 읽어서 제출
+
+기본은 비활성(get_adaptive_sampler() = None). configure_adaptive_sampler()로 켬
+
+사용 예:
+    sampler = configure_adaptive_sampler(base_interval=5.0)
+    await ingest(read_socket_telemetry(), runner, sampler=sampler)
+    sampler.snapshot()["PLANT-X"]   # {"interval": 40.0, "next_due": ..., "reason": "stable", ...}
+"""
+
+import asyncio
+import threading
+import time
+from typing import Awaitable, Callable, Iterable, Optional, Union
+
+from lg_qa_state import RiskLevel
+from lg_qa_thresholds import Thresholds, get_registry
+from lg_qa_trend import TREND_CHANNELS, get_trend_tracker
+
+
+# 주기 결정 사유
+REASON_NEW = "new"
+REASON_RISK = "risk"  # HIGH / CRITICAL
+REASON_APPROACH = "approach"  # 임계값 접근
+REASON_TREND = "trend"  # 상승 추세로 임계값 도달 예상
+REASON_STEADY = "steady"  # LOW, 기본 주기
+REASON_STABLE = "stable"  # 안정 LOW, 주기 증가 중
+
+
+def proximity(thresholds: Thresholds, sensor_data) -> float:
+    """HIGH 임계값 대비 비율의 최대값 (1 이상 = 임계값 도달)
+
+    임계값이 0인 채널은 규칙 판정(value >= 임계값)과 같이 값이 0 이상이면 도달(1.0)로 봄
+    """
+    ratio = 0.0
+    for channel, threshold_field in TREND_CHANNELS.items():
+        value = sensor_data.get(channel)
+        if value is None:
+            continue
+        high = getattr(thresholds, threshold_field)
+        if high > 0:
+            ratio = max(ratio, value / high)
+        elif value >= high:
+            ratio = max(ratio, 1.0)
+    return ratio
+
+
+class PollState:
+    """설비 1대의 샘플링 상태"""
+
+    __slots__ = ("interval", "next_due", "stable", "reason", "last_sample")
+
+    def __init__(self, interval: float, timestamp: float):
+        self.interval = interval
+        self.next_due = timestamp
+        self.stable = 0  # 연속 안정 LOW 판정 수
+        self.reason = REASON_NEW
+        self.last_sample = timestamp
+
+
+# ============================================
+# 1. 적응형 샘플러
+# ============================================
+class AdaptiveSampler:
+    """설비별 샘플링 주기 관리
+
+    Args:
+        base_interval: 기본 주기(초). 처음 보는 설비와 안정 판정 전 LOW 설비
+        min_interval: 최소 주기(초). HIGH/CRITICAL 및 임계값 도달 직전
+        max_interval: 최대 주기(초). 안정 LOW 설비의 backoff 상한
+        backoff: 안정 LOW 판정마다 곱할 배율
+        stable_after: backoff 를 시작하기 전 필요한 연속 안정 LOW 판정 수
+        approach_ratio: 측정값이 HIGH 임계값의 이 비율 이상이면 주기 단축 + 수신 즉시 통과
+            (기본 운전점이 임계값의 90% 안팎인 설비가 있으므로 추세 판정기의 0.8보다 높게)
+        eta_samples: 추세상 임계값 도달 예상 시간 동안 최소 샘플 수
+            (예상 시간이 추세 판정기의 horizon 이내일 때만 적용 → 잡음 기울기로 주기가 줄지 않음)
+    """
+
+    def __init__(
+        self,
+        base_interval: float = 5.0,
+        min_interval: float = 1.0,
+        max_interval: float = 300.0,
+        backoff: float = 2.0,
+        stable_after: int = 3,
+        approach_ratio: float = 0.95,
+        eta_samples: int = 10,
+    ):
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.stable_after = stable_after
+        self.approach_ratio = approach_ratio
+        self.eta_samples = eta_samples
+        self.stats = {"admitted": 0, "skipped": 0, "forced": 0, "updated": 0}
+        self._states: dict = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def state(self, facility_id: str) -> Optional[PollState]:
+        return self._states.get(facility_id)
+
+    def interval(self, facility_id: str) -> float:
+        """현재 샘플링 주기(초) (처음 보는 설비는 base_interval)"""
+        state = self._states.get(facility_id)
+        return self.base_interval if state is None else state.interval
+
+    def forget(self, facility_id: str) -> None:
+        self._states.pop(facility_id, None)
+
+    # ----------------------------------------
+    # 분석 결과 반영 (analyze_sensor_data 에서 호출)
+    # ----------------------------------------
+    def update(
+        self,
+        facility_id: str,
+        timestamp: float,
+        sensor_data,
+        risk_level: RiskLevel,
+        thresholds: Thresholds,
+    ) -> float:
+        """판정 결과로 다음 주기 결정 후 반환"""
+        with self._lock:
+            state = self._states.get(facility_id)
+            if state is None:
+                state = self._states[facility_id] = PollState(self.base_interval, timestamp)
+            ratio = proximity(thresholds, sensor_data)
+
+            if risk_level != RiskLevel.LOW or ratio >= 1.0:
+                state.interval, state.stable, state.reason = self.min_interval, 0, REASON_RISK
+            elif ratio >= self.approach_ratio:
+                # approach_ratio -> base_interval, 임계값(1.0) -> min_interval 로 선형 단축
+                closeness = (ratio - self.approach_ratio) / (1.0 - self.approach_ratio)
+                state.interval = self.base_interval - (self.base_interval - self.min_interval) * closeness
+                state.stable, state.reason = 0, REASON_APPROACH
+            else:
+                state.stable += 1
+                if state.stable > self.stable_after:
+                    state.interval = min(max(state.interval, self.base_interval) * self.backoff, self.max_interval)
+                    state.reason = REASON_STABLE
+                else:
+                    state.interval, state.reason = self.base_interval, REASON_STEADY
+
+            tracker = get_trend_tracker()
+            eta = None if state.reason == REASON_RISK else tracker.time_to_high(facility_id, thresholds)
+            if eta is not None and eta <= tracker.horizon and eta / self.eta_samples < state.interval:
+                state.interval = max(eta / self.eta_samples, self.min_interval)
+                state.stable, state.reason = 0, REASON_TREND
+
+            state.last_sample = timestamp
+            state.next_due = timestamp + state.interval
+            self.stats["updated"] += 1
+            return state.interval
+
+    # ----------------------------------------
+    # 샘플 여부
+    # ----------------------------------------
+    def admit(self, facility_id: str, timestamp: float, sensor_data=None) -> bool:
+        """수신한 측정값을 분석할지 여부
+
+        주기가 되었거나, 측정값이 임계값 접근 구간(approach_ratio 이상)이면 True.
+        통과시킨 측정값의 분석이 끝나기 전에 같은 설비 측정값이 또 오면 건너뛰도록
+        다음 샘플 시각을 현재 주기만큼 미리 미뤄 둠 (분석이 끝나면 update()가 다시 정함)
+        """
+        state = self._states.get(facility_id)
+        if state is None:
+            with self._lock:
+                state = self._states.setdefault(facility_id, PollState(self.base_interval, timestamp))
+        elif timestamp < state.next_due:
+            if sensor_data is None or proximity(get_registry().get(facility_id), sensor_data) < self.approach_ratio:
+                self.stats["skipped"] += 1
+                return False
+            self.stats["forced"] += 1
+        state.next_due = timestamp + state.interval
+        self.stats["admitted"] += 1
+        return True
+
+    def due(self, facility_ids: Iterable[str], now: Optional[float] = None) -> list:
+        """요청형 수집에서 지금 읽어야 할 설비 목록"""
+        now = time.time() if now is None else now
+        return [
+            facility_id for facility_id in facility_ids
+            if (state := self._states.get(facility_id)) is None or state.next_due <= now
+        ]
+
+    def snapshot(self) -> dict:
+        """설비별 주기 상태 (facility_id -> dict)"""
+        return {
+            facility_id: {
+                "interval": state.interval,
+                "next_due": state.next_due,
+                "last_sample": state.last_sample,
+                "stable": state.stable,
+                "reason": state.reason,
+            }
+            for facility_id, state in list(self._states.items())
+        }
+
+
+# ============================================
+# 2. 요청형 수집 루프
+# ============================================
+async def poll_facilities(
+    facility_ids: Iterable[str],
+    read: Callable[[str], Union[dict, Awaitable[dict]]],
+    runner,
+    sampler: AdaptiveSampler,
+    stop: Optional[asyncio.Event] = None,
+    tick: Optional[float] = None,
+) -> int:
+    """주기가 된 설비만 read(facility_id)로 읽어 FleetRunner 로 제출 (stop 이 set 될 때까지)
+
+    tick(기본 min_interval)마다 due()로 확인. 분석이 끝나면 update()가 다음 샘플 시각을
+    다시 정하므로 주기가 줄어든 설비도 다음 tick 에 반영됨
+
+    Returns:
+        제출한 모니터링 사이클 수
+    """
+    facility_ids = list(facility_ids)
+    stop = stop or asyncio.Event()
+    tick = tick or sampler.min_interval
+    submitted = 0
+    while not stop.is_set():
+        now = time.time()
+        for facility_id in sampler.due(facility_ids, now):
+            sensor_data = read(facility_id)
+            if asyncio.iscoroutine(sensor_data):
+                sensor_data = await sensor_data
+            sampler.admit(facility_id, now)
+            await runner.submit(facility_id, sensor_data, timestamp=now)
+            submitted += 1
+        try:
+            await asyncio.wait_for(stop.wait(), tick)
+        except asyncio.TimeoutError:
+            pass
+    return submitted
+
+
+# ============================================
+# 3. 공용 샘플러
+# ============================================
+_sampler: Optional[AdaptiveSampler] = None
+
+
+def get_adaptive_sampler() -> Optional[AdaptiveSampler]:
+    """설정된 공용 샘플러 (없으면 None → 고정 주기, 분석 노드가 주기를 갱신하지 않음)"""
+    return _sampler
+
+
+def configure_adaptive_sampler(**options) -> AdaptiveSampler:
+    """공용 샘플러를 새 AdaptiveSampler로 교체"""
+    global _sampler
+    _sampler = AdaptiveSampler(**options)
+    return _sampler
+
+
+def set_adaptive_sampler(sampler: Optional[AdaptiveSampler]) -> None:
+    """공용 샘플러 직접 지정 (None이면 비활성화)"""
+    global _sampler
+    _sampler = sampler
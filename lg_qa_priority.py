@@ -0,0 +1,213 @@
+"""
+위험도 우선순위 작업 스케줄러 (FleetRunner 작업 큐 대체)
+- 작업마다 위험도 등급을 정해 기한(제출 시각 + 등급별 허용 대기)을 부여
+  · 직전 사이클 위험도 (결과/interrupt에서 observe)
+  · 추세: 현재 기울기로 horizon 안에 HIGH 임계값 도달 예상 (lg_qa_trend.time_to_high)
+  · 이번 측정값 자체의 임계값 판정 (evaluate_rules, 그래프 실행 전 µs 단위 사전 분류)
+  · 승인 재개(Command)는 해당 설비의 승인 대기 위험도
+- CRITICAL / HIGH 는 기한 순(EDF) 힙, LOW 는 FIFO (기한 간격이 같으므로 FIFO = 기한 순)
+  → 정상 설비 수천 건이 밀려 있어도 위험 설비가 먼저 실행됨
+- LOW 보장: LOW 선두가 기한을 넘겼으면 위험 작업 urgent_burst 건마다 LOW 1건 실행
+  → 위험 작업이 계속 들어와도 LOW 는 처리량의 1/(urgent_burst+1) 이상을 받음
+- 과부하: max_queued 는 LOW 에만 적용 (위험 작업은 제출이 막히지 않음)
+  위험 작업 대기 시간 <= (앞선 위험 작업 수 + LOW 보장분) / 처리량 → 정상 부하량과 무관
+
+사용 예:
+    async with FleetRunner(scheduler=RiskScheduler()) as runner:
+        await runner.submit(facility_id, sensor_data)
+"""
+
+import asyncio
+import heapq
+import time
+from collections import deque
+from typing import Any, Optional
+
+from lg_app_qa import evaluate_rules
+from lg_qa_state import RiskLevel, SensorReadings
+from lg_qa_thresholds import get_registry
+from lg_qa_trend import get_trend_tracker
+
+
+# 위험도 -> 제출 후 실행 시작까지 허용 대기(초)
+DEFAULT_DEADLINES = {
+    RiskLevel.CRITICAL.value: 0.25,
+    RiskLevel.HIGH.value: 1.0,
+    RiskLevel.LOW.value: 30.0,
+}
+
+_URGENT = (RiskLevel.CRITICAL, RiskLevel.HIGH)
+
+
+class _Entry:
+    __slots__ = ("deadline", "seq", "risk_level", "enqueued", "job")
+
+    def __init__(self, deadline: float, seq: int, risk_level: RiskLevel, enqueued: float, job: Any):
+        self.deadline = deadline
+        self.seq = seq
+        self.risk_level = risk_level
+        self.enqueued = enqueued
+        self.job = job
+
+    def __lt__(self, other: "_Entry") -> bool:
+        return (self.deadline, self.seq) < (other.deadline, other.seq)
+
+
+# ============================================
+# 1. 스케줄러
+# ============================================
+class RiskScheduler:
+    """asyncio.Queue 와 같은 put / get / task_done / join 을 제공하는 위험도 기한 큐
+
+    Args:
+        deadlines: 위험도 -> 허용 대기(초) (기본 DEFAULT_DEADLINES)
+        max_queued: LOW 작업 대기 한도 (가득 차면 LOW put()이 대기, None/0 = 무제한)
+        urgent_burst: 기한이 지난 LOW 가 있을 때 LOW 1건 전에 연속 실행할 위험 작업 수
+        horizon: 추세상 이 시간(초) 안에 HIGH 임계값 도달이 예상되면 HIGH 로 분류
+        classify_readings: 이번 측정값의 임계값 판정을 분류에 사용할지 여부
+    """
+
+    def __init__(
+        self,
+        deadlines: Optional[dict] = None,
+        max_queued: Optional[int] = None,
+        urgent_burst: int = 8,
+        horizon: float = 600.0,
+        classify_readings: bool = True,
+    ):
+        self.deadlines = {**DEFAULT_DEADLINES, **(deadlines or {})}
+        self.maxsize = max_queued or 0
+        self.urgent_burst = urgent_burst
+        self.horizon = horizon
+        self.classify_readings = classify_readings
+        self.stats = {
+            level.value: {"queued": 0, "dispatched": 0, "late": 0, "max_wait": 0.0, "total_wait": 0.0}
+            for level in RiskLevel
+        }
+        self._risk: dict = {}  # facility_id -> 직전 사이클 위험도
+        self._urgent: list = []  # _Entry 힙 (기한 순)
+        self._low: deque = deque()
+        self._streak = 0  # LOW 없이 연속 실행한 위험 작업 수
+        self._seq = 0
+        self._unfinished = 0
+        self._lock = asyncio.Lock()
+        self._not_empty = asyncio.Condition(self._lock)
+        self._not_full = asyncio.Condition(self._lock)
+        self._finished = asyncio.Event()
+        self._finished.set()
+
+    # ----------------------------------------
+    # 분류
+    # ----------------------------------------
+    def observe(self, facility_id: str, risk_level: Any) -> None:
+        """사이클 결과 / interrupt 의 위험도 기록 (다음 작업 분류에 사용)"""
+        if facility_id and risk_level is not None:
+            self._risk[facility_id] = RiskLevel(str(risk_level))
+
+    def forget(self, facility_id: str) -> None:
+        self._risk.pop(facility_id, None)
+
+    def classify(self, facility_id: str, payload: Any) -> RiskLevel:
+        """작업 위험도 = max(직전 위험도, 추세, 이번 측정값)"""
+        risk_level = self._risk.get(facility_id, RiskLevel.LOW)
+        if risk_level == RiskLevel.CRITICAL or not isinstance(payload, dict) or not facility_id:
+            # 승인 재개(Command)는 직전 위험도(= 승인 대기 위험도) 그대로
+            return risk_level
+        thresholds = get_registry().get(facility_id)
+        if self.classify_readings and payload.get("sensor_data"):
+            sensor_data = SensorReadings.coerce(payload["sensor_data"])
+            verdict = evaluate_rules(
+                thresholds,
+                sensor_data.get("temperature", 0),
+                sensor_data.get("pressure", 0),
+                sensor_data.get("vibration", 0),
+            )[2][0]
+            if verdict.code > risk_level.code:
+                risk_level = verdict
+        if risk_level == RiskLevel.LOW:
+            eta = get_trend_tracker().time_to_high(facility_id, thresholds)
+            if eta is not None and eta <= self.horizon:
+                risk_level = RiskLevel.HIGH
+        return risk_level
+
+    # ----------------------------------------
+    # 큐 인터페이스 (FleetRunner.jobs)
+    # ----------------------------------------
+    def qsize(self) -> int:
+        return len(self._urgent) + len(self._low)
+
+    def empty(self) -> bool:
+        return not self._urgent and not self._low
+
+    def full(self) -> bool:
+        """LOW 대기 한도 도달 여부 (위험 작업은 한도와 무관하게 추가됨)"""
+        return self.maxsize > 0 and len(self._low) >= self.maxsize
+
+    async def put(self, job: Any) -> None:
+        """FleetJob 추가 (job.facility_id, job.input 으로 분류). LOW 는 한도가 차면 대기"""
+        risk_level = self.classify(job.facility_id, job.input)
+        async with self._lock:
+            if risk_level not in _URGENT:
+                await self._not_full.wait_for(lambda: not self.full())
+            self._push(risk_level, job)
+            self._not_empty.notify()
+
+    def _push(self, risk_level: RiskLevel, job: Any) -> None:
+        now = time.monotonic()
+        self._seq += 1
+        entry = _Entry(now + self.deadlines[risk_level.value], self._seq, risk_level, now, job)
+        if risk_level in _URGENT:
+            heapq.heappush(self._urgent, entry)
+        else:
+            self._low.append(entry)
+        self._unfinished += 1
+        self._finished.clear()
+        self.stats[risk_level.value]["queued"] += 1
+
+    async def get(self) -> Any:
+        async with self._lock:
+            await self._not_empty.wait_for(lambda: not self.empty())
+            entry = self._pop(time.monotonic())
+            self._not_full.notify()
+        return entry.job
+
+    def _pop(self, now: float) -> _Entry:
+        take_low = not self._urgent or (
+            self._low and self._low[0].deadline <= now and self._streak >= self.urgent_burst
+        )
+        if take_low:
+            entry = self._low.popleft()
+            self._streak = 0
+        else:
+            entry = heapq.heappop(self._urgent)
+            self._streak += 1 if self._low else 0
+        wait = now - entry.enqueued
+        stats = self.stats[entry.risk_level.value]
+        stats["dispatched"] += 1
+        stats["total_wait"] += wait
+        if wait > stats["max_wait"]:
+            stats["max_wait"] = wait
+        if now > entry.deadline:
+            stats["late"] += 1
+        return entry
+
+    def task_done(self) -> None:
+        self._unfinished -= 1
+        if self._unfinished <= 0:
+            self._finished.set()
+
+    async def join(self) -> None:
+        await self._finished.wait()
+
+    def snapshot(self) -> dict:
+        """위험도별 대기 건수 / 실행 건수 / 기한 초과 / 대기 시간(초)"""
+        return {
+            level: {
+                "waiting": stats["queued"] - stats["dispatched"],
+                "dispatched": stats["dispatched"],
+                "late": stats["late"],
+                "max_wait": stats["max_wait"],
+                "mean_wait": stats["total_wait"] / stats["dispatched"] if stats["dispatched"] else 0.0,
+            }
+            for level, stats in self.stats.items()
+        }
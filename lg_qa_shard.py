@@ -0,0 +1,381 @@
+"""
+설비 모니터링 그래프 멀티프로세스 샤딩 실행
+- facility_id 해시로 설비를 워커 프로세스에 고정 배정 (같은 설비 = 항상 같은 워커)
+  → 설비별 추세 윈도우/경보 병합 상태가 워커 안에서 그대로 유지됨
+- 워커마다 자체 컴파일 그래프 + 체크포인터 샤드(shard-N.db)를 소유 → GIL 경쟁 없음
+- 코디네이터는 작업을 샤드별로 모아 배치 단위로 전달하고(IPC 왕복 감소),
+  결과/승인 대기(interrupt)를 수집 스레드에서 받아 FleetResult / PendingApproval 로 전달
+- 승인 재개는 해당 스레드를 가진 샤드로 라우팅. 워커 재시작 시 샤드 DB의
+  승인 대기 스레드를 다시 알려 코디네이터 재시작 후에도 재개 가능
+- 결과는 워커마다 별도 파이프로 받음 (공유 큐는 죽은 워커가 쓰기 락을 쥔 채 끝나면 전체가 멈춤)
+  실행 중 워커가 죽으면 그 파이프의 EOF로 감지해, 보낸 결과를 모두 처리한 뒤
+  그 샤드의 남은 작업을 ShardError로 실패 처리 (이후 그 샤드로 가는 작업도 즉시 실패)
+
+사용 예:
+    with ShardedExecutor(workers=8, checkpoint_dir="shards") as executor:
+        for facility_id, sensor_data in readings.items():
+            executor.submit(facility_id, sensor_data)
+        executor.join()
+        while not executor.approvals.empty():
+            pending = executor.approvals.get_nowait()
+            executor.resume(pending.thread_id, decision)
+        executor.join()
+"""
+
+import contextlib
+import multiprocessing
+import multiprocessing.connection
+import os
+import queue
+import threading
+import time
+import uuid
+import zlib
+from collections import deque
+from typing import Callable, Optional
+
+from lg_qa_events import ERROR
+from lg_qa_fleet import FleetResult, PendingApproval
+
+
+# 워커 -> 코디네이터 메시지 종류
+RESULT_DONE = "done"
+RESULT_INTERRUPT = "interrupt"
+RESULT_ERROR = "error"
+RESULT_PENDING = "pending"  # 워커 시작 시 샤드 DB에 남아 있던 승인 대기 스레드 (값 = 샤드 번호)
+RESULT_READY = "ready"  # 워커 그래프 준비 완료
+
+
+class ShardError(RuntimeError):
+    """워커에서 발생한 예외 (원래 예외는 프로세스 경계를 넘지 못하므로 repr만 전달)"""
+
+
+def shard_of(facility_id: str, shards: int) -> int:
+    """프로세스/재시작과 무관하게 같은 값을 주는 설비 -> 샤드 번호
+
+    (내장 hash()는 프로세스마다 달라지므로 사용하지 않음)
+    """
+    return zlib.crc32(facility_id.encode("utf-8")) % shards
+
+
+# ============================================
+# 1. 워커 프로세스
+# ============================================
+def _shard_worker(index: int, inbox, outbox, checkpoint_path: Optional[str], event_level: int) -> None:
+    """샤드 1개 실행 루프. 메시지 = [(thread_id, facility_id, 초기 상태 dict 또는 ("resume", 결정)), ...]
+
+    outbox: 이 워커 전용 결과 파이프(Connection, 쓰기 끝)
+    """
+    # 무거운 모듈은 워커 안에서 import (spawn 시 코디네이터 상태와 무관하게 새로 구성)
+    from langgraph.types import Command
+
+    import lg_app_qa
+    from lg_qa_checkpoint import CompactMemorySaver, SqliteCheckpointSaver
+    from lg_qa_events import configure_events
+    from lg_qa_state import CompactSerializer
+
+    # 워커마다 배너를 출력하면 콘솔이 뒤섞이므로 기본은 오류만
+    configure_events(level=event_level)
+    # 완료된 사이클 이력은 남기지 않음 (스레드별 최신 상태 + 대기 중 승인만)
+    if checkpoint_path:
+        saver = SqliteCheckpointSaver(checkpoint_path, serde=CompactSerializer(), compact=True)
+    else:
+        saver = CompactMemorySaver(serde=CompactSerializer())
+    graph = lg_app_qa.create_facility_monitor_graph(saver)
+    if checkpoint_path:
+        pending = [
+            (RESULT_PENDING,
+             graph.get_state({"configurable": {"thread_id": thread_id}}).values.get("facility_id", ""),
+             thread_id, index)
+            for thread_id in saver.pending_threads()
+        ]
+        if pending:
+            outbox.send(pending)
+    outbox.send([(RESULT_READY, "", "", index)])
+
+    try:
+        while True:
+            batch = inbox.get()
+            if batch is None:
+                return
+            results = []
+            for thread_id, facility_id, payload in batch:
+                config = {"configurable": {"thread_id": thread_id}}
+                if isinstance(payload, tuple):
+                    payload = Command(resume=payload[1])
+                try:
+                    result = graph.invoke(payload, config=config)
+                except Exception as e:
+                    results.append((RESULT_ERROR, facility_id, thread_id, repr(e)))
+                    continue
+                if "__interrupt__" in result:
+                    results.append((RESULT_INTERRUPT, facility_id, thread_id, result["__interrupt__"][0].value))
+                else:
+                    final_action = result.get("final_action")
+                    results.append((
+                        RESULT_DONE, facility_id, thread_id, None if final_action is None else str(final_action),
+                    ))
+            outbox.send(results)
+    finally:
+        if hasattr(saver, "close"):
+            saver.close()
+        outbox.close()
+
+
+# ============================================
+# 2. 코디네이터
+# ============================================
+class ShardedExecutor:
+    """facility_id 해시 기반 멀티프로세스 실행기
+
+    Args:
+        workers: 워커 프로세스 수 (기본: CPU 코어 수)
+        checkpoint_dir: 샤드별 SQLite 파일 디렉터리 (None이면 워커별 MemorySaver)
+        batch_size: 샤드별로 모아 한 번에 보낼 작업 수
+        on_result: 사이클 완료/실패 시 호출할 콜백 (FleetResult, 수집 스레드에서 호출)
+        event_level: 워커의 이벤트 기록 레벨 (lg_qa_events)
+        start_method: multiprocessing 시작 방식 (기본 spawn: 코디네이터의 스레드/락 상태를 상속하지 않음)
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        checkpoint_dir: Optional[str] = None,
+        batch_size: int = 64,
+        on_result: Optional[Callable[[FleetResult], None]] = None,
+        event_level: int = ERROR,
+        start_method: str = "spawn",
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.checkpoint_dir = checkpoint_dir
+        self.batch_size = batch_size
+        self.on_result = on_result
+        self.event_level = event_level
+        self.approvals: queue.Queue = queue.Queue()
+        self.stats = {"submitted": 0, "completed": 0, "interrupted": 0, "failed": 0, "restored": 0}
+        self._context = multiprocessing.get_context(start_method)
+        self._buffers: list = [[] for _ in range(self.workers)]
+        self._owner: dict = {}  # 승인 대기 thread_id -> (샤드 번호, facility_id)
+        self._outstanding = 0
+        self._jobs: list = [deque() for _ in range(self.workers)]  # 샤드별 결과를 기다리는 (thread_id, facility_id)
+        self._exited: set = set()  # 종료가 감지된 샤드 번호
+        self._ready = 0
+        self._done = threading.Condition()
+        self._inboxes: list = []
+        self._processes: list = []
+        self._results: dict = {}  # 결과 파이프(읽기 끝) -> 샤드 번호
+        self._collector: Optional[threading.Thread] = None
+
+    # ----------------------------------------
+    # 생명주기
+    # ----------------------------------------
+    def __enter__(self) -> "ShardedExecutor":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def start(self, wait: bool = True) -> None:
+        """워커 기동 (wait=True면 모든 워커의 그래프가 준비될 때까지 대기)"""
+        if self._processes:
+            return
+        if self.checkpoint_dir:
+            os.makedirs(self.checkpoint_dir, exist_ok=True)
+        for index in range(self.workers):
+            inbox = self._context.Queue()
+            reader, writer = self._context.Pipe(duplex=False)
+            path = os.path.join(self.checkpoint_dir, f"shard-{index}.db") if self.checkpoint_dir else None
+            process = self._context.Process(
+                target=_shard_worker,
+                args=(index, inbox, writer, path, self.event_level),
+                name=f"qa-shard-{index}",
+                daemon=True,
+            )
+            process.start()
+            # 쓰기 끝은 워커만 가짐 → 워커가 끝나면 (보낸 결과를 다 읽은 뒤) reader에서 EOF
+            writer.close()
+            self._results[reader] = index
+            self._inboxes.append(inbox)
+            self._processes.append(process)
+        self._collector = threading.Thread(target=self._collect, name="qa-shard-collector", daemon=True)
+        self._collector.start()
+        if wait:
+            with self._done:
+                while not self._done.wait_for(lambda: self._ready == self.workers, timeout=0.5):
+                    dead = [p.name for p in self._processes if not p.is_alive()]
+                    if dead:
+                        raise ShardError(f"워커 기동 실패: {', '.join(dead)}")
+
+    def close(self) -> None:
+        """남은 작업을 보내고 결과를 모두 받은 뒤 워커 종료"""
+        if not self._processes:
+            return
+        self.join()
+        for shard, inbox in enumerate(self._inboxes):
+            if shard in self._exited:
+                # 읽을 워커가 없으므로 종료 시 큐 전송 스레드를 기다리지 않음
+                inbox.cancel_join_thread()
+            else:
+                inbox.put(None)
+        for process in self._processes:
+            process.join()
+        # 워커가 모두 끝나면 결과 파이프가 모두 EOF → 수집 스레드 종료
+        self._collector.join()
+        self._inboxes, self._processes, self._results = [], [], {}
+        self._jobs = [deque() for _ in range(self.workers)]
+        self._exited = set()
+        self._ready = 0
+
+    # ----------------------------------------
+    # 작업 제출
+    # ----------------------------------------
+    def submit(
+        self,
+        facility_id: str,
+        sensor_data: dict,
+        thread_id: Optional[str] = None,
+        timestamp: Optional[float] = None,
+    ) -> str:
+        """모니터링 사이클 1회 제출 (샤드 버퍼가 batch_size에 도달하면 전송)"""
+        thread_id = thread_id or str(uuid.uuid4())
+        initial_state = {
+            # 프로세스 간 전달 비용이 가장 작은 일반 dict로 전송
+            "sensor_data": dict(sensor_data),
+            "facility_id": facility_id,
+            "timestamp": timestamp or time.time(),
+        }
+        self._enqueue(shard_of(facility_id, self.workers), (thread_id, facility_id, initial_state))
+        self.stats["submitted"] += 1
+        return thread_id
+
+    def resume(self, thread_id: str, decision: dict, facility_id: Optional[str] = None) -> None:
+        """승인 대기 스레드를 전문가 결정으로 재개 (해당 샤드로 라우팅)"""
+        owner = self._owner.pop(thread_id, None)
+        if owner is not None:
+            shard, facility_id = owner
+        elif facility_id is not None:
+            shard = shard_of(facility_id, self.workers)
+        else:
+            raise KeyError(f"샤드를 알 수 없는 스레드: {thread_id} (facility_id 필요)")
+        self._enqueue(shard, (thread_id, facility_id, ("resume", decision)))
+
+    def _enqueue(self, shard: int, job: tuple) -> None:
+        with self._done:
+            if shard in self._exited:
+                exited = True
+            else:
+                exited = False
+                self._outstanding += 1
+                self._jobs[shard].append((job[0], job[1]))
+        if exited:
+            self.stats["failed"] += 1
+            self._emit(FleetResult(job[1], job[0], None, error=ShardError(f"워커 종료됨: qa-shard-{shard}")))
+            return
+        buffer = self._buffers[shard]
+        buffer.append(job)
+        if len(buffer) >= self.batch_size:
+            self._send(shard)
+
+    def _send(self, shard: int) -> None:
+        batch, self._buffers[shard] = self._buffers[shard], []
+        if batch and shard not in self._exited:
+            self._inboxes[shard].put(batch)
+
+    def flush(self) -> None:
+        """모든 샤드 버퍼 전송"""
+        for shard in range(self.workers):
+            self._send(shard)
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """제출한 작업의 결과를 모두 받을 때까지 대기 (승인 대기 스레드는 approvals에 보관)
+
+        대기 중 종료된 워커가 있으면 그 샤드의 남은 작업은 ShardError로 실패 처리됨
+        """
+        self.flush()
+        with self._done:
+            return self._done.wait_for(lambda: self._outstanding == 0, timeout)
+
+    def pending_threads(self) -> list:
+        """재개 가능한 승인 대기 스레드 ID"""
+        return list(self._owner)
+
+    # ----------------------------------------
+    # 결과 수집
+    # ----------------------------------------
+    def _collect(self) -> None:
+        readers = dict(self._results)
+        while readers:
+            for reader in multiprocessing.connection.wait(list(readers)):
+                shard = readers[reader]
+                try:
+                    results = reader.recv()
+                except (EOFError, OSError):
+                    # 워커 종료 (정상 종료 또는 비정상 종료)
+                    del readers[reader]
+                    reader.close()
+                    self._worker_exited(shard)
+                    continue
+                self._handle(shard, results)
+
+    def _handle(self, shard: int, results: list) -> None:
+        finished = 0
+        for kind, facility_id, thread_id, value in results:
+            if kind == RESULT_READY:
+                with self._done:
+                    self._ready += 1
+                    self._done.notify_all()
+                continue
+            if kind == RESULT_PENDING:
+                # value = 샤드 번호
+                self._owner[thread_id] = (value, facility_id)
+                self.stats["restored"] += 1
+                continue
+            finished += 1
+            with self._done:
+                # 샤드는 받은 순서대로 처리하므로 보통 맨 앞 작업
+                jobs = self._jobs[shard]
+                if jobs and jobs[0][0] == thread_id:
+                    jobs.popleft()
+                else:
+                    with contextlib.suppress(ValueError):
+                        jobs.remove((thread_id, facility_id))
+            if kind == RESULT_INTERRUPT:
+                self._owner[thread_id] = (shard, facility_id)
+                self.stats["interrupted"] += 1
+                self.approvals.put(PendingApproval(value.get("facility_id", facility_id), thread_id, value))
+            elif kind == RESULT_ERROR:
+                self.stats["failed"] += 1
+                self._emit(FleetResult(facility_id, thread_id, None, error=ShardError(value)))
+            else:
+                self.stats["completed"] += 1
+                self._emit(FleetResult(facility_id, thread_id, value))
+        self._finished(finished)
+
+    def _worker_exited(self, shard: int) -> None:
+        """워커 종료 후 그 샤드의 남은 작업(전송된 것 + 버퍼)을 실패 처리"""
+        process = self._processes[shard]
+        process.join(1.0)  # 종료 코드 확인용
+        with self._done:
+            self._exited.add(shard)
+            jobs, self._jobs[shard] = list(self._jobs[shard]), deque()
+            self._buffers[shard] = []
+        for thread_id, facility_id in jobs:
+            self._owner.pop(thread_id, None)
+            self.stats["failed"] += 1
+            self._emit(FleetResult(
+                facility_id, thread_id, None,
+                error=ShardError(f"워커 종료됨: {process.name} (exitcode={process.exitcode})"),
+            ))
+        self._finished(len(jobs))
+
+    def _finished(self, count: int) -> None:
+        if count:
+            with self._done:
+                self._outstanding -= count
+                if self._outstanding == 0:
+                    self._done.notify_all()
+
+    def _emit(self, result: FleetResult) -> None:
+        if self.on_result is not None:
+            self.on_result(result)
@@ -0,0 +1,439 @@
+"""
+설비 상태 압축 표현
+- SensorReadings: 채널 5개를 array('d') 하나에 담는 슬롯 객체 (dict처럼 읽기 가능)
+- RiskLevel / Action: 위험도·조치 코드 (str 비교/출력은 기존 문자열과 동일)
+- Analysis / Issue: 분석 결과를 구조화된 이슈 목록으로 보관하고 문구는 필요할 때 생성
+- CompactSerializer: 위 타입을 1~수십 바이트로 저장하는 체크포인터용 직렬화기
+  (그 외 값은 JsonPlusSerializer에 위임, 기존 체크포인트도 그대로 읽음)
+
+타임스탬프는 상태에 epoch 초(float)로 저장하고 표시할 때만 format_timestamp로 변환
+"""
+
+import struct
+import time
+import uuid
+from array import array
+from collections.abc import Mapping, MutableMapping
+from datetime import datetime
+from enum import Enum
+from typing import Any, NamedTuple, Optional, Union
+
+import ormsgpack
+from langgraph.checkpoint.serde.base import SerializerProtocol
+
+# JsonPlusSerializer / Interrupt 는 langgraph 전체(langchain_core 포함)를 불러오므로
+# 직렬화기를 처음 만들 때 가져옴 (분석 노드만 쓰는 경우 시작 시간 단축)
+
+
+SENSOR_FIELDS = ("temperature", "pressure", "vibration", "flow_rate", "power_consumption")
+_FIELD_INDEX = {name: i for i, name in enumerate(SENSOR_FIELDS)}
+
+# 채널 -> (표시명, 단위)
+CHANNEL_LABELS = {
+    "temperature": ("온도", "°C"),
+    "pressure": ("압력", "kPa"),
+    "vibration": ("진동", "mm/s"),
+    "flow_rate": ("유량", "L/min"),
+    "power_consumption": ("전력", "kW"),
+}
+
+
+# ============================================
+# 1. 센서 측정값
+# ============================================
+class SensorReadings(MutableMapping):
+    """센서 채널 측정값 (SENSOR_FIELDS 순서의 float 배열 + 존재 비트마스크)
+
+    dict 대비 객체 크기가 작고, dict와 같은 인터페이스(get, items, [], 대입)를
+    그대로 사용. 값은 float로 저장하며 SENSOR_FIELDS 외 채널은 받지 않음
+    """
+
+    __slots__ = ("_values", "_mask")
+
+    def __init__(self, mapping: Optional[Mapping] = None, **channels: float):
+        values = array("d", bytes(8 * len(SENSOR_FIELDS)))
+        mask = 0
+        for source in (mapping or {}, channels):
+            for name, value in source.items():
+                i = _FIELD_INDEX[name]
+                values[i] = value
+                mask |= 1 << i
+        self._values = values
+        self._mask = mask
+
+    @classmethod
+    def coerce(cls, data: Mapping) -> Mapping:
+        """dict → SensorReadings (센서 채널 외 키나 숫자가 아닌 값이 있으면 그대로 반환)"""
+        if isinstance(data, cls):
+            return data
+        if all(name in _FIELD_INDEX and isinstance(value, (int, float)) for name, value in data.items()):
+            return cls(data)
+        return data
+
+    def __getitem__(self, name: str) -> float:
+        i = _FIELD_INDEX.get(name)
+        if i is None or not self._mask >> i & 1:
+            raise KeyError(name)
+        return self._values[i]
+
+    def __setitem__(self, name: str, value: float) -> None:
+        i = _FIELD_INDEX[name]
+        self._values[i] = value
+        self._mask |= 1 << i
+
+    def __delitem__(self, name: str) -> None:
+        i = _FIELD_INDEX[name]
+        if not self._mask >> i & 1:
+            raise KeyError(name)
+        self._mask &= ~(1 << i)
+
+    def __iter__(self):
+        mask = self._mask
+        return (name for i, name in enumerate(SENSOR_FIELDS) if mask >> i & 1)
+
+    def __len__(self) -> int:
+        return bin(self._mask).count("1")
+
+    def __repr__(self) -> str:
+        return f"SensorReadings({self.to_dict()!r})"
+
+    def to_dict(self) -> dict:
+        return dict(self.items())
+
+    def row(self) -> tuple:
+        """SENSOR_FIELDS 순서의 값 (없는 채널은 None, 감사 로그 등 열 단위 저장용)"""
+        mask = self._mask
+        return tuple(value if mask >> i & 1 else None for i, value in enumerate(self._values))
+
+    # JsonPlusSerializer(기본 직렬화기) 호환: namedtuple처럼 키워드 인자로 복원됨
+    _asdict = to_dict
+
+    def pack(self) -> bytes:
+        """비트마스크 1바이트 + 존재하는 채널의 float64"""
+        mask = self._mask
+        present = [self._values[i] for i in range(len(SENSOR_FIELDS)) if mask >> i & 1]
+        return bytes((mask,)) + struct.pack(f"<{len(present)}d", *present)
+
+    @classmethod
+    def unpack(cls, data: bytes) -> "SensorReadings":
+        readings = cls.__new__(cls)
+        mask = data[0]
+        values = array("d", bytes(8 * len(SENSOR_FIELDS)))
+        present = struct.unpack(f"<{(len(data) - 1) // 8}d", data[1:])
+        k = 0
+        for i in range(len(SENSOR_FIELDS)):
+            if mask >> i & 1:
+                values[i] = present[k]
+                k += 1
+        readings._values = values
+        readings._mask = mask
+        return readings
+
+
+# ============================================
+# 2. 위험도 / 조치 코드
+# ============================================
+class RiskLevel(str, Enum):
+    """위험도 (코드 순서는 lg_qa_batch의 risk_code와 동일)"""
+
+    LOW = "LOW"
+    HIGH = "HIGH"
+    CRITICAL = "CRITICAL"
+
+    # 출력은 기존 문자열 그대로 ("RiskLevel.HIGH"가 아니라 "HIGH")
+    __str__ = str.__str__
+    __format__ = str.__format__
+
+    @property
+    def code(self) -> int:
+        return _RISK_CODES[self]
+
+
+class Action(str, Enum):
+    """권장/실행 조치 (앞의 3개 코드는 lg_qa_batch의 risk_code와 대응)"""
+
+    CONTINUE_MONITORING = "CONTINUE_MONITORING"
+    CONTROLLED_SHUTDOWN = "CONTROLLED_SHUTDOWN"
+    IMMEDIATE_SHUTDOWN = "IMMEDIATE_SHUTDOWN"
+    REDUCE_LOAD = "REDUCE_LOAD"
+    MAINTENANCE_ALERT = "MAINTENANCE_ALERT"
+
+    __str__ = str.__str__
+    __format__ = str.__format__
+
+    @property
+    def code(self) -> int:
+        return _ACTION_CODES[self]
+
+
+RISK_LEVEL_BY_CODE = tuple(RiskLevel)
+ACTION_BY_CODE = tuple(Action)
+_RISK_CODES = {level: i for i, level in enumerate(RISK_LEVEL_BY_CODE)}
+_ACTION_CODES = {action: i for i, action in enumerate(ACTION_BY_CODE)}
+
+
+def coerce_action(value: str) -> Union[Action, str]:
+    """알려진 조치는 Action 코드로, 전문가가 입력한 임의 조치는 문자열 그대로"""
+    try:
+        return Action(value)
+    except ValueError:
+        return value
+
+
+# ============================================
+# 3. 분석 결과
+# ============================================
+ISSUE_CRITICAL, ISSUE_HIGH, ISSUE_RATE, ISSUE_APPROACH, ISSUE_ANOMALY = 0, 1, 2, 3, 4
+
+
+class Issue(NamedTuple):
+    """분석 이슈 1건
+
+    kind: ISSUE_CRITICAL / ISSUE_HIGH (임계값 초과),
+          ISSUE_RATE (분당 변화율 초과, value=분당 변화량),
+          ISSUE_APPROACH (상승 추세, eta=임계값 도달 예상 시간(초)),
+          ISSUE_ANOMALY (다변량 이상, channel=기여도가 가장 큰 채널,
+                         value=마할라노비스 거리, limit=판정 기준)
+    """
+
+    kind: int
+    channel: str
+    value: float
+    limit: float = 0
+    eta: float = 0.0
+
+
+def render_issue(issue: Issue) -> str:
+    label, unit = CHANNEL_LABELS[issue.channel]
+    # 온도 단위(°C)는 숫자에 붙여 표기
+    suffix = unit if unit.startswith("°") else f" {unit}"
+    if issue.kind == ISSUE_CRITICAL:
+        return f"{label} 위험: {issue.value}{suffix} (임계값: {issue.limit}{suffix})"
+    if issue.kind == ISSUE_HIGH:
+        return f"{label} 주의: {issue.value}{suffix}"
+    if issue.kind == ISSUE_RATE:
+        return f"{label} 급변: {issue.value:+.2f} {unit}/분"
+    if issue.kind == ISSUE_ANOMALY:
+        return f"다변량 이상: {label} 외 채널 간 관계 이탈 (이상 점수 {issue.value:.1f}, 기준 {issue.limit:.1f})"
+    return (
+        f"{label} 상승 추세: {issue.value} {unit} → "
+        f"약 {issue.eta / 60:.0f}분 후 {issue.limit} {unit} 도달 예상"
+    )
+
+
+class Analysis:
+    """AI 분석 결과 (위험도 + 이슈 목록). str()로 사람이 읽는 분석 문구 생성
+
+    생성 후 변경하지 않는 값 객체. 문구는 처음 str() 호출 시 한 번만 만들고 보관
+    (이벤트 싱크, 감사 로그, interrupt 값이 같은 객체를 여러 번 변환)
+    """
+
+    __slots__ = ("risk_level", "issues", "_text")
+
+    HEADERS = {
+        RiskLevel.CRITICAL: "🚨 긴급 상황 감지!",
+        RiskLevel.HIGH: "⚠️ 주의 필요!",
+    }
+
+    def __init__(self, risk_level: RiskLevel, issues=()):
+        self.risk_level = RiskLevel(risk_level)
+        self.issues = tuple(Issue(*issue) for issue in issues)
+        self._text = None
+
+    def __str__(self) -> str:
+        if self._text is None:
+            header = self.HEADERS.get(self.risk_level)
+            if header is None:
+                self._text = "✅ 정상 범위 내 작동 중"
+            else:
+                self._text = header + "\n" + "\n".join(render_issue(issue) for issue in self.issues)
+        return self._text
+
+    def __repr__(self) -> str:
+        return f"Analysis({self.risk_level.value!r}, {list(self.issues)!r})"
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Analysis):
+            return self.risk_level == other.risk_level and self.issues == other.issues
+        if isinstance(other, str):
+            return str(self) == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def _asdict(self) -> dict:
+        return {"risk_level": self.risk_level, "issues": list(self.issues)}
+
+
+# ============================================
+# 4. 타임스탬프
+# ============================================
+def to_epoch(value: Any) -> float:
+    """epoch 초 / ISO 문자열 / datetime → epoch 초 (없거나 잘못되면 현재 시각)"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0:
+        return float(value)
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str) and value:
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            pass
+    return time.time()
+
+
+def format_timestamp(value: Any) -> str:
+    """표시용 ISO 문자열"""
+    if isinstance(value, str):
+        return value
+    return datetime.fromtimestamp(to_epoch(value)).isoformat()
+
+
+# ============================================
+# 5. 체크포인터 직렬화기
+# ============================================
+# 기본 직렬화기(JsonPlusSerializer) 형식으로 저장된 설비 상태 타입 (strict msgpack 허용 목록)
+STATE_MSGPACK_TYPES = (SensorReadings, Issue, Analysis, RiskLevel, Action)
+
+EXT_SENSOR_READINGS = 64
+EXT_RISK_LEVEL = 65
+EXT_ACTION = 66
+EXT_ANALYSIS = 67
+EXT_INTERRUPT = 68
+EXT_DELEGATED = 69  # 그 밖의 타입: 기본 직렬화기 결과를 그대로 담음
+EXT_VERSION = 70
+EXT_CHECKPOINT_ID = 71
+
+_VERSION = struct.Struct("<Qd")
+
+_OPTION = (
+    ormsgpack.OPT_NON_STR_KEYS
+    | ormsgpack.OPT_PASSTHROUGH_DATACLASS
+    | ormsgpack.OPT_PASSTHROUGH_DATETIME
+    | ormsgpack.OPT_PASSTHROUGH_ENUM
+    | ormsgpack.OPT_PASSTHROUGH_UUID
+    | ormsgpack.OPT_REPLACE_SURROGATES
+)
+
+
+class CompactSerializer(SerializerProtocol):
+    """설비 상태 타입을 전용 msgpack 확장 코드로 저장하는 직렬화기
+
+    Args:
+        inner: 설비 상태 외 타입과 기존("msgpack" 등) 체크포인트를 처리할 직렬화기
+    """
+
+    TYPE = "qa-compact"
+
+    def __init__(self, inner: Optional[SerializerProtocol] = None):
+        from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+        from langgraph.types import Interrupt
+
+        inner = inner or JsonPlusSerializer()
+        if isinstance(inner, JsonPlusSerializer):
+            # LANGGRAPH_STRICT_MSGPACK=true 에서도 기존 형식 체크포인트의 설비 상태를 dict가 아닌 원래 타입으로
+            inner = inner.with_msgpack_allowlist(STATE_MSGPACK_TYPES)
+        self.inner = inner
+        self._interrupt_type = Interrupt
+
+    def dumps_typed(self, obj: Any) -> tuple[str, bytes]:
+        if obj is None or isinstance(obj, (bytes, bytearray)):
+            return self.inner.dumps_typed(obj)
+        if isinstance(obj, dict) and "channel_versions" in obj and "versions_seen" in obj:
+            obj = self._compact_checkpoint(obj)
+        return self.TYPE, self._pack(obj)
+
+    def loads_typed(self, data: tuple[str, bytes]) -> Any:
+        type_, payload = data
+        if type_ != self.TYPE:
+            return self.inner.loads_typed(data)
+        return self._unpack(payload)
+
+    def _compact_checkpoint(self, checkpoint: dict) -> dict:
+        """체크포인트의 채널 버전 문자열(약 50바이트)과 ID(36바이트)를 고정 길이 이진값으로
+
+        상태 값보다 버전 정보가 체크포인트의 대부분을 차지하므로 함께 압축.
+        복원 결과가 원래 문자열과 정확히 같을 때만 변환 (그 외 형식은 그대로 저장)
+        """
+        compact = dict(checkpoint)
+        compact["channel_versions"] = {
+            channel: _pack_version(version)
+            for channel, version in checkpoint["channel_versions"].items()
+        }
+        compact["versions_seen"] = {
+            node: {channel: _pack_version(version) for channel, version in seen.items()}
+            for node, seen in checkpoint["versions_seen"].items()
+        }
+        checkpoint_id = checkpoint.get("id")
+        if isinstance(checkpoint_id, str):
+            try:
+                packed = uuid.UUID(checkpoint_id)
+            except ValueError:
+                packed = None
+            if packed is not None and str(packed) == checkpoint_id:
+                compact["id"] = ormsgpack.Ext(EXT_CHECKPOINT_ID, packed.bytes)
+        return compact
+
+    def _pack(self, obj: Any) -> bytes:
+        return ormsgpack.packb(obj, default=self._default, option=_OPTION)
+
+    def _unpack(self, payload: bytes) -> Any:
+        return ormsgpack.unpackb(payload, ext_hook=self._ext_hook, option=ormsgpack.OPT_NON_STR_KEYS)
+
+    def _default(self, obj: Any) -> ormsgpack.Ext:
+        if isinstance(obj, SensorReadings):
+            return ormsgpack.Ext(EXT_SENSOR_READINGS, obj.pack())
+        if isinstance(obj, RiskLevel):
+            return ormsgpack.Ext(EXT_RISK_LEVEL, bytes((obj.code,)))
+        if isinstance(obj, Action):
+            return ormsgpack.Ext(EXT_ACTION, bytes((obj.code,)))
+        if isinstance(obj, Analysis):
+            return ormsgpack.Ext(EXT_ANALYSIS, self._pack((
+                obj.risk_level.code,
+                [(kind, _FIELD_INDEX[channel], value, limit, eta)
+                 for kind, channel, value, limit, eta in obj.issues],
+            )))
+        if type(obj) is self._interrupt_type and obj.response_schema is None:
+            # interrupt 값 안의 설비 상태도 압축되도록 직접 처리
+            return ormsgpack.Ext(EXT_INTERRUPT, self._pack((obj.value, obj.id)))
+        return ormsgpack.Ext(EXT_DELEGATED, ormsgpack.packb(self.inner.dumps_typed(obj)))
+
+    def _ext_hook(self, code: int, data: bytes) -> Any:
+        if code == EXT_SENSOR_READINGS:
+            return SensorReadings.unpack(data)
+        if code == EXT_RISK_LEVEL:
+            return RISK_LEVEL_BY_CODE[data[0]]
+        if code == EXT_ACTION:
+            return ACTION_BY_CODE[data[0]]
+        if code == EXT_ANALYSIS:
+            risk_code, issues = self._unpack(data)
+            return Analysis(
+                RISK_LEVEL_BY_CODE[risk_code],
+                [(kind, SENSOR_FIELDS[channel], value, limit, eta)
+                 for kind, channel, value, limit, eta in issues],
+            )
+        if code == EXT_INTERRUPT:
+            value, interrupt_id = self._unpack(data)
+            return self._interrupt_type(value=value, id=interrupt_id)
+        if code == EXT_DELEGATED:
+            return self.inner.loads_typed(tuple(ormsgpack.unpackb(data)))
+        if code == EXT_VERSION:
+            number, suffix = _VERSION.unpack(data)
+            return f"{number:032}.{suffix:016}"
+        if code == EXT_CHECKPOINT_ID:
+            return str(uuid.UUID(bytes=data))
+        raise ValueError(f"알 수 없는 확장 코드: {code}")
+
+
+def _pack_version(version: Any) -> Any:
+    """"{번호:032}.{난수:016}" 형식 채널 버전 → 16바이트 (다른 형식은 그대로)"""
+    if not isinstance(version, str):
+        return version
+    number, _, suffix = version.partition(".")
+    try:
+        packed = (int(number), float(suffix))
+    except ValueError:
+        return version
+    if f"{packed[0]:032}.{packed[1]:016}" != version:
+        return version
+    return ormsgpack.Ext(EXT_VERSION, _VERSION.pack(*packed))
@@ -0,0 +1,190 @@
+"""
+그래프 스트림 -> 타입이 있는 이벤트 어댑터
+- graph.astream(stream_mode="updates") 출력을 NodeUpdate / Interrupt / Completed 로 변환
+  → 호출부에서 (metadata, (mode, chunk)) 튜플 여부를 다시 파싱할 필요 없음
+- 이벤트는 __slots__ 객체. reuse=True 이면 스트림당 한 개씩 미리 만든 객체를
+  값만 바꿔 재사용 (다음 이벤트를 받기 전까지만 유효, 대량 처리용)
+- multiplex: 여러 스레드의 스트림을 소비자 하나로 합침 (이벤트의 thread_id로 구분)
+
+사용 예:
+    async for event in astream_events(graph, initial_state, thread_id):
+        if isinstance(event, Interrupt):
+            decision = ask_expert(event.value)
+        elif isinstance(event, Completed):
+            print(event.final_action)
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Iterable, Iterator, Optional, Union
+
+
+# ============================================
+# 1. 이벤트
+# ============================================
+class NodeUpdate:
+    """노드 1개 실행 완료 (values = 노드가 반환한 상태 업데이트)"""
+
+    __slots__ = ("thread_id", "node", "values")
+
+    def __init__(self, thread_id: str = "", node: str = "", values: Any = None):
+        self.thread_id = thread_id
+        self.node = node
+        self.values = values
+
+    def __repr__(self) -> str:
+        return f"NodeUpdate({self.thread_id!r}, {self.node!r}, {self.values!r})"
+
+
+class Interrupt:
+    """승인 대기 (value = interrupt() 에 넘긴 값, id = 재개 대상 interrupt ID)"""
+
+    __slots__ = ("thread_id", "value", "id")
+
+    def __init__(self, thread_id: str = "", value: Any = None, id: str = ""):
+        self.thread_id = thread_id
+        self.value = value
+        self.id = id
+
+    def __repr__(self) -> str:
+        return f"Interrupt({self.thread_id!r}, {self.value!r})"
+
+
+class Completed:
+    """스트림 종료 (interrupt 없이 END 도달). values = 이번 실행의 노드 업데이트를 합친 dict"""
+
+    __slots__ = ("thread_id", "values")
+
+    def __init__(self, thread_id: str = "", values: Optional[dict] = None):
+        self.thread_id = thread_id
+        self.values = values if values is not None else {}
+
+    @property
+    def final_action(self) -> Optional[str]:
+        return self.values.get("final_action")
+
+    def __repr__(self) -> str:
+        return f"Completed({self.thread_id!r}, {self.values!r})"
+
+
+StreamEvent = Union[NodeUpdate, Interrupt, Completed]
+
+
+class _Events:
+    """스트림 1개의 이벤트 생성기 (reuse=True면 미리 만든 객체 재사용)"""
+
+    __slots__ = ("thread_id", "reuse", "update", "interrupt", "merged")
+
+    def __init__(self, thread_id: str, reuse: bool):
+        self.thread_id = thread_id
+        self.reuse = reuse
+        self.merged: dict = {}
+        if reuse:
+            self.update = NodeUpdate(thread_id)
+            self.interrupt = Interrupt(thread_id)
+
+    def convert(self, chunk: dict) -> Iterator[StreamEvent]:
+        """updates 모드 chunk ({노드: 업데이트} 또는 {"__interrupt__": (...)}) -> 이벤트"""
+        for node, values in chunk.items():
+            if node == "__interrupt__":
+                for pending in values:
+                    if self.reuse:
+                        event = self.interrupt
+                        event.value, event.id = pending.value, pending.id
+                    else:
+                        event = Interrupt(self.thread_id, pending.value, pending.id)
+                    yield event
+                continue
+            if isinstance(values, dict):
+                self.merged.update(values)
+            if self.reuse:
+                event = self.update
+                event.node, event.values = node, values
+            else:
+                event = NodeUpdate(self.thread_id, node, values)
+            yield event
+
+
+def _config(thread: Union[str, dict]) -> tuple:
+    if isinstance(thread, dict):
+        return thread["configurable"]["thread_id"], thread
+    return thread, {"configurable": {"thread_id": thread}}
+
+
+# ============================================
+# 2. 스트림 어댑터
+# ============================================
+async def astream_events(
+    graph, input: Any, thread: Union[str, dict], *, reuse: bool = False,
+) -> AsyncIterator[StreamEvent]:
+    """비동기 스트림. thread는 thread_id 또는 config dict
+
+    interrupt로 멈추면 Interrupt 이벤트 후 종료, 끝까지 실행되면 마지막에 Completed
+    """
+    thread_id, config = _config(thread)
+    events = _Events(thread_id, reuse)
+    interrupted = False
+    async for chunk in graph.astream(input, config=config, stream_mode="updates"):
+        for event in events.convert(chunk):
+            interrupted = interrupted or isinstance(event, Interrupt)
+            yield event
+    if not interrupted:
+        yield Completed(thread_id, events.merged)
+
+
+def stream_events(graph, input: Any, thread: Union[str, dict], *, reuse: bool = False) -> Iterator[StreamEvent]:
+    """astream_events의 동기 버전"""
+    thread_id, config = _config(thread)
+    events = _Events(thread_id, reuse)
+    interrupted = False
+    for chunk in graph.stream(input, config=config, stream_mode="updates"):
+        for event in events.convert(chunk):
+            interrupted = interrupted or isinstance(event, Interrupt)
+            yield event
+    if not interrupted:
+        yield Completed(thread_id, events.merged)
+
+
+# ============================================
+# 3. 여러 스레드 합치기
+# ============================================
+_DONE = object()
+
+
+async def multiplex(
+    graph, jobs: Iterable, *, concurrency: int = 64, max_buffered: int = 1024,
+) -> AsyncIterator[StreamEvent]:
+    """(thread_id, 입력) 목록을 동시에 실행하고 이벤트를 도착 순서대로 전달
+
+    스트림 하나가 예외로 끝나면 나머지 스트림을 취소하고 예외를 다시 발생시킴.
+    이벤트 버퍼가 max_buffered에 도달하면 생산자가 소비를 기다림 (백프레셔)
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max_buffered)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def pump(thread, input) -> None:
+        async with semaphore:
+            async for event in astream_events(graph, input, thread):
+                await queue.put(event)
+
+    async def run_all() -> None:
+        tasks = [asyncio.create_task(pump(thread, input)) for thread, input in jobs]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await queue.put(_DONE)
+
+    runner = asyncio.create_task(run_all())
+    try:
+        while True:
+            event = await queue.get()
+            if event is _DONE:
+                break
+            yield event
+        await runner  # 스트림 예외 전달
+    finally:
+        if not runner.done():
+            runner.cancel()
+            await asyncio.gather(runner, return_exceptions=True)
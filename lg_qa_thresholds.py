@@ -0,0 +1,167 @@
+"""
+설비별 임계값 레지스트리
+- facility_id 기준 임계값 테이블 (파일에서 1회 로드 후 컴파일)
+- 규칙 조회는 dict 조회 1회 (O(1))
+- 파일 변경 시 그래프 재시작 없이 핫 리로드
+
+파일 형식 (JSON):
+    {
+        "default": {"temp_critical": 90.0, ...},
+        "facilities": {
+            "PLANT-A1B2C3D4": {"temp_high": 78.0},
+            ...
+        }
+    }
+설비별 항목은 일부 값만 지정해도 되며, 나머지는 default 값을 따름
+값은 0 이상의 숫자여야 함 (아니면 ValueError → 핫 리로드는 기존 임계값 유지)
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from typing import NamedTuple, Optional
+
+from lg_qa_events import WARNING, emit
+
+
+# ============================================
+# 1. 기본 임계값
+# ============================================
+TEMP_CRITICAL = 90.0
+TEMP_HIGH = 80.0
+PRESSURE_CRITICAL = 120.0
+PRESSURE_HIGH = 110.0
+VIBRATION_CRITICAL = 4.0
+VIBRATION_HIGH = 2.0
+
+
+class Thresholds(NamedTuple):
+    temp_critical: float = TEMP_CRITICAL
+    temp_high: float = TEMP_HIGH
+    pressure_critical: float = PRESSURE_CRITICAL
+    pressure_high: float = PRESSURE_HIGH
+    vibration_critical: float = VIBRATION_CRITICAL
+    vibration_high: float = VIBRATION_HIGH
+
+
+DEFAULT_THRESHOLDS = Thresholds()
+
+
+# ============================================
+# 2. 레지스트리
+# ============================================
+class ThresholdRegistry:
+    """facility_id -> Thresholds 조회 테이블
+
+    조회 경로에는 락이 없으며, 리로드는 새 테이블을 만든 뒤
+    참조 한 번으로 교체하므로 조회 중인 노드에 영향이 없음
+    """
+
+    def __init__(self, path: Optional[str] = None, check_interval: float = 5.0):
+        self.path = path
+        self.check_interval = check_interval
+        self.version = 0
+        self._lock = threading.Lock()
+        self._mtime_ns = None
+        self._next_check = 0.0
+        # (default, facilities) 를 하나의 튜플로 보관해 원자적으로 교체
+        self._compiled = (DEFAULT_THRESHOLDS, {})
+        if path and os.path.exists(path):
+            self.reload()
+
+    @staticmethod
+    def compile(raw: dict) -> tuple:
+        """원본 설정(dict)을 (default, {facility_id: Thresholds}) 로 컴파일
+
+        Raises:
+            ValueError: 알 수 없는 항목, 숫자가 아니거나 음수/무한대인 값
+        """
+        default = DEFAULT_THRESHOLDS._replace(**_validated("default", raw.get("default", {})))
+        facilities = {
+            facility_id: default._replace(**_validated(facility_id, overrides))
+            for facility_id, overrides in raw.get("facilities", {}).items()
+        }
+        return default, facilities
+
+    def load(self, raw: dict) -> int:
+        """dict 설정을 직접 적용 (파일 없이 배포할 때)"""
+        compiled = self.compile(raw)
+        with self._lock:
+            self._compiled = compiled
+            self.version += 1
+            return self.version
+
+    def reload(self) -> int:
+        """파일을 다시 읽어 테이블 교체. 새 버전 번호 반환"""
+        with self._lock:
+            mtime_ns = os.stat(self.path).st_mtime_ns
+            with open(self.path, encoding="utf-8") as f:
+                compiled = self.compile(json.load(f))
+            self._compiled = compiled
+            self._mtime_ns = mtime_ns
+            self.version += 1
+            return self.version
+
+    def maybe_reload(self) -> bool:
+        """check_interval 간격으로만 파일 변경 여부 확인 (핫 리로드)"""
+        now = time.monotonic()
+        if not self.path or now < self._next_check:
+            return False
+        self._next_check = now + self.check_interval
+        try:
+            mtime_ns = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return False
+        if mtime_ns == self._mtime_ns:
+            return False
+        try:
+            self.reload()
+        except (OSError, ValueError, TypeError) as e:
+            # 잘못된 파일이 배포돼도 기존 임계값으로 계속 감시
+            emit(WARNING, "thresholds.reload_failed", path=self.path, version=self.version, error=str(e))
+            self._mtime_ns = mtime_ns
+            return False
+        return True
+
+    def get(self, facility_id: Optional[str] = None) -> Thresholds:
+        """설비 임계값 조회 (미등록 설비는 default)"""
+        self.maybe_reload()
+        default, facilities = self._compiled
+        return facilities.get(facility_id, default)
+
+    def table(self) -> tuple:
+        """현재 (default, facilities) 스냅샷. 배치 분석에서 사용"""
+        self.maybe_reload()
+        return self._compiled
+
+
+def _validated(name: str, values: dict) -> dict:
+    """임계값 항목 검사 (0 이상의 유한한 숫자만 허용, bool 제외)"""
+    if not isinstance(values, dict):
+        raise ValueError(f"{name}: 임계값 항목은 객체여야 함 ({type(values).__name__})")
+    for field, value in values.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value) or value < 0:
+            raise ValueError(f"{name}.{field}: 0 이상의 숫자가 아님 ({value!r})")
+    return values
+
+
+_registry: Optional[ThresholdRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> ThresholdRegistry:
+    """프로세스 공용 레지스트리 (QA_THRESHOLDS_PATH 환경변수의 파일 사용)"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ThresholdRegistry(os.environ.get("QA_THRESHOLDS_PATH"))
+    return _registry
+
+
+def set_registry(registry: ThresholdRegistry) -> None:
+    """공용 레지스트리 교체 (테스트/벤치마크용)"""
+    global _registry
+    _registry = registry
@@ -0,0 +1,288 @@
+"""
+설비별 슬라이딩 윈도우 추세 감지
+- 설비마다 고정 크기 링 버퍼 (설비 수가 늘어도 설비당 메모리 일정)
+- 이동 평균 / 분산 / 기울기(최소제곱)를 합계 갱신으로 O(1) 계산
+- 절대값이 임계값을 넘기 전에 상승 추세·급격한 변화율을 HIGH 위험으로 보고
+"""
+
+import threading
+from array import array
+from typing import Optional
+
+from lg_qa_state import ISSUE_APPROACH, ISSUE_RATE, Issue
+from lg_qa_thresholds import Thresholds
+
+
+# 추세 감시 채널 -> HIGH 임계값 필드 (표시명/단위는 lg_qa_state.CHANNEL_LABELS)
+TREND_CHANNELS = {
+    "temperature": "temp_high",
+    "pressure": "pressure_high",
+    "vibration": "vibration_high",
+}
+
+# 분당 허용 변화율 (절대값 기준, 초과 시 HIGH)
+RATE_LIMITS_PER_MIN = {
+    "temperature": 3.0,
+    "pressure": 5.0,
+    "vibration": 0.5,
+}
+
+
+# ============================================
+# 1. 링 버퍼 + 증분 통계
+# ============================================
+class RollingWindow:
+    """시간-값 링 버퍼 한 채널분 (최근 capacity 개)
+
+    평균/분산/기울기는 합계(Σt, Σt², Σy, Σy², Σty)로 관리하므로
+    갱신과 조회 모두 O(1). 시간은 큰 값 누적에 의한 오차를 줄이기 위해
+    기준 시각(base) 대비 상대값으로 저장
+    """
+
+    __slots__ = (
+        "capacity", "times", "values", "count", "head", "base",
+        "s_t", "s_tt", "s_y", "s_yy", "s_ty", "_updates",
+    )
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.times = array("d", bytes(8 * capacity))
+        self.values = array("d", bytes(8 * capacity))
+        self.count = 0
+        self.head = 0  # 다음에 쓸 위치
+        self.base: Optional[float] = None
+        self.s_t = self.s_tt = self.s_y = self.s_yy = self.s_ty = 0.0
+        self._updates = 0
+
+    def push(self, timestamp: float, value: float) -> None:
+        if self.base is None:
+            self.base = timestamp
+        t = timestamp - self.base
+        if self.count == self.capacity:
+            # 가장 오래된 값 제거
+            old_t = self.times[self.head]
+            old_y = self.values[self.head]
+            self.s_t -= old_t
+            self.s_tt -= old_t * old_t
+            self.s_y -= old_y
+            self.s_yy -= old_y * old_y
+            self.s_ty -= old_t * old_y
+        else:
+            self.count += 1
+        self.times[self.head] = t
+        self.values[self.head] = value
+        self.s_t += t
+        self.s_tt += t * t
+        self.s_y += value
+        self.s_yy += value * value
+        self.s_ty += t * value
+        self.head = (self.head + 1) % self.capacity
+
+        # 기준 시각 재설정 + 부동소수점 누적 오차 정리
+        # (8 * capacity 회마다 한 번 O(capacity) → 분할 상환 O(1))
+        self._updates += 1
+        if self._updates >= 8 * self.capacity:
+            self._recompute()
+
+    def _recompute(self) -> None:
+        oldest = (self.head - self.count) % self.capacity
+        shift = self.times[oldest]
+        self.base += shift
+        self.s_t = self.s_tt = self.s_y = self.s_yy = self.s_ty = 0.0
+        for k in range(self.count):
+            i = (oldest + k) % self.capacity
+            t = self.times[i] - shift
+            y = self.values[i]
+            self.times[i] = t
+            self.s_t += t
+            self.s_tt += t * t
+            self.s_y += y
+            self.s_yy += y * y
+            self.s_ty += t * y
+        self._updates = 0
+
+    @property
+    def span(self) -> float:
+        """윈도우에 담긴 시간 범위(초)"""
+        if not self.count:
+            return 0.0
+        oldest = (self.head - self.count) % self.capacity
+        return self.times[(self.head - 1) % self.capacity] - self.times[oldest]
+
+    @property
+    def latest(self) -> float:
+        return self.values[(self.head - 1) % self.capacity]
+
+    @property
+    def mean(self) -> float:
+        return self.s_y / self.count if self.count else 0.0
+
+    @property
+    def variance(self) -> float:
+        if not self.count:
+            return 0.0
+        mean = self.s_y / self.count
+        return max(self.s_yy / self.count - mean * mean, 0.0)
+
+    @property
+    def slope(self) -> float:
+        """초당 변화량 (최소제곱 기울기)"""
+        n = self.count
+        denominator = n * self.s_tt - self.s_t * self.s_t
+        if n < 2 or denominator <= 0:
+            return 0.0
+        return (n * self.s_ty - self.s_t * self.s_y) / denominator
+
+
+class FacilityWindow:
+    """설비 1대의 채널별 윈도우"""
+
+    __slots__ = ("windows",)
+
+    def __init__(self, capacity: int):
+        self.windows = {channel: RollingWindow(capacity) for channel in TREND_CHANNELS}
+
+
+# ============================================
+# 2. 추세 판정기
+# ============================================
+class TrendTracker:
+    """설비별 추세 감시
+
+    Args:
+        capacity: 채널당 보관 샘플 수 (예: 5초 주기 2시간 = 1440)
+        horizon: 이 시간(초) 안에 HIGH 임계값 도달이 예상되면 경고
+        min_samples: 추세 판정에 필요한 최소 샘플 수
+        min_span: 추세 판정에 필요한 최소 시간 범위(초). 시각이 거의 같은
+            샘플로 기울기가 과대 추정되는 것을 방지
+        approach_ratio: 현재 값이 임계값의 이 비율 이상일 때만 추세 경고
+            (정상 범위 깊숙한 곳의 작은 변동으로 경고가 나지 않도록)
+    """
+
+    def __init__(
+        self,
+        capacity: int = 360,
+        horizon: float = 600.0,
+        min_samples: int = 5,
+        min_span: float = 1.0,
+        approach_ratio: float = 0.8,
+        rate_limits_per_min: Optional[dict] = None,
+    ):
+        self.capacity = capacity
+        self.horizon = horizon
+        self.min_samples = min_samples
+        self.min_span = min_span
+        self.approach_ratio = approach_ratio
+        self.rate_limits = {
+            channel: limit / 60.0
+            for channel, limit in (rate_limits_per_min or RATE_LIMITS_PER_MIN).items()
+        }
+        self._facilities: dict = {}
+        self._lock = threading.Lock()
+
+    def window(self, facility_id: str) -> FacilityWindow:
+        facility = self._facilities.get(facility_id)
+        if facility is None:
+            with self._lock:
+                facility = self._facilities.setdefault(facility_id, FacilityWindow(self.capacity))
+        return facility
+
+    def forget(self, facility_id: str) -> None:
+        """설비 해제 시 윈도우 삭제"""
+        self._facilities.pop(facility_id, None)
+
+    def update(
+        self,
+        facility_id: str,
+        timestamp: float,
+        sensor_data: dict,
+        thresholds: Thresholds,
+    ) -> list:
+        """측정값 추가 후 추세 이상(Issue) 목록 반환 (없으면 빈 리스트)"""
+        issues = []
+        facility = self.window(facility_id)
+        for channel, threshold_field in TREND_CHANNELS.items():
+            if channel not in sensor_data:
+                continue
+            window = facility.windows[channel]
+            window.push(timestamp, float(sensor_data[channel]))
+            if window.count < self.min_samples or window.span < self.min_span:
+                continue
+
+            high = getattr(thresholds, threshold_field)
+            value = window.latest
+            slope = window.slope
+
+            # 1) 변화율 초과 (상승/하강 모두)
+            limit = self.rate_limits.get(channel)
+            if limit is not None and abs(slope) >= limit:
+                issues.append(Issue(ISSUE_RATE, channel, slope * 60))
+                continue
+
+            # 2) 상승 추세로 horizon 안에 HIGH 임계값 도달 예상
+            if slope > 0 and self.approach_ratio * high <= value < high:
+                eta = (high - value) / slope
+                if eta <= self.horizon:
+                    issues.append(Issue(ISSUE_APPROACH, channel, value, high, eta))
+        return issues
+
+    def time_to_high(self, facility_id: str, thresholds: Thresholds) -> Optional[float]:
+        """현재 기울기로 가장 먼저 HIGH 임계값에 도달할 채널의 예상 시간(초)
+
+        이미 넘었으면 0, 상승 중인 채널이 없거나 샘플이 부족하면 None
+        """
+        facility = self._facilities.get(facility_id)
+        if facility is None:
+            return None
+        eta = None
+        for channel, threshold_field in TREND_CHANNELS.items():
+            window = facility.windows[channel]
+            if not window.count:
+                continue
+            high = getattr(thresholds, threshold_field)
+            value = window.latest
+            if value >= high:
+                return 0.0
+            if window.count < self.min_samples or window.span < self.min_span:
+                continue
+            slope = window.slope
+            if slope > 0:
+                channel_eta = (high - value) / slope
+                if eta is None or channel_eta < eta:
+                    eta = channel_eta
+        return eta
+
+    def stats(self, facility_id: str) -> dict:
+        """설비 채널별 현재 통계 (평균/분산/분당 기울기)"""
+        facility = self._facilities.get(facility_id)
+        if facility is None:
+            return {}
+        return {
+            channel: {
+                "count": window.count,
+                "mean": window.mean,
+                "variance": window.variance,
+                "slope_per_min": window.slope * 60,
+            }
+            for channel, window in facility.windows.items()
+        }
+
+
+_tracker: Optional[TrendTracker] = None
+_tracker_lock = threading.Lock()
+
+
+def get_trend_tracker() -> TrendTracker:
+    """프로세스 공용 추세 감시기"""
+    global _tracker
+    if _tracker is None:
+        with _tracker_lock:
+            if _tracker is None:
+                _tracker = TrendTracker()
+    return _tracker
+
+
+def set_trend_tracker(tracker: Optional[TrendTracker]) -> None:
+    """공용 추세 감시기 교체 (테스트/벤치마크용, None이면 초기화)"""
+    global _tracker
+    _tracker = tracker
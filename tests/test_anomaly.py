@@ -0,0 +1,96 @@
+"""다변량 이상 점수: 설비별 분포, 규칙 판정이 LOW일 때만 학습"""
+
+import threading
+
+import numpy as np
+
+from lg_qa_anomaly import MahalanobisScorer
+from lg_qa_batch import analyze_sensor_batch
+from lg_qa_state import SENSOR_FIELDS, RiskLevel
+
+
+def rows(center: list, count: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return np.array(center) + rng.normal(0.0, [0.5, 0.5, 0.05, 1.0, 5.0], (count, len(SENSOR_FIELDS)))
+
+
+PLANT_A = [72.0, 101.0, 0.5, 150.0, 850.0]
+PLANT_B = [60.0, 90.0, 0.3, 120.0, 700.0]
+
+
+def reading(center: list) -> dict:
+    return dict(zip(SENSOR_FIELDS, center))
+
+
+def test_readings_flagged_by_rules_are_not_learned():
+    scorer = MahalanobisScorer(min_samples=10)
+    scorer.assess("PLANT-A", reading(PLANT_A), RiskLevel.CRITICAL)
+    scorer.assess("PLANT-A", reading(PLANT_A), RiskLevel.HIGH)
+    assert scorer.model("PLANT-A").count == 0
+    scorer.assess("PLANT-A", reading(PLANT_A), RiskLevel.LOW)
+    assert scorer.model("PLANT-A").count == 1
+    assert scorer.stats["learned"] == 1
+
+
+def test_models_are_kept_per_facility():
+    scorer = MahalanobisScorer(min_samples=50)
+    scorer.fit(rows(PLANT_A, 500), facility_id="PLANT-A")
+    scorer.fit(rows(PLANT_B, 500, seed=1), facility_id="PLANT-B")
+
+    assert scorer.assess("PLANT-A", reading(PLANT_A)) == []
+    assert scorer.assess("PLANT-B", reading(PLANT_B)) == []
+    # B의 정상 운전점은 A 기준으로는 이상
+    assert scorer.assess("PLANT-A", reading(PLANT_B), RiskLevel.LOW)
+    assert len(scorer) == 2
+
+
+def test_new_facility_starts_from_fleet_model():
+    scorer = MahalanobisScorer(min_samples=50)
+    assert scorer.assess("PLANT-NEW", reading(PLANT_B)) == []  # 공용 분포 없음 → 학습만
+    scorer.fit(rows(PLANT_A, 500))
+    assert scorer.assess("PLANT-OTHER", reading(PLANT_B))
+    assert scorer.model("PLANT-OTHER").count == scorer.min_samples
+
+
+def test_concurrent_assess_and_learning():
+    scorer = MahalanobisScorer(min_samples=20, refresh=8)
+    scorer.fit(rows(PLANT_A, 200))
+    data = [dict(zip(SENSOR_FIELDS, row)) for row in rows(PLANT_A, 400, seed=2).tolist()]
+    errors = []
+
+    def work(offset: int) -> None:
+        try:
+            for record in data[offset::4]:
+                scorer.assess("PLANT-A", record)
+        except Exception as exc:  # pragma: no cover - 실패 시 보고용
+            errors.append(exc)
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert scorer.model("PLANT-A").count == scorer.min_samples + scorer.stats["learned"]
+
+
+def test_batch_scores_match_scalar_assess_per_facility():
+    scorer = MahalanobisScorer(min_samples=50)
+    # 온라인 학습만으로 설비별 분포 준비 (공용 분포는 비어 있음)
+    for facility_id, center, seed in (("PLANT-A", PLANT_A, 3), ("PLANT-B", PLANT_B, 4)):
+        for row in rows(center, 300, seed=seed).tolist():
+            scorer.assess(facility_id, dict(zip(SENSOR_FIELDS, row)))
+    assert scorer.fleet.count == 0
+
+    facility_ids = ["PLANT-A", "PLANT-B"] * 4
+    batch = [PLANT_B if i % 3 == 0 else center for i, center in enumerate([PLANT_A, PLANT_B] * 4)]
+    readings = {name: np.array([row[k] for row in batch]) for k, name in enumerate(SENSOR_FIELDS)}
+    result = analyze_sensor_batch(readings, facility_ids, scorer=scorer)
+
+    for i, facility_id in enumerate(facility_ids):
+        issues = scorer.assess(facility_id, reading(batch[i]), RiskLevel.HIGH)  # 학습 없이 판정만
+        assert bool(issues) == (result["anomaly_score"][i] >= scorer.threshold)
+        assert (result["risk_level"][i] == "HIGH") == bool(issues)
+        if issues:
+            assert issues[0].value == round(result["anomaly_score"][i], 2)
+    assert result["anomaly_score"].any()
@@ -0,0 +1,16 @@
+"""기본 승인 예제: 타입이 있는 스트림 이벤트로 interrupt 처리 후 재개"""
+
+import asyncio
+import builtins
+
+import lg_approval
+
+
+def test_streaming_hitl_resumes_through_typed_events(monkeypatch, capsys):
+    monkeypatch.setattr(builtins, "input", lambda prompt="": "yes")
+    asyncio.run(lg_approval.run_streaming_hitl())
+
+    out = capsys.readouterr().out
+    assert "[보류 중] 대상 작업: 서버 재부팅" in out
+    assert "[재개 후 업데이트] do: {'status': 'completed'}" in out
+    assert "=== 작업 완료 ===" in out
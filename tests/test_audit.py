@@ -0,0 +1,51 @@
+"""감사 로그: 스레드 없이 기록한 사이클도 설비별로 모두 남아야 함"""
+
+import sqlite3
+
+import pytest
+
+from lg_qa_audit import AuditLog
+
+LEGACY_SCHEMA = """
+CREATE TABLE audit (
+    seq INTEGER PRIMARY KEY, ts REAL NOT NULL, facility_id TEXT NOT NULL, thread_id TEXT NOT NULL,
+    risk INTEGER NOT NULL, recommended_action TEXT, final_action TEXT NOT NULL, approved INTEGER,
+    overridden INTEGER NOT NULL, expert_comment TEXT, analysis TEXT, temperature REAL, pressure REAL,
+    vibration REAL, flow_rate REAL, power_consumption REAL, recorded_at REAL NOT NULL,
+    UNIQUE (thread_id, ts)
+);
+CREATE TRIGGER audit_no_delete BEFORE DELETE ON audit
+BEGIN SELECT RAISE(ABORT, 'audit log is append-only'); END;
+INSERT INTO audit (ts, facility_id, thread_id, risk, final_action, overridden, recorded_at)
+VALUES (1.7e9, 'PLANT-OLD', 'thread-1', 0, 'CONTINUE_MONITORING', 0, 1.7e9);
+"""
+
+
+def state(facility_id: str) -> dict:
+    return {"facility_id": facility_id, "timestamp": 1.7e9, "sensor_data": {"temperature": 70.0}}
+
+
+def test_cycles_without_thread_are_kept_per_facility():
+    with AuditLog(":memory:") as audit:
+        for facility_id in ("PLANT-1", "PLANT-2", "PLANT-3"):
+            audit.record(state(facility_id), "CONTINUE_MONITORING")
+        audit.record(state("PLANT-1"), "CONTINUE_MONITORING")  # 같은 사이클 재기록은 무시
+        assert [record.facility_id for record in audit.query()] == ["PLANT-1", "PLANT-2", "PLANT-3"]
+
+
+def test_legacy_key_is_migrated(tmp_path):
+    path = str(tmp_path / "audit.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(LEGACY_SCHEMA)
+    conn.close()
+
+    with AuditLog(path) as audit:
+        audit.record(state("PLANT-1"), "CONTINUE_MONITORING")
+        audit.record(state("PLANT-2"), "CONTINUE_MONITORING")
+        assert [record.facility_id for record in audit.query()] == ["PLANT-OLD", "PLANT-1", "PLANT-2"]
+        assert audit.query()[0].seq == 1
+        # 재생성된 트리거로 추가 전용 유지
+        with pytest.raises(sqlite3.DatabaseError):
+            audit.conn.execute("DELETE FROM audit")
+    with AuditLog(path) as audit:
+        assert audit.count() == 3
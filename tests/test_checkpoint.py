@@ -0,0 +1,61 @@
+"""SQLite 체크포인터: 비동기 실행 중 커밋은 이벤트 루프 밖에서, 쓰기 순서와 무관한 승인 대기 표시"""
+
+import asyncio
+import threading
+
+from langgraph.checkpoint.base import INTERRUPT, empty_checkpoint
+
+import lg_app_qa
+import lg_qa_coalesce
+from lg_qa_checkpoint import SqliteCheckpointSaver
+from lg_qa_events import ERROR, configure_events
+
+
+def test_async_writes_never_commit_on_event_loop(tmp_path):
+    configure_events(level=ERROR)
+    lg_qa_coalesce.set_coalescer(None)
+    saver = SqliteCheckpointSaver(str(tmp_path / "qa.db"), batch_size=1, flush_interval=0.0, retention=None)
+    flushes = []
+    flush = saver.flush
+
+    def recording_flush():
+        flushes.append(threading.current_thread())
+        flush()
+
+    saver.flush = recording_flush
+    graph = lg_app_qa.create_facility_monitor_graph(saver)
+
+    async def run() -> threading.Thread:
+        for i, scenario in enumerate(("normal", "overheating")):
+            await graph.ainvoke(
+                {"sensor_data": lg_app_qa.get_sensor_data(scenario), "facility_id": f"PLANT-{i}", "timestamp": 1.7e9},
+                {"configurable": {"thread_id": f"PLANT-{i}"}},
+            )
+        return threading.current_thread()
+
+    try:
+        loop_thread = asyncio.run(run())
+        assert flushes
+        assert loop_thread not in flushes
+        assert saver.pending_threads() == ["PLANT-1"]
+    finally:
+        saver.close()
+
+
+def test_late_put_of_interrupted_checkpoint_keeps_thread_pending(tmp_path):
+    saver = SqliteCheckpointSaver(str(tmp_path / "qa.db"), retention=None)
+    config = {"configurable": {"thread_id": "PLANT-1"}}
+    interrupted, resumed = empty_checkpoint(), empty_checkpoint()
+    try:
+        # 실행기 스레드 순서에 따라 interrupt 쓰기가 해당 체크포인트 put보다 먼저 도착
+        saver.put_writes(
+            {"configurable": {"thread_id": "PLANT-1", "checkpoint_id": interrupted["id"]}},
+            [(INTERRUPT, {"facility_id": "PLANT-1"})],
+            "task-1",
+        )
+        saver.put(config, interrupted, {}, {})
+        assert saver.pending_threads() == ["PLANT-1"]
+        saver.put(config, resumed, {}, {})  # 재개 후 다음 체크포인트
+        assert saver.pending_threads() == []
+    finally:
+        saver.close()
@@ -0,0 +1,86 @@
+"""반복 경보 병합: 승인 대기 스레드가 사라진 경보가 계속 병합 대상으로 남지 않아야 함"""
+
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.types import Command
+
+import lg_app_qa
+import lg_qa_coalesce
+from lg_qa_coalesce import AlertCoalescer
+from lg_qa_events import ERROR, configure_events
+
+
+SIGNATURE = ("CRITICAL", "IMMEDIATE_SHUTDOWN")
+
+
+class Clock:
+    def __init__(self, now: float = 1_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_repeated_merges_do_not_extend_stale_alert(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(lg_qa_coalesce.time, "time", clock)
+    coalescer = AlertCoalescer(ttl=60.0)
+
+    # thread-1 이 interrupt 전에 실패해 release()가 호출되지 않은 경보
+    assert coalescer.register("PLANT-1", SIGNATURE, "thread-1", {"temperature": 95.0}, clock.now) is None
+    for i in range(2, 10):
+        clock.now += 10.0  # ttl보다 짧은 간격으로 계속 반복
+        merged = coalescer.register("PLANT-1", SIGNATURE, f"thread-{i}", {"temperature": 95.0}, clock.now)
+        if clock.now - 1_000.0 <= 60.0:
+            assert merged is not None and merged.thread_id == "thread-1"
+        else:
+            # 등록 후 ttl이 지나면 새 사건 → 새 스레드가 interrupt를 검
+            assert merged is None
+            break
+    else:
+        raise AssertionError("병합으로 만료가 계속 연장됨")
+    assert coalescer.get("PLANT-1", SIGNATURE).thread_id == f"thread-{i}"
+    assert coalescer.stats["expired"] == 1
+
+
+def test_alert_for_thread_no_longer_pending_is_replaced():
+    pending = {"thread-1"}
+    coalescer = AlertCoalescer(is_pending=pending.__contains__)
+    assert coalescer.register("PLANT-1", SIGNATURE, "thread-1", {}, 0.0) is None
+    assert coalescer.register("PLANT-1", SIGNATURE, "thread-2", {}, 1.0).thread_id == "thread-1"
+
+    pending.clear()  # thread-1 실패/종료
+    assert coalescer.register("PLANT-1", SIGNATURE, "thread-3", {}, 2.0) is None
+    assert coalescer.get("PLANT-1", SIGNATURE).thread_id == "thread-3"
+
+
+def test_pending_thread_resume_is_not_merged_into_itself():
+    coalescer = AlertCoalescer(ttl=0.0, is_pending=lambda thread_id: False)
+    assert coalescer.register("PLANT-1", SIGNATURE, "thread-1", {}, 0.0) is None
+    assert coalescer.register("PLANT-1", SIGNATURE, "thread-1", {}, 1.0) is None
+    assert coalescer.get("PLANT-1", SIGNATURE).thread_id == "thread-1"
+
+
+def test_reused_thread_does_not_keep_previous_merge():
+    configure_events(level=ERROR)
+    lg_qa_coalesce.set_coalescer(None)
+    graph = lg_app_qa.create_facility_monitor_graph(MemorySaver())
+    sensor_data = lg_app_qa.get_sensor_data("overheating")
+
+    def cycle(thread_id: str, timestamp: float) -> dict:
+        return graph.invoke(
+            {"sensor_data": sensor_data, "facility_id": "PLANT-1", "timestamp": timestamp},
+            {"configurable": {"thread_id": thread_id}},
+        )
+
+    assert "__interrupt__" in cycle("thread-A", 1.7e9)
+    merged = cycle("thread-B", 1.7e9 + 60)
+    assert merged["final_action"] == "COALESCED" and merged["coalesced_into"] == "thread-A"
+
+    graph.invoke(Command(resume={"approved": True}), {"configurable": {"thread_id": "thread-A"}})
+
+    # 같은 스레드의 다음 사이클은 새 사건 → interrupt
+    result = cycle("thread-B", 1.7e9 + 120)
+    assert "__interrupt__" in result
+    assert graph.get_state({"configurable": {"thread_id": "thread-B"}}).values["coalesced_into"] is None
+    # 이후 경보는 실제로 대기 중인 thread-B에 병합
+    assert cycle("thread-C", 1.7e9 + 180)["coalesced_into"] == "thread-B"
@@ -0,0 +1,87 @@
+"""제어 명령 디스패처 회귀 테스트"""
+
+import threading
+
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.types import Command
+
+import lg_app_qa
+import lg_qa_coalesce
+from lg_qa_control import (
+    STATUS_APPLIED, STATUS_FAILED, ControlDispatcher, ControllerError, FakeController, set_dispatcher,
+)
+from lg_qa_events import ERROR, configure_events
+
+
+class RefusingController(FakeController):
+    """connect()가 항상 실패하는 제어기 (refuse=False로 바꾸면 정상 연결)"""
+
+    def __init__(self, **options):
+        super().__init__(latency=0.0, **options)
+        self.refuse = True
+
+    def connect(self):
+        if self.refuse:
+            raise ControllerError("연결 거부")
+        return super().connect()
+
+
+def test_connect_failure_fails_commands_and_keeps_workers_alive():
+    controller = RefusingController()
+    dispatcher = ControlDispatcher({"plc": controller}, pool_size=1, max_retries=2, backoff=0.001)
+    try:
+        result = dispatcher.submit("PLANT-1", "REDUCE_LOAD", "key-1").result(timeout=5)
+        assert result.status == STATUS_FAILED
+        assert "연결 거부" in result.error
+        assert result.attempts == 3
+        assert dispatcher.pending() == 0
+
+        # 같은 키 재제출 시 끝난 Future가 아니라 새 전송이 시작되고, 작업 스레드가 살아 있어 처리됨
+        controller.refuse = False
+        retry = dispatcher.submit("PLANT-1", "REDUCE_LOAD", "key-1")
+        assert retry.result(timeout=5).status == STATUS_APPLIED
+        assert all(thread.is_alive() for thread in dispatcher._threads)
+    finally:
+        closer = threading.Thread(target=dispatcher.close)
+        closer.start()
+        closer.join(timeout=5)
+        assert not closer.is_alive(), "close()가 멈춤"
+
+
+def test_unexpected_send_error_resolves_futures():
+    dispatcher = ControlDispatcher({"plc": FakeController(latency=0.0)}, pool_size=1)
+
+    def broken_send(pool, batch):
+        raise RuntimeError("예상하지 못한 오류")
+
+    dispatcher._send = broken_send
+    try:
+        result = dispatcher.submit("PLANT-2", "REDUCE_LOAD", "key-2").result(timeout=5)
+        assert result.status == STATUS_FAILED
+        assert dispatcher.pending() == 0
+        assert all(thread.is_alive() for thread in dispatcher._threads)
+    finally:
+        dispatcher.close()
+
+
+def test_separately_approved_cycles_on_one_thread_each_send_a_command():
+    configure_events(level=ERROR)
+    lg_qa_coalesce.set_coalescer(None)
+    controller = FakeController(latency=0.0)
+    dispatcher = ControlDispatcher({"default": controller}, pool_size=1)
+    set_dispatcher(dispatcher)
+    try:
+        graph = lg_app_qa.create_facility_monitor_graph(MemorySaver())
+        config = {"configurable": {"thread_id": "PLANT-1"}}  # 설비별 스레드 재사용
+        for timestamp in (1.7e9, 1.7e9 + 60):
+            state = {"sensor_data": lg_app_qa.get_sensor_data("overheating"), "facility_id": "PLANT-1", "timestamp": timestamp}
+            assert "__interrupt__" in graph.invoke(state, config)
+            result = graph.invoke(Command(resume={"approved": True}), config)
+            assert result["final_action"] == "IMMEDIATE_SHUTDOWN"
+        dispatcher.flush()
+        assert dispatcher.stats["applied"] == 2
+        assert controller.stats["duplicates"] == 0
+        assert [action for _, action in controller.applied.values()] == ["IMMEDIATE_SHUTDOWN"] * 2
+    finally:
+        set_dispatcher(None)
+        dispatcher.close()
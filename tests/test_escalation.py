@@ -0,0 +1,42 @@
+"""에스컬레이션: 프로세스 재시작 후 복구한 승인 대기 건의 기한은 처음 요청 시각 기준"""
+
+import time
+
+import lg_app_qa
+import lg_qa_coalesce
+from lg_qa_checkpoint import SqliteCheckpointSaver
+from lg_qa_escalation import AUTO_RESUME, ESCALATE, EscalationScheduler
+from lg_qa_events import ERROR, configure_events
+from lg_qa_inbox import ApprovalInbox
+
+
+def test_restart_keeps_escalation_clock(tmp_path):
+    configure_events(level=ERROR)
+    lg_qa_coalesce.set_coalescer(None)
+    path = str(tmp_path / "qa.db")
+    with SqliteCheckpointSaver(path, retention=None) as saver:
+        graph = lg_app_qa.create_facility_monitor_graph(saver)
+        result = graph.invoke(
+            {"sensor_data": lg_app_qa.get_sensor_data("overheating"), "facility_id": "PLANT-1", "timestamp": time.time()},
+            {"configurable": {"thread_id": "PLANT-1"}},
+        )
+        assert "__interrupt__" in result
+        requested_at = time.time()
+
+    # 재시작: 새 체크포인터/인박스/스케줄러로 복구
+    time.sleep(0.05)
+    restarted_at = time.time()
+    with SqliteCheckpointSaver(path, retention=None) as saver:
+        graph = lg_app_qa.create_facility_monitor_graph(saver)
+        inbox = ApprovalInbox()
+        scheduler = EscalationScheduler(graph)
+        scheduler.attach(inbox)
+        assert inbox.restore(graph, saver.pending_threads()) == 1
+
+        item = inbox.get("PLANT-1")
+        assert item.received_at <= requested_at < restarted_at
+        assert scheduler._tracked["PLANT-1"].since == item.received_at
+        # CRITICAL 단계 기한은 처음 요청 시각 기준 (120초 호출, 300초 자동 재개)
+        assert scheduler.due(item.received_at + 119) == []
+        fired = scheduler.due(item.received_at + 301)
+        assert [step.kind for _, step in fired] == [ESCALATE, AUTO_RESUME]
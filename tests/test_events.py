@@ -0,0 +1,54 @@
+"""이벤트 기록기: 싱크 오류가 백그라운드 출력 스레드를 멈추지 않아야 함"""
+
+import threading
+
+from lg_qa_events import INFO, EventEmitter
+
+
+class MemorySink:
+    def __init__(self):
+        self.records = []
+
+    def write(self, records: list) -> None:
+        self.records.extend(records)
+
+
+class FailingSink:
+    def __init__(self, failures: int):
+        self.failures = failures
+
+    def write(self, records: list) -> None:
+        if self.failures > 0:
+            self.failures -= 1
+            raise OSError("disk full")
+
+
+def flush_with_timeout(emitter: EventEmitter, timeout: float = 5.0) -> bool:
+    done = threading.Event()
+    threading.Thread(target=lambda: (emitter.flush(), done.set()), daemon=True).start()
+    return done.wait(timeout)
+
+
+def test_sink_exception_keeps_background_drain_alive():
+    memory = MemorySink()
+    emitter = EventEmitter(level=INFO, sinks=[FailingSink(failures=1), memory], background=True, batch_size=1)
+    try:
+        emitter.emit(INFO, "first")
+        assert flush_with_timeout(emitter)
+        emitter.emit(INFO, "second")
+        assert flush_with_timeout(emitter)
+
+        assert [event for _, _, event, _ in memory.records] == ["first", "second"]
+        assert emitter.sink_errors == 1
+        assert isinstance(emitter.last_sink_error, OSError)
+        assert emitter._thread.is_alive()
+    finally:
+        emitter.close()
+
+
+def test_sink_exception_does_not_propagate_to_caller():
+    memory = MemorySink()
+    emitter = EventEmitter(level=INFO, sinks=[FailingSink(failures=5), memory])
+    emitter.emit(INFO, "sync")
+    assert emitter.sink_errors == 1
+    assert len(memory.records) == 1
@@ -0,0 +1,87 @@
+"""승인 인박스: 위험도 순위, peek 순서, 일괄 재개"""
+
+import asyncio
+import random
+import sqlite3
+
+from langgraph.checkpoint.base import empty_checkpoint
+
+import lg_app_qa
+import lg_qa_coalesce
+from lg_qa_checkpoint import SqliteCheckpointSaver
+from lg_qa_events import ERROR, configure_events
+from lg_qa_inbox import RESUME_COMPLETED, RISK_PRIORITY, ApprovalInbox, bulk_resume_pending
+from lg_qa_state import RiskLevel
+
+
+def test_risk_priority_covers_risk_levels_only():
+    assert set(RISK_PRIORITY) == {level.value for level in RiskLevel}
+    assert RISK_PRIORITY["CRITICAL"] < RISK_PRIORITY["HIGH"] < RISK_PRIORITY["LOW"]
+
+
+def test_peek_matches_full_sort_with_stale_and_resolved_entries():
+    rng = random.Random(3)
+    inbox = ApprovalInbox()
+    for i in range(500):
+        inbox.add(
+            f"thread-{i % 300}",  # 같은 스레드 재등록 → 힙에 교체된 항목이 남음
+            {"facility_id": f"PLANT-{i:04d}", "risk_level": rng.choice(["CRITICAL", "HIGH", "LOW"])},
+            received_at=rng.uniform(0, 1000),
+        )
+    for thread_id in rng.sample(sorted(inbox._items), 80):
+        inbox.resolve(thread_id, {"approved": True})
+
+    expected = inbox.select()
+    for n in (1, 10, 50, len(expected) + 5):
+        assert [item.thread_id for item in inbox.peek(n)] == [item.thread_id for item in expected[:n]]
+
+
+def test_deferred_only_holds_back_listed_threads(tmp_path):
+    path = str(tmp_path / "qa.db")
+    saver = SqliteCheckpointSaver(path, flush_interval=0.0, retention=None)
+    reader = sqlite3.connect(path)
+
+    def committed(thread_id: str) -> int:
+        return reader.execute("SELECT COUNT(*) FROM checkpoints WHERE thread_id = ?", (thread_id,)).fetchone()[0]
+
+    def put(thread_id: str) -> None:
+        saver.put({"configurable": {"thread_id": thread_id}}, empty_checkpoint(), {}, {})
+
+    try:
+        with saver.deferred(["resumed"]):
+            put("resumed")
+            assert committed("resumed") == 0
+            put("other")  # 재개와 무관한 스레드는 평소대로 커밋
+            assert committed("other") == 1
+            put("resumed")
+            assert committed("resumed") == 1
+            put("resumed")
+            assert committed("resumed") == 1
+        assert committed("resumed") == 3
+    finally:
+        reader.close()
+        saver.close()
+
+
+def test_bulk_resume_pending_restores_without_sync_get_state(tmp_path):
+    configure_events(level=ERROR)
+    lg_qa_coalesce.set_coalescer(None)
+    saver = SqliteCheckpointSaver(str(tmp_path / "qa.db"), retention=None)
+    try:
+        graph = lg_app_qa.create_facility_monitor_graph(saver)
+        for facility_id in ("PLANT-1", "PLANT-2"):
+            graph.invoke(
+                {"sensor_data": lg_app_qa.get_sensor_data("overheating"), "facility_id": facility_id, "timestamp": 1.7e9},
+                {"configurable": {"thread_id": facility_id}},
+            )
+
+        def get_state(*args, **kwargs):
+            raise AssertionError("이벤트 루프 안에서 동기 get_state 호출")
+
+        graph.get_state = get_state
+        report = asyncio.run(bulk_resume_pending(graph, {"approved": True, "comment": "일괄 승인"}))
+        assert {outcome.thread_id for outcome in report.outcomes.values()} == {"PLANT-1", "PLANT-2"}
+        assert all(outcome.status == RESUME_COMPLETED for outcome in report.outcomes.values())
+        assert saver.pending_threads() == []
+    finally:
+        saver.close()
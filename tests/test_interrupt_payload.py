@@ -0,0 +1,33 @@
+"""전문가 승인 interrupt 값: JSON으로 그대로 내보낼 수 있어야 함 (인박스, 웹 UI)"""
+
+import json
+
+from langgraph.checkpoint.memory import MemorySaver
+
+import lg_app_qa
+import lg_qa_coalesce
+from lg_qa_events import ERROR, configure_events
+from lg_qa_inbox import ApprovalInbox
+
+
+def test_interrupt_payload_is_json_safe():
+    configure_events(level=ERROR)
+    lg_qa_coalesce.set_coalescer(None)
+    graph = lg_app_qa.create_facility_monitor_graph(MemorySaver())
+    result = graph.invoke(
+        {"sensor_data": lg_app_qa.get_sensor_data("overheating"), "facility_id": "PLANT-1", "timestamp": 1.7e9},
+        {"configurable": {"thread_id": "PLANT-1"}},
+    )
+    payload = result["__interrupt__"][0].value
+
+    decoded = json.loads(json.dumps(payload))
+    assert decoded == payload
+    assert payload["risk_level"] == "CRITICAL"
+    assert payload["recommended_action"] == "IMMEDIATE_SHUTDOWN"
+    assert type(payload["sensor_data"]) is dict
+    assert payload["timestamp"].startswith("2023-11-1")
+
+    inbox = ApprovalInbox()
+    item = inbox.add("PLANT-1", payload)
+    assert item.risk_level == "CRITICAL"
+    json.dumps(item.payload)
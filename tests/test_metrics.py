@@ -0,0 +1,21 @@
+"""프로파일러: 노드 상태 크기는 그래프 체크포인터와 같은 직렬화 기준"""
+
+from langgraph.checkpoint.memory import MemorySaver
+
+import lg_app_qa
+from lg_qa_metrics import GraphProfiler
+
+
+def test_state_bytes_match_checkpointer_serde():
+    profiler = GraphProfiler()
+    graph = lg_app_qa.create_facility_monitor_graph(MemorySaver())
+    assert type(profiler.serde) is type(graph.checkpointer.serde)
+
+    state = {
+        "sensor_data": lg_app_qa.get_sensor_data("normal"),
+        "facility_id": "PLANT-1",
+        "timestamp": 1.7e9,
+    }
+    profiler.wrap_node("analyze", lambda state: {})(state)
+    histogram = profiler.histogram("qa_node_state_bytes", node="analyze")
+    assert histogram.sum == len(graph.checkpointer.serde.dumps_typed(state)[1])
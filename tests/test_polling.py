@@ -0,0 +1,30 @@
+"""적응형 샘플링: 유효한 임계값 설정(0 포함)으로 분석이 실패하지 않아야 함"""
+
+import lg_app_qa
+from lg_qa_events import ERROR, configure_events
+from lg_qa_polling import REASON_RISK, configure_adaptive_sampler, proximity, set_adaptive_sampler
+from lg_qa_thresholds import DEFAULT_THRESHOLDS, ThresholdRegistry, get_registry, set_registry
+
+
+def test_zero_high_threshold_counts_as_reached():
+    thresholds = DEFAULT_THRESHOLDS._replace(vibration_high=0.0)
+    assert proximity(thresholds, {"temperature": 40.0, "vibration": 0.0}) == 1.0
+    assert proximity(thresholds, {"temperature": 40.0}) < 1.0
+
+
+def test_analysis_with_zero_threshold_and_sampler_enabled():
+    configure_events(level=ERROR)
+    previous = get_registry()
+    registry = ThresholdRegistry()
+    registry.load({"facilities": {"PLANT-1": {"vibration_high": 0}}})
+    set_registry(registry)
+    sampler = configure_adaptive_sampler()
+    try:
+        result = lg_app_qa.analyze_sensor_data(
+            {"sensor_data": lg_app_qa.get_sensor_data("normal"), "facility_id": "PLANT-1", "timestamp": 1.7e9}
+        )
+        assert result["risk_level"] == "HIGH"
+        assert sampler.state("PLANT-1").reason == REASON_RISK
+    finally:
+        set_adaptive_sampler(None)
+        set_registry(previous)
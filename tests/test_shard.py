@@ -0,0 +1,72 @@
+"""샤드 실행기: 실행 중 워커 프로세스가 죽어도 join()/close()가 멈추지 않아야 함"""
+
+import threading
+
+import lg_app_qa
+from lg_qa_shard import ShardedExecutor, ShardError, shard_of
+
+
+def facilities_by_shard(workers: int) -> dict:
+    shards: dict = {}
+    i = 0
+    while len(shards) < workers or min(len(ids) for ids in shards.values()) < 3:
+        facility_id = f"PLANT-{i:04d}"
+        shards.setdefault(shard_of(facility_id, workers), []).append(facility_id)
+        i += 1
+    return shards
+
+
+def test_dead_worker_fails_outstanding_jobs():
+    results = []
+    executor = ShardedExecutor(workers=2, batch_size=1, on_result=results.append)
+    executor.start()
+    try:
+        shards = facilities_by_shard(2)
+        executor._processes[0].kill()
+        executor._processes[0].join(10)
+
+        sensor_data = lg_app_qa.get_sensor_data("normal")
+        for facility_id in shards[0][:3] + shards[1][:3]:
+            executor.submit(facility_id, sensor_data)
+        assert executor.join(timeout=30)
+
+        failed = {r.facility_id: r for r in results if r.error is not None}
+        done = {r.facility_id: r for r in results if r.error is None}
+        assert set(failed) == set(shards[0][:3])
+        assert all(isinstance(r.error, ShardError) for r in failed.values())
+        assert set(done) == set(shards[1][:3])
+        assert all(r.final_action == "CONTINUE_MONITORING" for r in done.values())
+
+        # 종료된 샤드로 가는 이후 작업은 즉시 실패
+        executor.submit(shards[0][0], sensor_data)
+        assert executor.join(timeout=5)
+        assert executor.stats["failed"] == 4
+    finally:
+        closer = threading.Thread(target=executor.close, daemon=True)
+        closer.start()
+        closer.join(30)
+    assert not closer.is_alive()
+
+
+def test_worker_killed_mid_run_accounts_for_every_job():
+    results = []
+    executor = ShardedExecutor(workers=2, batch_size=4, on_result=results.append)
+    executor.start()
+    try:
+        sensor_data = lg_app_qa.get_sensor_data("normal")
+        for i in range(400):
+            executor.submit(f"PLANT-{i:04d}", sensor_data)
+        executor.flush()
+        executor._processes[0].kill()
+        assert executor.join(timeout=60)
+
+        assert len(results) == 400
+        assert len({r.thread_id for r in results}) == 400
+        assert executor.stats["completed"] + executor.stats["failed"] == 400
+        assert executor.stats["failed"] > 0
+        assert all(isinstance(r.error, ShardError) for r in results if r.error is not None)
+    finally:
+        closer = threading.Thread(target=executor.close, daemon=True)
+        closer.start()
+        closer.join(30)
+    assert not closer.is_alive()
@@ -0,0 +1,75 @@
+"""설비 상태 직렬화: CompactSerializer가 아닌 checkpointer / strict msgpack 에서의 승인 재개"""
+
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# LANGGRAPH_STRICT_MSGPACK 은 langgraph import 시점에 읽으므로 별도 프로세스에서 실행
+RESUME_SCRIPT = textwrap.dedent("""
+    import logging
+    from langgraph.checkpoint.memory import MemorySaver
+    from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+    from langgraph.types import Command
+
+    import lg_app_qa
+    from lg_qa_events import ERROR, configure_events
+    from lg_qa_state import Analysis, SensorReadings
+
+    configure_events(level=ERROR)
+    messages = []
+    handler = logging.Handler()
+    handler.emit = lambda record: messages.append(record.getMessage())
+    logging.getLogger("langgraph").addHandler(handler)
+
+    saver = MemorySaver()
+    config = {"configurable": {"thread_id": "PLANT-1"}}
+    state = {"sensor_data": lg_app_qa.get_sensor_data("overheating"), "facility_id": "PLANT-1", "timestamp": 1.7e9}
+    graph = lg_app_qa.create_facility_monitor_graph(saver)
+    if LEGACY:
+        # 직렬화기를 감싸기 전(기본 JsonPlusSerializer) 형식으로 저장된 승인 대기 체크포인트
+        saver.serde = JsonPlusSerializer()
+        graph.invoke(state, config)
+        graph = lg_app_qa.create_facility_monitor_graph(saver)
+    else:
+        graph.invoke(state, config)
+    values = graph.get_state(config).values
+    assert isinstance(values["sensor_data"], SensorReadings), type(values["sensor_data"])
+    assert isinstance(values["ai_analysis"], Analysis), type(values["ai_analysis"])
+    result = graph.invoke(Command(resume={"approved": True}), config)
+    assert result["final_action"] == "IMMEDIATE_SHUTDOWN", result
+    unregistered = [message for message in messages if "unregistered" in message.lower()]
+    assert not unregistered, unregistered
+    print("ok")
+""")
+
+
+def run_resume(strict: bool, legacy: bool) -> subprocess.CompletedProcess:
+    env = {**os.environ, "LANGGRAPH_STRICT_MSGPACK": "true" if strict else "false"}
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(ROOT), env.get("PYTHONPATH")]))
+    return subprocess.run(
+        [sys.executable, "-c", f"LEGACY = {legacy}\n{RESUME_SCRIPT}"],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=120,
+    )
+
+
+def test_plain_memory_saver_resume():
+    result = run_resume(strict=False, legacy=False)
+    assert result.returncode == 0, result.stderr
+    assert "ok" in result.stdout
+
+
+def test_strict_msgpack_resume():
+    result = run_resume(strict=True, legacy=False)
+    assert result.returncode == 0, result.stderr
+    assert "ok" in result.stdout
+
+
+def test_strict_msgpack_resume_legacy_checkpoint():
+    result = run_resume(strict=True, legacy=True)
+    assert result.returncode == 0, result.stderr
+    assert "ok" in result.stdout
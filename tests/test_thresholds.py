@@ -0,0 +1,46 @@
+"""임계값 레지스트리: 잘못된 값은 거부하고 핫 리로드는 기존 값 유지"""
+
+import json
+import os
+
+import pytest
+
+from lg_qa_events import WARNING, configure_events
+from lg_qa_thresholds import DEFAULT_THRESHOLDS, ThresholdRegistry
+
+
+class MemorySink:
+    def __init__(self):
+        self.records = []
+
+    def write(self, records: list) -> None:
+        self.records.extend(records)
+
+
+@pytest.mark.parametrize("value", ["95", -1.0, float("nan"), True, None])
+def test_compile_rejects_invalid_values(value):
+    with pytest.raises(ValueError):
+        ThresholdRegistry.compile({"facilities": {"PLANT-1": {"temp_high": value}}})
+
+
+def test_bad_file_is_rejected_reload(tmp_path):
+    path = tmp_path / "thresholds.json"
+    path.write_text(json.dumps({"default": {"temp_high": 75.0}}), encoding="utf-8")
+    registry = ThresholdRegistry(str(path), check_interval=0.0)
+    assert registry.get("PLANT-1").temp_high == 75.0
+
+    sink = MemorySink()
+    configure_events(level=WARNING, sinks=[sink])
+    try:
+        path.write_text(json.dumps({"default": {"temp_high": "hot"}}), encoding="utf-8")
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert registry.maybe_reload() is False
+    finally:
+        configure_events()
+
+    assert registry.get("PLANT-1").temp_high == 75.0
+    assert registry.get("PLANT-1").temp_critical == DEFAULT_THRESHOLDS.temp_critical
+    events = [(level, event, fields) for _, level, event, fields in sink.records]
+    assert [event for _, event, _ in events] == ["thresholds.reload_failed"]
+    assert events[0][0] == WARNING and events[0][2]["path"] == str(path)